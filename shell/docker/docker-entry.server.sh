@@ -13,9 +13,20 @@ echo -e "\e[1;34mCreating Django superuser...\e[0m"
 python src/manage.py createsuperuser --no-input
 
 
-# Starting Gunicorn 
+# Metrics of all Gunicorn workers and bot are aggregated through this directory
+# and served by bot on METRICS_PORT
+export PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus_multiproc
+rm -rf $PROMETHEUS_MULTIPROC_DIR
+mkdir -p $PROMETHEUS_MULTIPROC_DIR
+
+# Starting Gunicorn (with uvicorn workers and async REST views if DJANGO_SERVER_INTERFACE=asgi)
 echo -e "\e[1;34mStarting Gunicorn Application server...\e[0m"
-gunicorn --bind 0.0.0.0:$DJANGO_PORT --workers=4 --chdir src config.wsgi:application &
+if [ "$DJANGO_SERVER_INTERFACE" = "asgi" ]; then
+    gunicorn --config src/config/gunicorn.py --bind 0.0.0.0:$DJANGO_PORT --workers=4 --chdir src \
+        --worker-class uvicorn.workers.UvicornWorker config.asgi:application &
+else
+    gunicorn --config src/config/gunicorn.py --bind 0.0.0.0:$DJANGO_PORT --workers=4 --chdir src config.wsgi:application &
+fi
 
 
 # Starting bot in polling mode 
@@ -1,14 +1,17 @@
+from django.conf import settings
 from ninja import NinjaAPI
 from ninja_extra import NinjaExtraAPI
-from ninja_jwt.controller import NinjaJWTDefaultController
 
 from app.internal.api_v1.favourites.api import register_favourites_api
 from app.internal.api_v1.users.api import register_users_api
+from app.internal.api_v1.utils.authentication.presentation.routers import TokenController
+from app.internal.api_v1.utils.rendering.presentation.renderers import ORJSONRenderer
 
 
-def create_global_api() -> NinjaExtraAPI:
+def create_global_api(async_views: bool) -> NinjaExtraAPI:
     """
     Creates NinjaAPI with routers
+    :param async_views: serve users and favourites with async views (under ASGI)
     :return: Global API
     """
 
@@ -16,14 +19,15 @@ def create_global_api() -> NinjaExtraAPI:
         title="NinjaREST",
         description="REST API",
         version="1.0.0",
+        renderer=ORJSONRenderer(),
     )
 
-    global_api.register_controllers(NinjaJWTDefaultController)
+    global_api.register_controllers(TokenController)
 
-    register_users_api(global_api)
-    register_favourites_api(global_api)
+    register_users_api(global_api, async_views=async_views)
+    register_favourites_api(global_api, async_views=async_views)
 
     return global_api
 
 
-global_ninja_api = create_global_api()
+global_ninja_api = create_global_api(async_views=settings.REST_ASYNC_VIEWS)
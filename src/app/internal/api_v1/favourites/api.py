@@ -2,13 +2,18 @@ from ninja_extra import NinjaExtraAPI
 
 from app.internal.api_v1.favourites.db.repositories import FavouriteRepository
 from app.internal.api_v1.favourites.domain.services import FavouriteService
-from app.internal.api_v1.favourites.presentation.rest.handlers import RestFavouritesHandlers
+from app.internal.api_v1.favourites.presentation.rest.handlers import (
+    AsyncRestFavouritesHandlers,
+    RestFavouritesHandlers,
+)
 from app.internal.api_v1.favourites.presentation.rest.routers import get_favourites_router
 from app.internal.api_v1.users.db.repositories import UserRepository
 from app.internal.api_v1.users.domain.services import UserService
+from app.internal.api_v1.utils.authentication.db.caches import inactive_users, revoked_tokens
+from app.internal.api_v1.utils.authentication.presentation.handlers import JWTClaimsAuth
 
 
-def register_favourites_api(global_api: NinjaExtraAPI):
+def register_favourites_api(global_api: NinjaExtraAPI, async_views: bool):
     """
     Builds Favourites part of REST APi and
     attaches routers to global Ninja API
@@ -20,7 +25,11 @@ def register_favourites_api(global_api: NinjaExtraAPI):
     fav_repo = FavouriteRepository(user_repo=user_repo)
     fav_service = FavouriteService(fav_repo=fav_repo)
 
-    rest_fav_handlers = RestFavouritesHandlers(fav_service=fav_service, user_service=user_service)
+    handlers_class = AsyncRestFavouritesHandlers if async_views else RestFavouritesHandlers
+    rest_fav_handlers = handlers_class(fav_service=fav_service, user_service=user_service)
 
-    fav_router = get_favourites_router(rest_fav_handlers=rest_fav_handlers)
+    fav_router = get_favourites_router(
+        rest_fav_handlers=rest_fav_handlers,
+        auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+    )
     global_api.add_router("/favourites", fav_router)
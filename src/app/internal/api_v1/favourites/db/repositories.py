@@ -1,5 +1,5 @@
 import logging
-from typing import Any, List, Optional
+from typing import Any, List
 
 from app.internal.api_v1.favourites.db.exceptions import (
     FavouriteNotFoundException,
@@ -12,7 +12,7 @@ from app.internal.api_v1.favourites.domain.services import IFavouriteRepository
 from app.internal.api_v1.users.db.exceptions import UserNotFoundException
 from app.internal.api_v1.users.db.models import User
 from app.internal.api_v1.users.db.repositories import UserRepository
-from app.internal.api_v1.users.domain.entities import UserSchema
+from app.internal.api_v1.users.domain.entities import USER_SCHEMA_FIELDS, UserSchema
 
 logger = logging.getLogger("stdout_with_tlg")
 
@@ -24,18 +24,24 @@ class FavouriteRepository(IFavouriteRepository):
     def get_limited_list_of_favourites(self, tlg_id: int, favs_limit: int) -> List[UserSchema]:
         """
         Returns limited list of favourite users for Telegram User
-        with ID tlg_id or raises FavouriteNotFoundException (if fav_obj was not found)
+        with ID tlg_id or raises FavouriteNotFoundException (if fav_obj was not found).
+        Favourites are selected with owner's Favourite object by one LEFT JOIN query
+        (owner without favourites gives a single row of NULLs)
         ----------
 
         :param tlg_id: Telegram ID of this user
         :param favs_limit: limit of favs in result list
         """
-        fav_opt: Optional[Favourite] = Favourite.objects.filter(tlg_id=tlg_id).first()
+        rows = list(
+            Favourite.objects.filter(tlg_id=tlg_id).values_list(
+                *(f"favourites__{field}" for field in USER_SCHEMA_FIELDS)
+            )[:favs_limit]
+        )
 
-        if fav_opt is None:
+        if not rows:
             raise FavouriteNotFoundException("There is no Favourite object with such owner")
 
-        return [UserSchema.from_orm(user_model) for user_model in fav_opt.favourites.all()[:favs_limit]]
+        return [UserSchema.from_values(row) for row in rows if row[0] is not None]
 
     def try_del_fav_from_user(self, tlg_id_of_owner: int, fav_user: UserSchema) -> None:
         """
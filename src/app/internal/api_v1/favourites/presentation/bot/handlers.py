@@ -26,6 +26,7 @@ from app.internal.api_v1.favourites.presentation.bot.telegram_messages import (
 )
 from app.internal.api_v1.users.db.exceptions import UserNotFoundException
 from app.internal.api_v1.users.domain.entities import UserSchema
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import HANDLER_USER_ERROR, set_handler_outcome
 from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
 from app.internal.api_v1.utils.telegram.domain.services import verified_phone_required
 
@@ -83,6 +84,7 @@ class TelegramFavouritesHandlers:
         command_data = update.message.text.split(" ")
 
         if len(command_data) != 2:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_ARG_FAV_MSG)
             return
 
@@ -97,6 +99,7 @@ class TelegramFavouritesHandlers:
             await self._favourite_service.atry_del_fav_from_user(user_id, another_user)
 
         except UserNotInFavouritesException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=USER_NOT_IN_FAV)
             return
 
@@ -116,6 +119,7 @@ class TelegramFavouritesHandlers:
         command_data = update.message.text.split(" ")
 
         if len(command_data) != 2:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_ARG_FAV_MSG)
             return
 
@@ -130,6 +134,7 @@ class TelegramFavouritesHandlers:
             await self._favourite_service.atry_add_fav_to_user(user_id, another_user)
 
         except SecondTimeAdditionException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=RESTRICT_SECOND_TIME_ADD)
             return
 
@@ -160,14 +165,17 @@ class TelegramFavouritesHandlers:
             another_user: UserSchema = await self._favourite_service.aget_another_user_by_arg(argument)
 
         except InvalidIDArgumentException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
             return None
 
         except UserNotFoundException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_FAV_USER)
             return None
 
         if another_user.tlg_id == user_id:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=RESTRICT_SELF_OPS)
             return None
 
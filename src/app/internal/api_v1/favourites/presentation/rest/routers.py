@@ -1,13 +1,18 @@
-from typing import List
+from typing import List, Union
 
 from ninja import Router
-from ninja_jwt.authentication import JWTAuth
+from ninja.security import HttpBearer
 
-from app.internal.api_v1.favourites.presentation.rest.handlers import RestFavouritesHandlers
+from app.internal.api_v1.favourites.presentation.rest.handlers import (
+    AsyncRestFavouritesHandlers,
+    RestFavouritesHandlers,
+)
 from app.internal.api_v1.users.domain.entities import MessageResponseSchema, UserSchema
 
 
-def get_favourites_router(rest_fav_handlers: RestFavouritesHandlers):
+def get_favourites_router(
+    rest_fav_handlers: Union[RestFavouritesHandlers, AsyncRestFavouritesHandlers], auth: HttpBearer
+):
     """
     Creates router for /favourites/* requests
     """
@@ -22,7 +27,7 @@ def get_favourites_router(rest_fav_handlers: RestFavouritesHandlers):
             200: List[UserSchema],
             404: MessageResponseSchema,
         },
-        auth=JWTAuth(),
+        auth=auth,
         description="Returns list of favourite users",
     )
 
@@ -36,7 +41,7 @@ def get_favourites_router(rest_fav_handlers: RestFavouritesHandlers):
             403: MessageResponseSchema,
             404: MessageResponseSchema,
         },
-        auth=JWTAuth(),
+        auth=auth,
         description="Addes Telegram user into favourites list",
     )
 
@@ -50,7 +55,7 @@ def get_favourites_router(rest_fav_handlers: RestFavouritesHandlers):
             403: MessageResponseSchema,
             404: MessageResponseSchema,
         },
-        auth=JWTAuth(),
+        auth=auth,
         description="Deletes Telegram user from favourites",
     )
 
@@ -5,6 +5,7 @@ from app.internal.api_v1.payment.accounts.db.exceptions import AccountNotFoundEx
 from app.internal.api_v1.payment.accounts.db.models import Account
 from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
 from app.internal.api_v1.payment.accounts.domain.services import IAccountRepository
+from app.internal.api_v1.utils.monitoring.metrics.db.repositories import get_number_of_rows
 
 logger = logging.getLogger("stdout_with_tlg")
 
@@ -40,4 +41,4 @@ class AccountRepository(IAccountRepository):
         """
         Returns current number of Cards in DB
         """
-        return Account.objects.count()
+        return get_number_of_rows(Account)
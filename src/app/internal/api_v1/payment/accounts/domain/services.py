@@ -1,10 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple
 
-from asgiref.sync import sync_to_async
-
 from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
-from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
+from app.internal.api_v1.utils.database.domain.services import db_sync_to_async
 
 
 class IAccountRepository(ABC):
@@ -25,20 +23,19 @@ class AccountService:
     def __init__(self, account_repo: IAccountRepository):
         self._account_repo = account_repo
 
-    @sync_to_async
+    @db_sync_to_async
     def aget_account_by_id(self, uniq_id: int) -> AccountSchema:
         return self.get_account_by_id(uniq_id=uniq_id)
 
     def get_account_by_id(self, uniq_id: int) -> AccountSchema:
         return self._account_repo.get_account_by_id(uniq_id=uniq_id)
 
-    @sync_to_async
+    @db_sync_to_async
     def aget_full_owner_name_from_account_by_id(self, uniq_id: int) -> str:
         return self.get_full_owner_name_from_account_by_id(uniq_id=uniq_id)
 
     def get_full_owner_name_from_account_by_id(self, uniq_id: int) -> str:
         return self._account_repo.get_full_owner_name_from_account_by_id(uniq_id=uniq_id)
 
-    @sync_to_async
-    def aset_current_number_of_accounts_metric(self) -> int:
-        PrometheusMetrics.set_accounts_number_gauge(self._account_repo.get_current_number_of_accounts())
+    def get_current_number_of_accounts(self) -> int:
+        return self._account_repo.get_current_number_of_accounts()
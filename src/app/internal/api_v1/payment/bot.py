@@ -1,4 +1,6 @@
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from django.conf import settings
+from prometheus_client import REGISTRY, CollectorRegistry
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, MessageHandler, filters
 
 from app.internal.api_v1.favourites.db.repositories import FavouriteRepository
 from app.internal.api_v1.favourites.domain.services import FavouriteService
@@ -6,11 +8,15 @@ from app.internal.api_v1.payment.accounts.db.repositories import AccountReposito
 from app.internal.api_v1.payment.accounts.domain.services import AccountService
 from app.internal.api_v1.payment.cards.db.repositories import CardRepository
 from app.internal.api_v1.payment.cards.domain.services import CardService
+from app.internal.api_v1.payment.context.db.repositories import PaymentContextRepository
+from app.internal.api_v1.payment.context.domain.services import PaymentContextResolver
 from app.internal.api_v1.payment.presentation.bot.handlers import TelegramPaymentHandlers
+from app.internal.api_v1.payment.presentation.bot.telegram_messages import HISTORY_PAGE_CALLBACK_PREFIX
 from app.internal.api_v1.payment.transactions.db.repositories import TransactionRepository
 from app.internal.api_v1.payment.transactions.domain.services import TransactionService
 from app.internal.api_v1.users.db.repositories import UserRepository
 from app.internal.api_v1.users.domain.services import UserService
+from app.internal.api_v1.utils.monitoring.metrics.domain.collectors import RowCountCollector
 from app.internal.api_v1.utils.s3.db.repositories import S3Repository
 from app.internal.api_v1.utils.s3.domain.services import S3Service
 
@@ -38,6 +44,9 @@ def register_telegram_payment_handlers(application: Application) -> None:
     s3_repo = S3Repository()
     s3_service = S3Service(s3_repo=s3_repo)
 
+    context_repo = PaymentContextRepository()
+    context_resolver = PaymentContextResolver(context_repo=context_repo)
+
     payment_handlers = TelegramPaymentHandlers(
         user_service=user_service,
         fav_service=fav_service,
@@ -45,6 +54,7 @@ def register_telegram_payment_handlers(application: Application) -> None:
         card_service=card_service,
         tx_service=tx_service,
         s3_service=s3_service,
+        context_resolver=context_resolver,
     )
 
     application.add_handler(CommandHandler("check_card", payment_handlers.check_payable))
@@ -62,8 +72,41 @@ def register_telegram_payment_handlers(application: Application) -> None:
         )
     )
 
+    application.add_handler(CommandHandler("send_batch", payment_handlers.send_batch))
+
     application.add_handler(CommandHandler("list_inter", payment_handlers.list_inter))
     application.add_handler(CommandHandler("list_latest", payment_handlers.list_latest))
 
     application.add_handler(CommandHandler("state_card", payment_handlers.state_payable))
     application.add_handler(CommandHandler("state_account", payment_handlers.state_payable))
+    application.add_handler(
+        CallbackQueryHandler(
+            payment_handlers.history_page, pattern=rf"^{HISTORY_PAGE_CALLBACK_PREFIX} /state_(card|account) \d+ \d+$"
+        )
+    )
+
+
+def register_payment_row_count_collector(registry: CollectorRegistry = REGISTRY) -> None:
+    """
+    Registers gauges with current numbers of Cards and Accounts in DB,
+    computed on metrics scrape
+    """
+
+    account_service = AccountService(account_repo=AccountRepository())
+    card_service = CardService(card_repo=CardRepository())
+
+    registry.register(
+        RowCountCollector(
+            row_counters={
+                "gauge_for_current_number_of_cards": (
+                    "Displays current number of user Cards in DB",
+                    card_service.get_current_number_of_cards,
+                ),
+                "gauge_for_current_number_of_accounts": (
+                    "Returns current number of payment Accounts in DB",
+                    account_service.get_current_number_of_accounts,
+                ),
+            },
+            ttl=settings.METRICS_ROW_COUNT_TTL,
+        )
+    )
@@ -4,6 +4,7 @@ from app.internal.api_v1.payment.cards.db.exceptions import CardNotFoundExceptio
 from app.internal.api_v1.payment.cards.db.models import Card
 from app.internal.api_v1.payment.cards.domain.entities import CardSchema
 from app.internal.api_v1.payment.cards.domain.services import ICardRepository
+from app.internal.api_v1.utils.monitoring.metrics.db.repositories import get_number_of_rows
 
 
 class CardRepository(ICardRepository):
@@ -29,7 +30,7 @@ class CardRepository(ICardRepository):
         """
         card_with_acc_option = (
             Card.objects.filter(corresponding_account__owner__tlg_id=tlg_id)
-            .select_related("corresponding_account")
+            .select_related("corresponding_account__owner")
             .first()
         )
 
@@ -46,7 +47,9 @@ class CardRepository(ICardRepository):
         :param uniq_id: Account uniq_id
         """
         card_with_acc_option = (
-            Card.objects.filter(corresponding_account__uniq_id=uniq_id).select_related("corresponding_account").first()
+            Card.objects.filter(corresponding_account__uniq_id=uniq_id)
+            .select_related("corresponding_account__owner")
+            .first()
         )
 
         if card_with_acc_option is None:
@@ -58,4 +61,4 @@ class CardRepository(ICardRepository):
         """
         Returns current number of cards in DB
         """
-        return Card.objects.count()
+        return get_number_of_rows(Card)
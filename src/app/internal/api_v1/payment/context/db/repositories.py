@@ -0,0 +1,128 @@
+from typing import Optional, Sequence, Union
+
+from django.db import connection
+
+from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
+from app.internal.api_v1.payment.cards.domain.entities import CardSchema
+from app.internal.api_v1.payment.context.domain.entities import (
+    RECIPIENT_BY_ACCOUNT_ID,
+    RECIPIENT_BY_CARD_ID,
+    RECIPIENT_BY_USER_ID,
+    RECIPIENT_BY_USERNAME,
+    PaymentContextSchema,
+)
+from app.internal.api_v1.payment.context.domain.services import IPaymentContextRepository
+from app.internal.api_v1.users.domain.entities import UserSchema
+
+# Columns of user, account and card of one side of payment (in this order)
+SIDE_COLUMNS = (
+    "{side}.tlg_id, {side}.username, {side}.first_name, {side}.last_name, {side}.phone_number, "
+    "{side}_acc.uniq_id, {side}_acc.value, {side}_acc.currency, {side}_acc.party, "
+    "{side}_card.uniq_id, {side}_card.expiration"
+)
+
+# Card with the lowest ID (as .first() does) of accounts owned by user
+FIRST_CARD_OF_OWNER_SQL = """(
+    SELECT card.uniq_id FROM payment_cards AS card
+    JOIN payment_accounts AS acc ON acc.uniq_id = card.corresponding_account_id
+    WHERE acc.owner_id = {owner_id}
+    ORDER BY card.uniq_id LIMIT 1
+)"""
+
+RECIPIENT_BY_USER_JOINS_SQL = """
+LEFT JOIN app_user AS recip ON recip.{user_field} = %(recipient)s
+LEFT JOIN payment_cards AS recip_card ON recip_card.uniq_id = {first_card}
+LEFT JOIN payment_accounts AS recip_acc ON recip_acc.uniq_id = recip_card.corresponding_account_id
+"""
+
+RECIPIENT_BY_CARD_JOINS_SQL = """
+LEFT JOIN payment_cards AS recip_card ON recip_card.uniq_id = {card_id}
+LEFT JOIN payment_accounts AS recip_acc ON recip_acc.uniq_id = recip_card.corresponding_account_id
+LEFT JOIN app_user AS recip ON recip.tlg_id = recip_acc.owner_id
+"""
+
+RECIPIENT_JOINS_SQL = {
+    RECIPIENT_BY_USERNAME: RECIPIENT_BY_USER_JOINS_SQL.format(
+        user_field="username", first_card=FIRST_CARD_OF_OWNER_SQL.format(owner_id="recip.tlg_id")
+    ),
+    RECIPIENT_BY_USER_ID: RECIPIENT_BY_USER_JOINS_SQL.format(
+        user_field="tlg_id", first_card=FIRST_CARD_OF_OWNER_SQL.format(owner_id="recip.tlg_id")
+    ),
+    RECIPIENT_BY_ACCOUNT_ID: RECIPIENT_BY_CARD_JOINS_SQL.format(
+        card_id="""(
+            SELECT card.uniq_id FROM payment_cards AS card
+            WHERE card.corresponding_account_id = %(recipient)s
+            ORDER BY card.uniq_id LIMIT 1
+        )"""
+    ),
+    RECIPIENT_BY_CARD_ID: RECIPIENT_BY_CARD_JOINS_SQL.format(card_id="%(recipient)s"),
+}
+
+# Sender (with card and account) and recipient (with card and account) in one row.
+# Anchor row makes every part optional, so missing ones come as NULLs.
+PAYMENT_CONTEXT_SQL = """
+SELECT {sender_columns}, {recipient_columns}
+FROM (SELECT %(sender_id)s AS sender_id) AS args
+LEFT JOIN app_user AS sender ON sender.tlg_id = args.sender_id
+LEFT JOIN payment_cards AS sender_card ON sender_card.uniq_id = {sender_first_card}
+LEFT JOIN payment_accounts AS sender_acc ON sender_acc.uniq_id = sender_card.corresponding_account_id
+{recipient_joins}
+ORDER BY recip.tlg_id
+LIMIT 1
+"""
+
+
+def get_card_from_row(row: Sequence) -> Optional[CardSchema]:
+    """
+    Returns Card (with its account and owner) from SIDE_COLUMNS of one side,
+    or None if there is no card
+    """
+    tlg_id, username, first_name, last_name, phone_number, acc_id, value, currency, party, card_id, expiration = row
+
+    if card_id is None:
+        return None
+
+    owner = UserSchema(
+        tlg_id=tlg_id, username=username, first_name=first_name, last_name=last_name, phone_number=phone_number
+    )
+    account = AccountSchema(uniq_id=acc_id, value=value, currency=currency, party=party, owner=owner)
+
+    return CardSchema(uniq_id=card_id, corresponding_account=account, expiration=expiration)
+
+
+class PaymentContextRepository(IPaymentContextRepository):
+    def get_payment_context(
+        self, sender_id: int, recipient_kind: Optional[str], recipient: Optional[Union[int, str]]
+    ) -> PaymentContextSchema:
+        """
+        Resolves everything /send_to_* commands need with a single query:
+        sender with phone number, card and account and recipient
+        (by username, user ID, account ID or card ID) with card, account and name.
+        ----------
+
+        :param sender_id: Telegram ID of sender
+        :param recipient_kind: one of RECIPIENT_BY_* (or None to resolve only sender)
+        :param recipient: recipient username / ID
+        """
+        query = PAYMENT_CONTEXT_SQL.format(
+            sender_columns=SIDE_COLUMNS.format(side="sender"),
+            recipient_columns=SIDE_COLUMNS.format(side="recip"),
+            sender_first_card=FIRST_CARD_OF_OWNER_SQL.format(owner_id="args.sender_id"),
+            recipient_joins=RECIPIENT_JOINS_SQL[recipient_kind or RECIPIENT_BY_CARD_ID],
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, {"sender_id": sender_id, "recipient": recipient})
+            row = cursor.fetchone()
+
+        sender_row, recipient_row = row[: len(row) // 2], row[len(row) // 2 :]
+        recipient_card = get_card_from_row(recipient_row)
+
+        return PaymentContextSchema(
+            sender_found=sender_row[0] is not None,
+            sender_phone_verified=bool(sender_row[4]),
+            sender_card=get_card_from_row(sender_row),
+            recipient_user_found=recipient_row[0] is not None,
+            recipient_card=recipient_card,
+            recipient_name=" ".join(recipient_row[2:4]) if recipient_card is not None else None,
+        )
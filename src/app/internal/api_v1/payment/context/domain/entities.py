@@ -0,0 +1,21 @@
+from typing import Optional
+
+from ninja import Schema
+
+from app.internal.api_v1.payment.cards.domain.entities import CardSchema
+
+# Ways to specify recipient of /send_to_* commands
+RECIPIENT_BY_USERNAME = "username"
+RECIPIENT_BY_USER_ID = "user_id"
+RECIPIENT_BY_ACCOUNT_ID = "account_id"
+RECIPIENT_BY_CARD_ID = "card_id"
+
+
+class PaymentContextSchema(Schema):
+    sender_found: bool = False
+    sender_phone_verified: bool = False
+    sender_card: Optional[CardSchema] = None
+
+    recipient_user_found: bool = False
+    recipient_card: Optional[CardSchema] = None
+    recipient_name: Optional[str] = None
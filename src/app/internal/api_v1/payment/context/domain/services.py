@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+from app.internal.api_v1.payment.context.domain.entities import PaymentContextSchema
+from app.internal.api_v1.utils.database.domain.services import db_sync_to_async
+
+
+class IPaymentContextRepository(ABC):
+    @abstractmethod
+    def get_payment_context(
+        self, sender_id: int, recipient_kind: Optional[str], recipient: Optional[Union[int, str]]
+    ) -> PaymentContextSchema:
+        pass
+
+
+class PaymentContextResolver:
+    def __init__(self, context_repo: IPaymentContextRepository):
+        self._context_repo = context_repo
+
+    @db_sync_to_async
+    def aresolve(
+        self, sender_id: int, recipient_kind: Optional[str] = None, recipient: Optional[Union[int, str]] = None
+    ) -> PaymentContextSchema:
+        return self.resolve(sender_id=sender_id, recipient_kind=recipient_kind, recipient=recipient)
+
+    def resolve(
+        self, sender_id: int, recipient_kind: Optional[str] = None, recipient: Optional[Union[int, str]] = None
+    ) -> PaymentContextSchema:
+        return self._context_repo.get_payment_context(
+            sender_id=sender_id, recipient_kind=recipient_kind, recipient=recipient
+        )
@@ -1,11 +1,15 @@
+import calendar
 import logging
-from typing import Optional
+from datetime import timedelta
+from typing import Any, Optional, Tuple
 
 from django.core.files.images import ImageFile
-from telegram import Update
+from django.utils import timezone
+from telegram import InlineKeyboardMarkup, Update
+from telegram.constants import MediaGroupLimit, MessageLimit
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
-from app.internal.api_v1.favourites.db.exceptions import InvalidIDArgumentException
 from app.internal.api_v1.favourites.domain.services import FavouriteService
 from app.internal.api_v1.favourites.presentation.bot.telegram_messages import NOT_VALID_ID_MSG
 from app.internal.api_v1.payment.accounts.db.exceptions import AccountNotFoundException
@@ -14,38 +18,121 @@ from app.internal.api_v1.payment.accounts.domain.services import AccountService
 from app.internal.api_v1.payment.cards.db.exceptions import CardNotFoundException
 from app.internal.api_v1.payment.cards.domain.entities import CardSchema
 from app.internal.api_v1.payment.cards.domain.services import CardService
+from app.internal.api_v1.payment.context.domain.entities import (
+    RECIPIENT_BY_ACCOUNT_ID,
+    RECIPIENT_BY_CARD_ID,
+    RECIPIENT_BY_USER_ID,
+    RECIPIENT_BY_USERNAME,
+    PaymentContextSchema,
+)
+from app.internal.api_v1.payment.context.domain.services import PaymentContextResolver
 from app.internal.api_v1.payment.presentation.bot.telegram_messages import (
     ABSENT_ID_NUMBER,
     BALANCE_NOT_FOUND,
     CARD_NOT_FOUND,
     ERROR_DURING_TRANSFER,
+    FIRST_HISTORY_PAGE,
     INCR_TX_VALUE,
     INSUF_BALANCE,
+    INVALID_PAGE,
     NO_INTERACTED_USERS,
     NO_LATEST_TXS,
+    NO_MORE_INTERACTED_USERS,
+    NO_MORE_TXS_FOR_LAST_MONTH,
     NO_TXS_FOR_LAST_MONTH,
+    NO_VERIFIED_PN,
     RSP_NOT_FOUND,
     RSP_RESTRICTION,
     SELF_TRANSFER_ERROR,
+    SEND_BATCH_ARGS,
     SENDER_RESTRICTION,
     STATE_NOT_FOUND,
+    get_batch_too_large_message,
+    get_history_page_keyboard,
+    get_latest_transaction_message,
     get_message_for_send_command,
     get_message_with_balance,
+    get_result_lines_for_batch,
     get_result_message_for_list_interacted,
-    get_result_message_for_transaction_state,
     get_successful_transfer_message,
+    get_summary_message,
+    get_transaction_state_message,
 )
 from app.internal.api_v1.payment.transactions.db.exceptions import InsufficientBalanceException, TransferException
+from app.internal.api_v1.payment.transactions.domain.entities import TransferSchema
 from app.internal.api_v1.payment.transactions.domain.services import TransactionService
-from app.internal.api_v1.users.db.exceptions import UserNotFoundException
-from app.internal.api_v1.users.domain.entities import UserSchema
 from app.internal.api_v1.users.domain.services import UserService
+from app.internal.api_v1.users.presentation.bot.telegram_messages import USER_NOT_FOUND_MSG
+from app.internal.api_v1.utils.caching.domain.services import TTLCache
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import (
+    HANDLER_EXCEPTION,
+    HANDLER_USER_ERROR,
+    set_handler_outcome,
+)
 from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
 from app.internal.api_v1.utils.s3.domain.services import S3Service
-from app.internal.api_v1.utils.telegram.domain.services import verified_phone_required
+from app.internal.api_v1.utils.telegram.domain.services import (
+    pack_lines_into_messages,
+    send_photos_with_captions,
+    verified_phone_required,
+)
 
 logger = logging.getLogger("stdout_with_tlg")
 
+# Max number of transfers in one /send_batch command
+SEND_BATCH_LIMIT = 100
+
+# Number of usernames on one /list_inter page
+LIST_INTER_PAGE_SIZE = 20
+
+# Max number of transactions on one /state_card (/state_account) page
+STATE_PAGE_SIZE = 20
+
+# Rendered /state_* pages (text and cursor of the next page) and cursors of previous pages.
+# Keys are (user ID, command, card / account ID, page cursor)
+HISTORY_PAGES_CACHE_TTL = 5 * 60
+HISTORY_PAGES_CACHE_SIZE = 10000
+history_pages_cache: TTLCache[Tuple[str, Optional[int]]] = TTLCache(
+    ttl=HISTORY_PAGES_CACHE_TTL, maxsize=HISTORY_PAGES_CACHE_SIZE
+)
+previous_history_page_cursors: TTLCache[int] = TTLCache(ttl=HISTORY_PAGES_CACHE_TTL, maxsize=HISTORY_PAGES_CACHE_SIZE)
+
+
+def get_idempotency_key_for_update(update: Update) -> str:
+    """
+    Returns idempotency key of transfer requested with this Telegram update.
+    Telegram resends the same update_id when webhook delivery is retried.
+    Key is unique only for a sender and is checked together with recipient and value,
+    since update_id sequence can be restarted (e.g. after a week without updates).
+    """
+    return f"tlg-update:{update.update_id}"
+
+
+def get_recipient_of_send_command(arg_command: str, arg_user_or_id: str) -> Tuple[Optional[str], Any]:
+    """
+    Returns the way recipient of /send_to_* command is specified and
+    parsed recipient argument, or (None, None) if argument is not valid.
+    ----------
+
+    :param arg_command: /send_to_user, /send_to_account or /send_to_card
+    :param arg_user_or_id: recipient @username or ID
+    """
+    if arg_command == "/send_to_user" and arg_user_or_id.startswith("@"):
+        return RECIPIENT_BY_USERNAME, arg_user_or_id[1:]
+
+    if not arg_user_or_id.isdigit() or int(arg_user_or_id) <= 0:
+        return None, None
+
+    match arg_command:
+        case "/send_to_user":
+            return RECIPIENT_BY_USER_ID, int(arg_user_or_id)
+        case "/send_to_account":
+            return RECIPIENT_BY_ACCOUNT_ID, int(arg_user_or_id)
+        case "/send_to_card":
+            return RECIPIENT_BY_CARD_ID, int(arg_user_or_id)
+
+    return None, None
+
 
 class TelegramPaymentHandlers:
     def __init__(
@@ -56,6 +143,7 @@ class TelegramPaymentHandlers:
         card_service: CardService,
         tx_service: TransactionService,
         s3_service: S3Service,
+        context_resolver: PaymentContextResolver,
     ):
         self._user_service = user_service
         self._fav_service = fav_service
@@ -66,6 +154,8 @@ class TelegramPaymentHandlers:
         self._tx_service = tx_service
         self._s3_service = s3_service
 
+        self._context_resolver = context_resolver
+
     @verified_phone_required
     async def check_payable(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
@@ -81,6 +171,7 @@ class TelegramPaymentHandlers:
         command_data = update.message.text.split(" ")
 
         if len(command_data) != 2:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_ID_NUMBER)
             return
 
@@ -88,6 +179,7 @@ class TelegramPaymentHandlers:
         obj_option = None
 
         if not uniq_id.isdigit() or int(uniq_id) <= 0:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
             return
 
@@ -99,6 +191,7 @@ class TelegramPaymentHandlers:
 
             except CardNotFoundException:
                 logger.info(f"Card with ID {uniq_id} not found in DB")
+                set_handler_outcome(HANDLER_USER_ERROR)
                 await context.bot.send_message(chat_id=update.effective_chat.id, text=BALANCE_NOT_FOUND)
                 return
 
@@ -108,6 +201,7 @@ class TelegramPaymentHandlers:
 
             except AccountNotFoundException:
                 logger.info(f"Account with ID {uniq_id} not found in DB")
+                set_handler_outcome(HANDLER_USER_ERROR)
                 await context.bot.send_message(chat_id=update.effective_chat.id, text=BALANCE_NOT_FOUND)
                 return
 
@@ -124,7 +218,9 @@ class TelegramPaymentHandlers:
         """
         Handler for /state_card and /state_account commands.
 
-        Returns list of payment transaction for specified card or account for the last month.
+        Returns page of payment transactions for specified card or account for the last month
+        (as a single message with inline buttons for other pages).
+        Optional third argument is ID of the last transaction from the previous page.
         Or returns empty list if user have no payment transactions.
         ----------
         :param update: recieved Update object
@@ -134,47 +230,89 @@ class TelegramPaymentHandlers:
         chat_id = update.effective_chat.id
         command_data = update.message.text.split(" ")
 
-        if len(command_data) != 2:
+        if len(command_data) not in (2, 3):
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_ID_NUMBER)
             return
 
         command, uniq_id = command_data[0], command_data[1]
-        obj_option = None
 
-        if not uniq_id.isdigit() or int(uniq_id) <= 0:
+        if any(not arg.isdigit() or int(arg) <= 0 for arg in command_data[1:]):
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
             return
 
-        if command == "/state_card":
-            try:
-                obj_option: CardSchema = await self._card_service.aget_card_with_related_account_by_card_id(uniq_id)
+        after_tx_id = int(command_data[2]) if len(command_data) == 3 else None
 
-            except CardNotFoundException:
-                logger.info(f"Card with ID {uniq_id} not found in DB")
-                await context.bot.send_message(chat_id=update.effective_chat.id, text=STATE_NOT_FOUND)
-                return
-        else:
-            try:
-                obj_option: AccountSchema = await self._account_service.aget_account_by_id(uniq_id)
+        account_id = await self.get_account_id_of_payable(command, uniq_id)
+        if account_id is None:
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=STATE_NOT_FOUND)
+            return
 
-            except AccountNotFoundException:
-                logger.info(f"Account with ID {uniq_id} not found in DB")
-                await context.bot.send_message(chat_id=update.effective_chat.id, text=STATE_NOT_FOUND)
+        cursor = after_tx_id or FIRST_HISTORY_PAGE
+        page = await self.render_history_page(account_id, cursor)
+
+        if page is None:
+            await context.bot.send_message(
+                chat_id=chat_id, text=NO_TXS_FOR_LAST_MONTH if after_tx_id is None else NO_MORE_TXS_FOR_LAST_MONTH
+            )
+            return
+
+        user_id = update.effective_user.id
+        history_pages_cache.set((user_id, command, uniq_id, cursor), page)
+
+        text, next_cursor = page
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            reply_markup=self.get_history_page_keyboard_for_user(user_id, command, uniq_id, cursor, next_cursor),
+        )
+
+    @verified_phone_required
+    async def history_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        Handler for inline buttons of /state_card and /state_account pages.
+
+        Shows requested page of transactions in place of the current one.
+        Rendered pages are cached per user, so going back and forth doesn't query DB.
+        ----------
+        :param update: recieved Update object
+        :param context: context object
+        """
+        query = update.callback_query
+        await context.bot.answer_callback_query(callback_query_id=query.id)
+
+        user_id, chat_id = update.effective_user.id, update.effective_chat.id
+        _, command, uniq_id, cursor = query.data.split(" ")
+        cursor = int(cursor)
+
+        page = history_pages_cache.get((user_id, command, uniq_id, cursor))
+        if page is None:
+            account_id = await self.get_account_id_of_payable(command, uniq_id)
+            page = await self.render_history_page(account_id, cursor) if account_id is not None else None
+
+            if page is None:
+                await context.bot.send_message(chat_id=chat_id, text=NO_MORE_TXS_FOR_LAST_MONTH)
                 return
 
-        if command == "/state_card":
-            owner_id = obj_option.corresponding_account.owner.tlg_id
-            await self.send_result_message_for_transaction_state(context, chat_id, owner_id)
+            history_pages_cache.set((user_id, command, uniq_id, cursor), page)
 
-        elif command == "/state_account":
-            owner_id = obj_option.owner.tlg_id
-            await self.send_result_message_for_transaction_state(context, chat_id, owner_id)
+        text, next_cursor = page
+        await context.bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=query.message.message_id,
+            text=text,
+            reply_markup=self.get_history_page_keyboard_for_user(user_id, command, uniq_id, cursor, next_cursor),
+        )
 
     @verified_phone_required
     async def list_latest(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
         Handler for /list_latest command.
-        Returns latest unseen transactions with attached images.
+        Returns latest unseen transactions packed into as few messages as possible,
+        transactions with attached images are sent as photo albums with captions
+        (by Telegram file_id of the original photo when it's known).
         ----------
 
         :param update: recieved Update object
@@ -183,29 +321,42 @@ class TelegramPaymentHandlers:
         user_id, chat_id = update.effective_user.id, update.effective_chat.id
 
         tx_list = await self._tx_service.aget_list_of_latest_unseen_transactions(user_id=user_id)
-        if tx_list:
-            for tx_data in tx_list:
-                res_msg = ""
-                res_msg += (
-                    f"TX ID: {tx_data['tx_id']}, "
-                    + f"Sender: {tx_data['sender_name']}, "
-                    + f"Recipient: {tx_data['recip_name']}, "
-                    + f"Value: {tx_data['tx_value']}\n"
-                )
+        if not tx_list:
+            await context.bot.send_message(chat_id=chat_id, text=NO_LATEST_TXS)
+            return
 
-                if tx_data["tx_image"] is not None:
-                    image = await self._s3_service.aget_image_from_s3_bucket(image_id=tx_data["tx_image"])
-                    await context.bot.send_photo(chat_id=chat_id, photo=image.content.read())
+        text_lines = [get_latest_transaction_message(tx_data) for tx_data in tx_list if tx_data["tx_image"] is None]
+        for message in pack_lines_into_messages(text_lines):
+            await context.bot.send_message(chat_id=chat_id, text=message)
 
-                await context.bot.send_message(chat_id=chat_id, text=res_msg)
-            return
-        await context.bot.send_message(chat_id=chat_id, text=NO_LATEST_TXS)
+        txs_with_photos = [tx_data for tx_data in tx_list if tx_data["tx_image"] is not None]
+        for start in range(0, len(txs_with_photos), MediaGroupLimit.MAX_MEDIA_LENGTH):
+            group = txs_with_photos[start : start + MediaGroupLimit.MAX_MEDIA_LENGTH]
+
+            # Photos are sent by Telegram file_id, S3 is used only for old images or if Telegram rejects the ID
+            photos = []
+            for tx_data in group:
+                content = tx_data["tx_image_file_id"] or await self.aget_image_content(tx_data["tx_image"])
+                photos.append((content, get_latest_transaction_message(tx_data)))
+
+            try:
+                await send_photos_with_captions(context, chat_id, photos)
+
+            except BadRequest as err:
+                logger.info(f"Unable to send photos by file_id, sending them from S3:\n{err}")
+
+                photos = []
+                for tx_data in group:
+                    content = await self.aget_image_content(tx_data["tx_image"])
+                    photos.append((content, get_latest_transaction_message(tx_data)))
+
+                await send_photos_with_captions(context, chat_id, photos)
 
     @verified_phone_required
     async def list_inter(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
         Handler for /list_inter command.
-        Returns list of users this user have interacted with.
+        Returns page of users this user have interacted with (the most recent first).
         Or returns empty list if user have no payment transactions.
         ----------
 
@@ -214,19 +365,39 @@ class TelegramPaymentHandlers:
         """
 
         user_id, chat_id = update.effective_user.id, update.effective_chat.id
-        usernames = await self._tx_service.aget_list_of_inter_usernames(user_id)
+        command_data = update.message.text.split(" ")
+
+        page = 1
+        if len(command_data) == 2:
+            if not command_data[1].isdigit() or int(command_data[1]) <= 0:
+                set_handler_outcome(HANDLER_USER_ERROR)
+                await context.bot.send_message(chat_id=chat_id, text=INVALID_PAGE)
+                return
+
+            page = int(command_data[1])
+
+        usernames = await self._tx_service.aget_list_of_inter_usernames(
+            user_id, limit=LIST_INTER_PAGE_SIZE, offset=(page - 1) * LIST_INTER_PAGE_SIZE
+        )
 
         if usernames:
-            await context.bot.send_message(chat_id=chat_id, text=get_result_message_for_list_interacted(usernames))
+            next_page = page + 1 if len(usernames) == LIST_INTER_PAGE_SIZE else None
+            await context.bot.send_message(
+                chat_id=chat_id, text=get_result_message_for_list_interacted(usernames, next_page)
+            )
             return
 
-        await context.bot.send_message(chat_id=chat_id, text=NO_INTERACTED_USERS)
+        await context.bot.send_message(
+            chat_id=chat_id, text=NO_INTERACTED_USERS if page == 1 else NO_MORE_INTERACTED_USERS
+        )
 
-    @verified_phone_required
     async def send_to(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
         Universal handler for all /send_to_{recip} commands.
         Allows transactions between Users.
+
+        Sender (with verified phone flag), recipient and their cards / accounts
+        are resolved with one query, see PaymentContextResolver.
         ----------
 
         :param update: recieved Update object
@@ -239,194 +410,309 @@ class TelegramPaymentHandlers:
         else:
             command_data = update.message.text.split(" ")
 
+        recipient_kind, recipient = None, None
+        if len(command_data) == 3:
+            recipient_kind, recipient = get_recipient_of_send_command(command_data[0], command_data[1])
+
+        payment_context = await self.resolve_context_of_verified_sender(
+            context, chat_id, user_id, recipient_kind, recipient
+        )
+        if payment_context is None:
+            return
+
         if len(command_data) != 3:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=get_message_for_send_command(command_data[0]))
             return
 
-        arg_command, arg_user_or_id, arg_value = command_data
+        arg_command, _, arg_value = command_data
 
         if not arg_value.isdigit() or int(arg_value) <= 0:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=INCR_TX_VALUE)
             return
 
         value = int(arg_value)
 
-        await self._card_service.aset_current_number_of_cards_metric()
-        await self._account_service.aset_current_number_of_accounts_metric()
-
-        try:
-            sender_card_with_acc_opt: CardSchema = (
-                await self._card_service.aget_card_with_related_account_by_account_owner_id(tlg_id=user_id)
-            )
-
-        except CardNotFoundException:
+        if payment_context.sender_card is None:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=SENDER_RESTRICTION)
             return
 
         match arg_command:
             case "/send_to_user":
                 PrometheusMetrics.inc_send_to_user_counter()
-                recip_card_with_acc_opt = await self.handle_case_with_send_to_user(context, chat_id, arg_user_or_id)
-
             case "/send_to_account":
                 PrometheusMetrics.inc_send_to_account_counter()
-                recip_card_with_acc_opt = await self.handle_case_with_send_to_account(context, chat_id, arg_user_or_id)
-
             case "/send_to_card":
                 PrometheusMetrics.inc_send_to_card_counter()
-                recip_card_with_acc_opt = await self.handle_case_with_send_to_card(context, chat_id, arg_user_or_id)
 
-        if recip_card_with_acc_opt is None:
+        if recipient_kind is None:
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
+            return
+
+        if payment_context.recipient_card is None:
+            if recipient_kind == RECIPIENT_BY_CARD_ID:
+                error_text = CARD_NOT_FOUND
+            elif (
+                recipient_kind in (RECIPIENT_BY_USERNAME, RECIPIENT_BY_USER_ID)
+                and not payment_context.recipient_user_found
+            ):
+                error_text = RSP_NOT_FOUND
+            else:
+                error_text = RSP_RESTRICTION
+
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=error_text)
             return
 
-        sending_payment_account: AccountSchema = sender_card_with_acc_opt.corresponding_account
-        recipient_payment_account: AccountSchema = recip_card_with_acc_opt.corresponding_account
+        sending_payment_account: AccountSchema = payment_context.sender_card.corresponding_account
+        recipient_payment_account: AccountSchema = payment_context.recipient_card.corresponding_account
 
-        if recipient_payment_account == sending_payment_account:
+        if recipient_payment_account.uniq_id == sending_payment_account.uniq_id:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=SELF_TRANSFER_ERROR)
             return
 
+        idempotency_key = get_idempotency_key_for_update(update)
+
         try:
             image_file = None
-            if photo:
+
+            # Photo of already processed transfer (redelivered update) isn't downloaded and converted again
+            if photo and (
+                await self._tx_service.aget_tx_id_by_idempotency_key(
+                    sending_payment_account.uniq_id, recipient_payment_account.uniq_id, value, idempotency_key
+                )
+                is None
+            ):
                 image_file: ImageFile = await self._s3_service.aconvert_telegram_photo_to_image(update, context)
 
             await self._tx_service.atry_transfer_to(
-                sending_payment_account, recipient_payment_account, value, image_file
+                sending_payment_account,
+                recipient_payment_account,
+                value,
+                image_file,
+                idempotency_key=idempotency_key,
             )
 
         except InsufficientBalanceException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=INSUF_BALANCE)
             return
 
         except TransferException:
+            set_handler_outcome(HANDLER_EXCEPTION)
             await context.bot.send_message(chat_id=chat_id, text=ERROR_DURING_TRANSFER)
             return
 
-        recipient_name = await self._account_service.aget_full_owner_name_from_account_by_id(
-            uniq_id=recipient_payment_account.uniq_id
-        )
+        finally:
+            # Removes temporary file of downloaded photo
+            if image_file is not None and not image_file.closed:
+                image_file.close()
 
-        await context.bot.send_message(chat_id=chat_id, text=get_successful_transfer_message(recipient_name, value))
+        await context.bot.send_message(
+            chat_id=chat_id, text=get_successful_transfer_message(payment_context.recipient_name, value)
+        )
 
-    async def send_result_message_for_transaction_state(
-        self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int
-    ):
+    async def send_batch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
-        Sublogic handler for /state_payable. Tries to create list of transactions
-        for the last month and send it to the user.
+        Handler for /send_batch command.
+        Makes many transfers from user account in a single DB transaction
+        and returns result for each of them. Redelivered update doesn't make them again.
         ----------
 
+        :param update: recieved Update object
         :param context: context object
-        :param chat_id: Telegram Chat ID
-        :param card_id: Recipient Card ID
         """
-        transactions = await self._tx_service.aget_list_of_transactions_for_the_last_month(user_id)
-
-        if transactions:
-            for tx_data in transactions:
-                res_msg = ""
-                res_msg += (
-                    f"TX ID: {tx_data['tx_id']}, "
-                    + f"Date: {tx_data['date']}, "
-                    + f"Sender: {tx_data['sender_name']}, "
-                    + f"Recipient: {tx_data['recip_name']}, "
-                    + f"Value: {tx_data['tx_value']}\n"
-                )
+        user_id, chat_id = update.effective_user.id, update.effective_chat.id
+        batch_data = update.message.text.split()[1:]
 
-                if tx_data["tx_image"] is not None:
-                    presigned_url = await self._s3_service.aget_presigned_url_for_image(tx_data["tx_image"])
-                    res_msg += f"Url : {presigned_url}"
+        payment_context = await self.resolve_context_of_verified_sender(context, chat_id, user_id)
+        if payment_context is None:
+            return
 
-                await context.bot.send_message(chat_id=chat_id, text=res_msg)
+        if not batch_data:
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=SEND_BATCH_ARGS)
             return
-        await context.bot.send_message(chat_id=chat_id, text=NO_TXS_FOR_LAST_MONTH)
 
-    async def handle_case_with_send_to_user(
-        self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, arg_user_or_id: int
-    ) -> Optional[CardSchema]:
-        """
-        Acts like sublogic handler. Tries to get recipient card for send_to_user case
-        (Sender have specified another Telegram User as a recipient)
-        ----------
+        if len(batch_data) > SEND_BATCH_LIMIT:
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=get_batch_too_large_message(SEND_BATCH_LIMIT))
+            return
 
-        :param context: context object
-        :param chat_id: Telegram Chat ID
-        :param arg_user_or_id: Recipient Telegram username (or ID)
+        parsed_batch = [pair.split(":") for pair in batch_data]
 
-        :return: recipient Card or None
-        """
+        if any(len(pair) != 2 or not pair[0].isdigit() or int(pair[0]) <= 0 for pair in parsed_batch):
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=SEND_BATCH_ARGS)
+            return
 
-        try:
-            another_user: UserSchema = await self._fav_service.aget_another_user_by_arg(arg_user_or_id)
+        if any(not value.isdigit() or int(value) <= 0 for _, value in parsed_batch):
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=INCR_TX_VALUE)
+            return
 
-        except InvalidIDArgumentException:
-            await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
-            return None
+        if payment_context.sender_card is None:
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=SENDER_RESTRICTION)
+            return
 
-        except UserNotFoundException:
-            await context.bot.send_message(chat_id=chat_id, text=RSP_NOT_FOUND)
-            return None
+        sender_id = payment_context.sender_card.corresponding_account.uniq_id
+        transfers = [
+            TransferSchema(sender_id=sender_id, recipient_id=int(account_id), value=int(value))
+            for account_id, value in parsed_batch
+        ]
 
         try:
-            card_with_acc = await self._card_service.aget_card_with_related_account_by_account_owner_id(
-                another_user.tlg_id
+            results = await self._tx_service.atry_transfer_many(
+                transfers=transfers, idempotency_key=get_idempotency_key_for_update(update)
             )
 
-            return card_with_acc
+        except TransferException:
+            set_handler_outcome(HANDLER_EXCEPTION)
+            await context.bot.send_message(chat_id=chat_id, text=ERROR_DURING_TRANSFER)
+            return
 
-        except CardNotFoundException:
-            await context.bot.send_message(chat_id=chat_id, text=RSP_RESTRICTION)
-            return None
+        # Money has already moved, so results are split into messages that fit Telegram limit
+        for message in pack_lines_into_messages(get_result_lines_for_batch(results)):
+            await context.bot.send_message(chat_id=chat_id, text=message)
 
-    async def handle_case_with_send_to_account(
-        self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, account_id: int
-    ) -> Optional[CardSchema]:
+    async def aget_image_content(self, image_id: int) -> bytes:
         """
-        Sublogic handler. Tries to get recipient card for send_to_account case
-        (Sender have specified recipient Account ID)
-        ----------
+        Returns content of transaction image from S3
+        """
+        image = await self._s3_service.aget_image_from_s3_bucket(image_id=image_id)
+        return image.content.read()
 
-        :param context: context object
-        :param chat_id: Telegram Chat ID
-        :param account_id: Recipient Payment Account ID
+    async def get_account_id_of_payable(self, command: str, uniq_id: str) -> Optional[int]:
+        """
+        Returns ID of account for /state_card (card ID) or /state_account (account ID) command
+        or None if there is no such card / account.
+        ----------
 
-        :return: Card or None
+        :param command: /state_card or /state_account
+        :param uniq_id: card / account ID from the command
         """
-        if not account_id.isdigit() or int(account_id) <= 0:
-            await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
-            return None
+        if command == "/state_card":
+            try:
+                card: CardSchema = await self._card_service.aget_card_with_related_account_by_card_id(uniq_id)
+            except CardNotFoundException:
+                logger.info(f"Card with ID {uniq_id} not found in DB")
+                return None
+
+            return card.corresponding_account.uniq_id
 
         try:
-            card_with_acc = await self._card_service.aget_card_with_related_account_by_account_id(account_id)
-            return card_with_acc
+            account: AccountSchema = await self._account_service.aget_account_by_id(uniq_id)
+        except AccountNotFoundException:
+            logger.info(f"Account with ID {uniq_id} not found in DB")
+            return None
+
+        return account.uniq_id
+
+    async def render_history_page(self, account_id: int, cursor: int) -> Optional[Tuple[str, Optional[int]]]:
+        """
+        Sublogic handler for /state_payable. Renders page of transactions for the last month
+        as a single message: up to STATE_PAGE_SIZE transactions that fit into Telegram message limit.
+        The first page starts with summary of the last month, which is read from daily rollups.
+        ----------
 
-        except CardNotFoundException:
-            await context.bot.send_message(chat_id=chat_id, text=RSP_RESTRICTION)
+        :param account_id: Payment Account ID
+        :param cursor: ID of the last transaction from the previous page (FIRST_HISTORY_PAGE for the first one)
+        :return: page text and cursor of the next page (None if it's the last page)
+            or None if there are no transactions on this page
+        """
+        today = timezone.now()
+        number_of_days_in_month = calendar.monthrange(today.year, today.month)[1]
+        some_day_a_month_ago = today - timedelta(days=number_of_days_in_month)
+
+        transactions = await self._tx_service.aget_history_page(
+            account_id, after_tx_id=cursor or None, limit=STATE_PAGE_SIZE + 1, date_from=some_day_a_month_ago
+        )
+
+        if not transactions:
             return None
 
-    async def handle_case_with_send_to_card(
-        self, context: ContextTypes.DEFAULT_TYPE, chat_id: int, card_id: int
-    ) -> Optional[CardSchema]:
+        text = ""
+        if cursor == FIRST_HISTORY_PAGE:
+            date_from = timezone.localdate(some_day_a_month_ago)
+            summary = await self._tx_service.aget_summary(account_id, date_from, timezone.localdate(today))
+            text += get_summary_message(summary, date_from) + "\n\n"
+
+        image_ids = [tx_data["tx_image"] for tx_data in transactions[:STATE_PAGE_SIZE] if tx_data["tx_image"]]
+        presigned_urls = await self._s3_service.aget_presigned_urls(image_ids) if image_ids else {}
+
+        number_of_shown_transactions = 0
+        for tx_data in transactions[:STATE_PAGE_SIZE]:
+            tx_message = get_transaction_state_message(tx_data)
+
+            if tx_data["tx_image"] in presigned_urls:
+                tx_message += f"Url : {presigned_urls[tx_data['tx_image']]}\n"
+
+            if number_of_shown_transactions and len(text) + len(tx_message) > MessageLimit.MAX_TEXT_LENGTH:
+                break
+
+            text += tx_message
+            number_of_shown_transactions += 1
+
+        if number_of_shown_transactions == len(transactions):
+            return text, None
+
+        return text, transactions[number_of_shown_transactions - 1]["tx_id"]
+
+    def get_history_page_keyboard_for_user(
+        self, user_id: int, command: str, uniq_id: str, cursor: int, next_cursor: Optional[int]
+    ) -> Optional[InlineKeyboardMarkup]:
         """
-        Tries to get recipient card for send_to_card case
-        (Sender have specified recipient Card ID)
+        Returns inline keyboard of the page of transactions and remembers
+        this page as the previous one for the next page.
+        ----------
+
+        :param user_id: Telegram ID of user who sees the page
+        :param command, uniq_id: command name and card / account ID
+        :param cursor, next_cursor: cursors of this page and the next one
+        """
+        if next_cursor is not None:
+            previous_history_page_cursors.set((user_id, command, uniq_id, next_cursor), cursor)
+
+        previous_cursor = previous_history_page_cursors.get((user_id, command, uniq_id, cursor))
+        return get_history_page_keyboard(command, uniq_id, previous_cursor, next_cursor)
+
+    async def resolve_context_of_verified_sender(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        chat_id: int,
+        user_id: int,
+        recipient_kind: Optional[str] = None,
+        recipient: Any = None,
+    ) -> Optional[PaymentContextSchema]:
+        """
+        Sublogic handler. Resolves payment context with one query and checks
+        that sender has a verified phone number (like verified_phone_required does).
         ----------
 
         :param context: context object
         :param chat_id: Telegram Chat ID
-        :param card_id: Recipient Card ID
+        :param user_id: Telegram ID of sender
+        :param recipient_kind, recipient: optional recipient (see PaymentContextResolver)
 
-        :return: Tuple with Card object and error flag
+        :return: payment context or None (if error message was sent)
         """
-        if not card_id.isdigit() or int(card_id) <= 0:
-            await context.bot.send_message(chat_id=chat_id, text=NOT_VALID_ID_MSG)
-            return None
+        payment_context = await self._context_resolver.aresolve(user_id, recipient_kind, recipient)
 
-        try:
-            card_with_acc = await self._card_service.aget_card_with_related_account_by_card_id(card_id)
-            return card_with_acc
+        if not payment_context.sender_found:
+            logger.info(f"User with ID {user_id} was not found in DB")
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=USER_NOT_FOUND_MSG)
+            return None
 
-        except CardNotFoundException:
-            await context.bot.send_message(chat_id=chat_id, text=CARD_NOT_FOUND)
+        if not payment_context.sender_phone_verified:
+            logger.info(f"User with {user_id} ID don't have access to payment transfers")
+            set_handler_outcome(HANDLER_USER_ERROR)
+            await context.bot.send_message(chat_id=chat_id, text=NO_VERIFIED_PN)
             return None
+
+        return payment_context
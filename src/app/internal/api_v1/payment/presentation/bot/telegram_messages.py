@@ -1,6 +1,19 @@
-from typing import Any, Dict, List
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from django.utils import timezone
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
+from app.internal.api_v1.payment.transactions.domain.entities import (
+    ACCOUNT_NOT_FOUND,
+    INSUFFICIENT_BALANCE,
+    INVALID_VALUE,
+    NOT_MADE_IN_PROCESSED_BATCH,
+    SELF_TRANSFER,
+    PeriodSummarySchema,
+    TransferResultSchema,
+)
 
 NO_VERIFIED_PN = "You don't have a verified phone number!"
 
@@ -27,6 +40,11 @@ SEND_TO_USER_ARGS = (
 )
 
 
+SEND_BATCH_ARGS = (
+    "Use this command with pairs of <Payment Account ID>:<Value> separated by spaces or new lines.\n\n"
+    + "Usage example: /send_batch 51241421:450 3214122:150"
+)
+
 INCR_TX_VALUE = "Transfering value should be a positive number"
 
 SENDER_RESTRICTION = "You should have Payment account and at least one Card for making transactions!"
@@ -45,7 +63,16 @@ CARD_NOT_FOUND = "There is no card with such ID in DB"
 
 STATE_NOT_FOUND = "Unable to find state for this card / account"
 NO_INTERACTED_USERS = "There is no users you have interacted with"
+NO_MORE_INTERACTED_USERS = "There is no more users you have interacted with"
+INVALID_PAGE = "Page number should be a positive number. Usage example: /list_inter 2"
 NO_TXS_FOR_LAST_MONTH = "You don't have any payment transactions for the last month"
+NO_MORE_TXS_FOR_LAST_MONTH = "There is no more payment transactions for the last month"
+
+# Inline buttons of /state_card (/state_account) pages
+HISTORY_PAGE_CALLBACK_PREFIX = "history_page"
+FIRST_HISTORY_PAGE = 0
+PREVIOUS_PAGE_BUTTON = "« Previous"
+NEXT_PAGE_BUTTON = "Next »"
 
 NO_LATEST_TXS = "You have already seen all latest transactions"
 
@@ -81,34 +108,148 @@ def get_successful_transfer_message(recipient_name: str, value: int) -> str:
     return f"OK! Transaction is finished. Transferred {value} to user {recipient_name}"
 
 
-def get_result_message_for_list_interacted(usernames_list: List[str]) -> str:
+def get_batch_too_large_message(batch_limit: int) -> str:
+    """
+    Returns message for /send_batch with too many transfers.
+    :param batch_limit: max number of transfers in one batch
+    """
+    return f"You can't make more than {batch_limit} transfers with one /send_batch command"
+
+
+BATCH_ERRORS = {
+    INSUFFICIENT_BALANCE: "insufficient balance",
+    ACCOUNT_NOT_FOUND: "account not found",
+    SELF_TRANSFER: "self-transfer is not supported",
+    INVALID_VALUE: "invalid value",
+    NOT_MADE_IN_PROCESSED_BATCH: "was not made when this batch was processed",
+}
+
+
+def get_result_lines_for_batch(results: List[TransferResultSchema]) -> List[str]:
+    """
+    Returns lines (with line breaks) of message with result of each transfer from /send_batch command.
+    Result of a large batch doesn't fit into one message, so lines are packed into messages by handler.
+    ----------
+    :param results: list of transfer results
+    """
+    number_of_ok = sum(1 for result in results if result.error is None)
+    res_lines = [f"Batch is finished. Successful transfers: {number_of_ok} of {len(results)}\n\n"]
+
+    for result in results:
+        if result.error is None:
+            res_lines.append(f" - {int(result.value)} to {result.recipient_id}: OK (TX ID: {result.tx_id})\n")
+        else:
+            res_lines.append(f" - {int(result.value)} to {result.recipient_id}: {BATCH_ERRORS[result.error]}\n")
+
+    return res_lines
+
+
+def get_result_message_for_list_interacted(usernames_list: List[str], next_page: Optional[int] = None) -> str:
     """
     Returns message with usernames of users who
     have interacted with this user.
     ----------
     :param usernames_list: list of usernames
+    :param next_page: number of next page (if there could be one)
     """
     res_msg = "Here is the list of interacted users:"
     for username in usernames_list:
         res_msg += f"\n - {username}"
 
+    if next_page is not None:
+        res_msg += f"\n\nUse /list_inter {next_page} to see more"
+
     return res_msg
 
 
-def get_result_message_for_transaction_state(transactions_list: List[Dict[str, Any]]) -> str:
+def get_summary_message(summary: PeriodSummarySchema, date_from: date) -> str:
     """
-    Returns message with transactions for the last month.
+    Returns header with totals of account transactions since date_from.
     ----------
-    :param transactions_list: list of transactions
-    """
-    res_msg = "List of transactions for the last month: \n\n"
-    for tx_data in transactions_list:
-        res_msg += (
-            f"TX ID: {tx_data['tx_id']}, "
-            + f"Date: {tx_data['date']}, "
-            + f"Sender: {tx_data['sender_name']}, "
-            + f"Recipient: {tx_data['recip_name']}, "
-            + f"Value: {tx_data['tx_value']}\n"
+    :param summary: totals of account transactions
+    :param date_from: first day of period
+    """
+    return (
+        f"Summary since {date_from.day}.{date_from.month}.{date_from.year}:\n"
+        + f" - incoming: {summary.incoming_value:.2f} ({summary.incoming_count} transactions)\n"
+        + f" - outgoing: {summary.outgoing_value:.2f} ({summary.outgoing_count} transactions)\n"
+        + f" - net: {summary.net_value:.2f}"
+    )
+
+
+def get_tx_date(tx_timestamp: datetime) -> str:
+    """
+    Returns transaction date in D.M.YYYY format (in the current time zone)
+    :param tx_timestamp: transaction timestamp
+    """
+    tx_date = timezone.localtime(tx_timestamp)
+    return f"{tx_date.day}.{tx_date.month}.{tx_date.year}"
+
+
+def get_transaction_state_message(tx_data: Dict[str, Any]) -> str:
+    """
+    Returns message line with one transaction from account history.
+    ----------
+    :param tx_data: transaction data
+    """
+    return (
+        f"TX ID: {tx_data['tx_id']}, "
+        + f"Date: {get_tx_date(tx_data['tx_timestamp'])}, "
+        + f"Sender: {tx_data['sender_name']}, "
+        + f"Recipient: {tx_data['recip_name']}, "
+        + f"Value: {tx_data['tx_value']}\n"
+    )
+
+
+def get_latest_transaction_message(tx_data: Dict[str, Any]) -> str:
+    """
+    Returns message line with one of the latest unseen transactions.
+    ----------
+    :param tx_data: transaction data
+    """
+    return (
+        f"TX ID: {tx_data['tx_id']}, "
+        + f"Sender: {tx_data['sender_name']}, "
+        + f"Recipient: {tx_data['recip_name']}, "
+        + f"Value: {tx_data['tx_value']}\n"
+    )
+
+
+def get_history_page_callback_data(command: str, uniq_id: str, cursor: int) -> str:
+    """
+    Returns callback data of inline button that opens page of transactions.
+    ----------
+    :param command: /state_card or /state_account
+    :param uniq_id: card / account ID from the command
+    :param cursor: ID of the last transaction before the page (FIRST_HISTORY_PAGE for the first one)
+    """
+    return f"{HISTORY_PAGE_CALLBACK_PREFIX} {command} {uniq_id} {cursor}"
+
+
+def get_history_page_keyboard(
+    command: str, uniq_id: str, previous_cursor: Optional[int], next_cursor: Optional[int]
+) -> Optional[InlineKeyboardMarkup]:
+    """
+    Returns inline keyboard with buttons for the previous and the next pages
+    of transactions (or None if there are no such pages).
+    ----------
+    :param command: /state_card or /state_account
+    :param uniq_id: card / account ID from the command
+    :param previous_cursor, next_cursor: cursors of the previous and the next pages
+    """
+    buttons = []
+    if previous_cursor is not None:
+        buttons.append(
+            InlineKeyboardButton(
+                PREVIOUS_PAGE_BUTTON, callback_data=get_history_page_callback_data(command, uniq_id, previous_cursor)
+            )
         )
 
-    return res_msg
+    if next_cursor is not None:
+        buttons.append(
+            InlineKeyboardButton(
+                NEXT_PAGE_BUTTON, callback_data=get_history_page_callback_data(command, uniq_id, next_cursor)
+            )
+        )
+
+    return InlineKeyboardMarkup([buttons]) if buttons else None
@@ -4,3 +4,7 @@ class InsufficientBalanceException(Exception):
 
 class TransferException(Exception):
     pass
+
+
+class IdempotencyKeyConflictException(TransferException):
+    pass
@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models import Q
 
 from app.internal.api_v1.payment.accounts.db.models import Account
+from app.internal.api_v1.users.db.models import User
 from app.internal.api_v1.utils.s3.db.models import RemoteImage
 
 
@@ -12,8 +14,8 @@ class Transaction(models.Model):
     tx_id = models.AutoField(primary_key=True)
     tx_timestamp = models.DateTimeField(auto_now_add=True)
 
-    tx_sender = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="sender")
-    tx_recip = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="recip")
+    tx_sender = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="sender", db_index=False)
+    tx_recip = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="recip", db_index=False)
     tx_value = models.DecimalField(max_digits=19, decimal_places=2)
 
     tx_image = models.OneToOneField(
@@ -21,6 +23,9 @@ class Transaction(models.Model):
     )
     already_shown_flag = models.BooleanField(default=False)
 
+    # Key of transfer request (e.g. Telegram update_id) unique for sender, protects from double processing
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, default=None)
+
     class Meta:
         """
         Transaction metadata
@@ -28,5 +33,76 @@ class Transaction(models.Model):
 
         ordering = ["tx_timestamp"]
 
+        # Leading tx_sender / tx_recip columns replace single-column FK indexes
+        indexes = [
+            models.Index(fields=["tx_sender", "tx_timestamp", "tx_id"], name="tx_sender_history_idx"),
+            models.Index(fields=["tx_recip", "tx_timestamp", "tx_id"], name="tx_recip_history_idx"),
+            models.Index(fields=["tx_recip"], condition=Q(already_shown_flag=False), name="tx_recip_unseen_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tx_sender", "idempotency_key"],
+                condition=Q(idempotency_key__isnull=False),
+                name="uniq_tx_sender_idempotency_key",
+            ),
+        ]
+
         verbose_name = "Transaction"
         db_table = "payment_transactions"
+
+
+class Counterparty(models.Model):
+    """
+    Edge of interaction graph between two users.
+    Each transfer upserts two edges: sender -> recipient and recipient -> sender.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="counterparties", db_index=False)
+    counterparty = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+
+    last_interaction_at = models.DateTimeField()
+    transfers_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """
+        Counterparty metadata
+        """
+
+        verbose_name = "Counterparty"
+        db_table = "payment_counterparties"
+
+        constraints = [
+            models.UniqueConstraint(fields=["user", "counterparty"], name="uniq_counterparty_edge"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-last_interaction_at"], name="counterparty_recency_idx"),
+        ]
+
+
+class DailyAccountRollup(models.Model):
+    """
+    Totals of incoming and outgoing payment transactions
+    of one payment account for one day (in the current time zone).
+    """
+
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="daily_rollups", db_index=False)
+    day = models.DateField()
+
+    incoming_value = models.DecimalField(max_digits=19, decimal_places=2, default=0)
+    incoming_count = models.PositiveIntegerField(default=0)
+
+    outgoing_value = models.DecimalField(max_digits=19, decimal_places=2, default=0)
+    outgoing_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """
+        DailyAccountRollup metadata
+        """
+
+        verbose_name = "Daily account rollup"
+        db_table = "payment_daily_rollups"
+
+        # Also serves (account, day) range lookups for period summaries
+        constraints = [
+            models.UniqueConstraint(fields=["account", "day"], name="uniq_daily_rollup"),
+        ]
@@ -1,164 +1,917 @@
-import calendar
+import heapq
 import logging
-from datetime import timedelta
-from typing import Any, Dict, List
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from django.core.files.images import ImageFile
-from django.db import DatabaseError, transaction
-from django.db.models import CharField, F, Q, Value
-from django.db.models.functions import Concat, ExtractDay, ExtractMonth, ExtractYear
+from django.db import DatabaseError, IntegrityError, OperationalError, connection, transaction
+from django.db.models import Case, CharField, DecimalField, F, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Concat, TruncMonth
 from django.utils import timezone
 
 from app.internal.api_v1.payment.accounts.db.models import Account
 from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
-from app.internal.api_v1.payment.transactions.db.exceptions import InsufficientBalanceException, TransferException
-from app.internal.api_v1.payment.transactions.db.models import Transaction
+from app.internal.api_v1.payment.transactions.db.exceptions import (
+    IdempotencyKeyConflictException,
+    InsufficientBalanceException,
+    TransferException,
+)
+from app.internal.api_v1.payment.transactions.db.models import Counterparty, DailyAccountRollup, Transaction
+from app.internal.api_v1.payment.transactions.domain.entities import (
+    ACCOUNT_NOT_FOUND,
+    DAY_PERIOD,
+    INSUFFICIENT_BALANCE,
+    INVALID_VALUE,
+    MONTH_PERIOD,
+    NOT_MADE_IN_PROCESSED_BATCH,
+    SELF_TRANSFER,
+    TRANSFER_ERROR,
+    PeriodSummarySchema,
+    TransferResultSchema,
+    TransferSchema,
+)
 from app.internal.api_v1.payment.transactions.domain.services import ITransactionRepository
-from app.internal.api_v1.users.db.models import User
+from app.internal.api_v1.utils.caching.domain.services import LRUCache
+from app.internal.api_v1.utils.database.domain.services import named_lock
+from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
 from app.internal.api_v1.utils.s3.db.models import RemoteImage
+from app.internal.api_v1.utils.s3.db.repositories import get_image_content_lock_name
+from app.internal.api_v1.utils.s3.domain.entities import TelegramImageFile
 
 logger = logging.getLogger("stdout_with_tlg")
 
+T = TypeVar("T")
+
+
+# Bounded retries for transfers rolled back by the DB because of lock conflicts
+TRANSFER_MAX_ATTEMPTS = 5
+TRANSFER_BACKOFF_BASE = 0.01
+TRANSFER_BACKOFF_CAP = 0.2
+
+# (sender ID, idempotency key) of the latest saved transfers -> their transaction IDs, recipients and values.
+# Misses fall back to lookup by uniq_tx_sender_idempotency_key index.
+IDEMPOTENCY_CACHE_SIZE = 10000
+processed_transfers_cache: LRUCache[Tuple[int, int, Decimal]] = LRUCache(maxsize=IDEMPOTENCY_CACHE_SIZE)
+
+# Aggregates of daily rollups for period summaries
+ROLLUP_TOTALS = {
+    "incoming_value": Sum("incoming_value"),
+    "incoming_count": Sum("incoming_count"),
+    "outgoing_value": Sum("outgoing_value"),
+    "outgoing_count": Sum("outgoing_count"),
+}
+
+# Default number of transactions on one page of account history
+HISTORY_PAGE_SIZE = 20
+
+# Postgres SQLSTATE codes: serialization_failure, deadlock_detected, lock_not_available
+RETRYABLE_PGCODES = ("40001", "40P01", "55P03")
+
+# Marks unseen transactions of recipient as shown and returns them with
+# sender / recipient names in one statement. Uses tx_recip_unseen_idx partial index.
+CLAIM_UNSEEN_TRANSACTIONS_SQL = """
+WITH claimed AS (
+    UPDATE payment_transactions AS tx
+    SET already_shown_flag = TRUE
+    FROM payment_accounts AS recip_acc
+    WHERE tx.tx_recip_id = recip_acc.uniq_id
+        AND recip_acc.owner_id = %(user_id)s
+        AND tx.already_shown_flag = FALSE
+    RETURNING tx.tx_id, tx.tx_timestamp, tx.tx_value, tx.tx_sender_id, tx.tx_recip_id, tx.tx_image_id
+)
+SELECT
+    claimed.tx_id,
+    claimed.tx_value,
+    CONCAT(sender.first_name, ' ', sender.last_name) AS sender_name,
+    CONCAT(recip.first_name, ' ', recip.last_name) AS recip_name,
+    claimed.tx_image_id AS tx_image,
+    image.tlg_file_id AS tx_image_file_id
+FROM claimed
+JOIN payment_accounts AS sender_acc ON sender_acc.uniq_id = claimed.tx_sender_id
+JOIN app_user AS sender ON sender.tlg_id = sender_acc.owner_id
+JOIN payment_accounts AS recip_acc ON recip_acc.uniq_id = claimed.tx_recip_id
+JOIN app_user AS recip ON recip.tlg_id = recip_acc.owner_id
+LEFT JOIN app_remoteimage AS image ON image.id = claimed.tx_image_id
+ORDER BY claimed.tx_timestamp
+"""
+
+# Adds totals of new transfers to daily rollups of their accounts
+UPSERT_DAILY_ROLLUPS_SQL = """
+INSERT INTO payment_daily_rollups (account_id, day, incoming_value, incoming_count, outgoing_value, outgoing_count)
+VALUES {values}
+ON CONFLICT (account_id, day) DO UPDATE SET
+    incoming_value = payment_daily_rollups.incoming_value + EXCLUDED.incoming_value,
+    incoming_count = payment_daily_rollups.incoming_count + EXCLUDED.incoming_count,
+    outgoing_value = payment_daily_rollups.outgoing_value + EXCLUDED.outgoing_value,
+    outgoing_count = payment_daily_rollups.outgoing_count + EXCLUDED.outgoing_count
+"""
+
+# Upserts edges of interaction graph, existing edges get their counters incremented
+UPSERT_COUNTERPARTIES_SQL = """
+INSERT INTO payment_counterparties (user_id, counterparty_id, last_interaction_at, transfers_count)
+VALUES {values}
+ON CONFLICT (user_id, counterparty_id) DO UPDATE SET
+    transfers_count = payment_counterparties.transfers_count + EXCLUDED.transfers_count,
+    last_interaction_at = CASE
+        WHEN EXCLUDED.last_interaction_at > payment_counterparties.last_interaction_at
+        THEN EXCLUDED.last_interaction_at
+        ELSE payment_counterparties.last_interaction_at
+    END
+"""
+
+
+def is_retryable_db_error(err: DatabaseError) -> bool:
+    """
+    Returns True if transaction was rolled back because of
+    concurrent access and can be safely repeated from scratch.
+    """
+    if getattr(err.__cause__, "pgcode", None) in RETRYABLE_PGCODES:
+        return True
+
+    # SQLite doesn't have row locks, whole DB file is locked instead
+    return isinstance(err, OperationalError) and "database is locked" in str(err)
+
+
+def sleep_with_jittered_backoff(attempt: int) -> None:
+    """
+    Sleeps random time in [0, min(cap, base * 2^attempt)] ("full jitter"),
+    so that conflicting transfers don't retry in lockstep.
+    """
+    time.sleep(random.uniform(0, min(TRANSFER_BACKOFF_CAP, TRANSFER_BACKOFF_BASE * 2**attempt)))
+
+
+def get_batch_transfer_error(tx: TransferSchema, value: Decimal, balances: Dict[int, Decimal]) -> Optional[str]:
+    """
+    Returns reason why this transfer from batch can't be made
+    (or None if it can) using current balances of locked accounts.
+    """
+    if value <= 0:
+        return INVALID_VALUE
+
+    if tx.sender_id == tx.recipient_id:
+        return SELF_TRANSFER
+
+    if tx.sender_id not in balances or tx.recipient_id not in balances:
+        return ACCOUNT_NOT_FOUND
+
+    if balances[tx.sender_id] < value:
+        return INSUFFICIENT_BALANCE
+
+    return None
+
+
+def get_batch_idempotency_keys(idempotency_key: str, number_of_transfers: int) -> List[str]:
+    """
+    Returns idempotency keys of batch transfers: key of the batch and index of transfer in it
+    """
+    return [f"{idempotency_key}:{index}" for index in range(number_of_transfers)]
+
+
+def check_processed_transfer(
+    processed_transfer: Optional[Tuple[int, int, Decimal]],
+    sender_id: int,
+    recipient_id: int,
+    transferring_value: float,
+    idempotency_key: str,
+) -> Optional[int]:
+    """
+    Returns ID of transaction saved with idempotency key (or None if there is no such transaction)
+    ----------
+
+    :param processed_transfer: (transaction ID, recipient ID, value) of saved transaction or None
+    :raises IdempotencyKeyConflictException: if saved transaction has other recipient or value
+    """
+    if processed_transfer is None:
+        return None
+
+    tx_id, processed_recipient_id, processed_value = processed_transfer
+
+    if processed_recipient_id != recipient_id or processed_value != Decimal(str(transferring_value)):
+        logger.info(f"Key {idempotency_key} of {sender_id} was already used for other payment transaction {tx_id}")
+        raise IdempotencyKeyConflictException()
+
+    return tx_id
+
+
+def get_account_of_user(user_id: int) -> Subquery:
+    """
+    Returns scalar subquery with uniq_id of payment Account owned by Telegram user.
+
+    Filtering transactions by this subquery (instead of tx_*__owner__tlg_id joins)
+    lets DB search them by tx_sender / tx_recip indexes.
+    """
+    return Subquery(Account.objects.filter(owner_id=user_id).values("uniq_id")[:1])
+
+
+def upsert_counterparties(transfers_counts: Dict[Tuple[int, int], int], interaction_at: datetime) -> None:
+    """
+    Upserts both edges of interaction graph for each pair of users
+    with a single statement. Must be called inside transfer atomic block.
+    ----------
+
+    :param transfers_counts: number of transfers by (sender owner ID, recipient owner ID)
+    :param interaction_at: time of these transfers
+    """
+    edges = defaultdict(int)
+    for (sender_id, recipient_id), count in transfers_counts.items():
+        edges[(sender_id, recipient_id)] += count
+        edges[(recipient_id, sender_id)] += count
+
+    if not edges:
+        return
+
+    timestamp = connection.ops.adapt_datetimefield_value(interaction_at)
+
+    # Sorted edges are locked in the same order by concurrent transfers
+    params = [
+        param for (user_id, cp_id), count in sorted(edges.items()) for param in (user_id, cp_id, timestamp, count)
+    ]
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(edges))
+
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_COUNTERPARTIES_SQL.format(values=values), params)
+
+
+def upsert_daily_rollups(transfers: Iterable[Tuple[int, int, Decimal]], day: date) -> None:
+    """
+    Adds transfers to daily rollups of sender and recipient accounts
+    with a single statement. Must be called inside transfer atomic block.
+    ----------
+
+    :param transfers: (sender account ID, recipient account ID, value) of each transfer
+    :param day: day of these transfers
+    """
+    totals = defaultdict(lambda: [Decimal(0), 0, Decimal(0), 0])
+    for sender_id, recipient_id, value in transfers:
+        totals[recipient_id][0] += value
+        totals[recipient_id][1] += 1
+        totals[sender_id][2] += value
+        totals[sender_id][3] += 1
+
+    if not totals:
+        return
+
+    adapted_day = connection.ops.adapt_datefield_value(day)
+
+    def adapt_value(value: Decimal):
+        return connection.ops.adapt_decimalfield_value(value, max_digits=19, decimal_places=2)
+
+    params = [
+        param
+        for account_id, (in_value, in_count, out_value, out_count) in sorted(totals.items())
+        for param in (account_id, adapted_day, adapt_value(in_value), in_count, adapt_value(out_value), out_count)
+    ]
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(totals))
+
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_DAILY_ROLLUPS_SQL.format(values=values), params)
+
+
+def get_summary_from_totals(totals: Dict[str, Any]) -> PeriodSummarySchema:
+    """
+    Returns period summary from aggregated rollup totals
+    """
+    incoming_value, outgoing_value = totals["incoming_value"] or 0, totals["outgoing_value"] or 0
+    incoming_count, outgoing_count = totals["incoming_count"] or 0, totals["outgoing_count"] or 0
+
+    return PeriodSummarySchema(
+        period_start=totals.get("period_start"),
+        incoming_value=incoming_value,
+        incoming_count=incoming_count,
+        outgoing_value=outgoing_value,
+        outgoing_count=outgoing_count,
+        net_value=incoming_value - outgoing_value,
+        count=incoming_count + outgoing_count,
+    )
+
+
+def stage_image(image_file: ImageFile) -> RemoteImage:
+    """
+    Uploads image to object storage and saves its RemoteImage row in autocommit mode,
+    before transfer transaction is started, so accounts are never locked during upload.
+    Image is linked to transaction by transfer itself; images that were never linked
+    (e.g. transfer failed) are removed by orphaned images sweeper.
+    Content is uploaded and referenced under the lock of its name, so sweeper
+    never deletes the same content uploaded by a concurrent transfer.
+    """
+    tx_image = RemoteImage(content=image_file)
+
+    if isinstance(image_file, TelegramImageFile):
+        tx_image.tlg_file_id = image_file.tlg_file_id
+        tx_image.tlg_file_unique_id = image_file.tlg_file_unique_id
+
+        # Already stored content is referenced by name, without uploading it again
+        if image_file.is_stored:
+            tx_image.content = image_file.name
+
+    with named_lock(get_image_content_lock_name(image_file.name)):
+        tx_image.save()
+
+    return tx_image
+
+
+def observe_transfers_on_commit(transfers: Iterable[Tuple[str, Decimal]]) -> None:
+    """
+    Updates transfer metrics when the current transaction is committed,
+    so rolled back transfers are never counted.
+    ----------
+
+    :param transfers: (currency of sender account, value) of each transfer
+    """
+    transfers = list(transfers)
+
+    def observe_transfers():
+        for currency, value in transfers:
+            PrometheusMetrics.observe_committed_transfer(currency, float(value))
+
+    transaction.on_commit(observe_transfers)
+
+
+def lock_accounts_in_order(account_ids: Iterable[int]) -> Dict[int, Account]:
+    """
+    Locks all specified accounts with a single SELECT ... FOR UPDATE
+    ordered by uniq_id. Must be called inside transaction.atomic().
+    ----------
+
+    :param account_ids: uniq_id of payment Accounts
+    :return: locked Account models by uniq_id
+    """
+    locked_accounts = Account.objects.select_for_update().filter(uniq_id__in=set(account_ids)).order_by("uniq_id")
+    return {account.uniq_id: account for account in locked_accounts}
+
 
 class TransactionRepository(ITransactionRepository):
     def try_transfer_to(
-        self, sender_acc: AccountSchema, recipient_acc: AccountSchema, transferring_value: float, image_file: ImageFile
-    ) -> None:
+        self,
+        sender_acc: AccountSchema,
+        recipient_acc: AccountSchema,
+        transferring_value: float,
+        image_file: ImageFile,
+        idempotency_key: Optional[str] = None,
+    ) -> int:
         """
-        Tries to transfer value from first_payment_account to second_payment_account.
+        Tries to transfer value from sender_acc to recipient_acc.
         Saves each Payment Transaction or raises exceptions if something went wrong.
+
+        Serialization failures and deadlocks are retried with bounded
+        jittered backoff (see TRANSFER_MAX_ATTEMPTS).
+
+        Transfer with already used idempotency_key isn't made again:
+        ID of the original transaction is returned from LRU cache or DB instead.
+
+        Image is uploaded before the transfer (see stage_image),
+        transaction only references it by ID.
         ----------
 
-        :param first_payment_acc, second_payment_acc: payment Accounts
-        :value: transferring value
+        :param sender_acc, recipient_acc: payment Accounts
+        :param transferring_value: transferring value
+        :param image_file: optional image attached to this transfer
+        :param idempotency_key: optional unique key of this transfer (e.g. from Telegram update_id)
+        :return: ID of saved (or original) payment transaction
 
         :raises InsufficientBalanceException: if sender_acc balance was insufficient
         :raises TransferException: if something went wrong in transaction block
         """
-        sender_acc_model = Account.objects.get(pk=sender_acc.uniq_id)
-        recipient_acc_model = Account.objects.get(pk=recipient_acc.uniq_id)
+        if idempotency_key is not None:
+            try:
+                original_tx_id = self.get_tx_id_by_idempotency_key(
+                    sender_acc.uniq_id, recipient_acc.uniq_id, transferring_value, idempotency_key
+                )
+            except IdempotencyKeyConflictException:
+                PrometheusMetrics.inc_failed_transfers_counter(TRANSFER_ERROR)
+                raise
+
+            if original_tx_id is not None:
+                logger.info(
+                    f"Payment transaction with key {idempotency_key} was already saved with ID {original_tx_id}"
+                )
+                return original_tx_id
 
         logger.info(
-            f"Started Payment transaction from {sender_acc_model.uniq_id} to {recipient_acc_model.uniq_id} with value {transferring_value}..."
+            f"Started Payment transaction from {sender_acc.uniq_id} to {recipient_acc.uniq_id} with value {transferring_value}..."
         )
+
+        image_id = stage_image(image_file).pk if image_file else None
+
         try:
-            Account.objects.select_for_update().filter(uniq_id__in=[sender_acc_model.uniq_id, sender_acc_model.uniq_id])
+            tx_id = self._run_with_retries(
+                self._transfer_in_atomic_block,
+                sender_acc.uniq_id,
+                recipient_acc.uniq_id,
+                transferring_value,
+                image_id,
+                idempotency_key,
+            )
+
+        except InsufficientBalanceException:
+            PrometheusMetrics.inc_failed_transfers_counter(INSUFFICIENT_BALANCE)
+            raise
+
+        except TransferException:
+            PrometheusMetrics.inc_failed_transfers_counter(TRANSFER_ERROR)
+            raise
+
+        if idempotency_key is not None:
+            processed_transfers_cache.set(
+                (sender_acc.uniq_id, idempotency_key),
+                (tx_id, recipient_acc.uniq_id, Decimal(str(transferring_value))),
+            )
+
+        return tx_id
+
+    def get_tx_id_by_idempotency_key(
+        self, sender_id: int, recipient_id: int, transferring_value: float, idempotency_key: str
+    ) -> Optional[int]:
+        """
+        Returns ID of transaction that sender saved with idempotency_key (or None).
+        Keys are unique only for a sender and aren't trusted alone
+        (e.g. Telegram update_id sequence can be restarted),
+        so saved transaction must have the same recipient and value.
+        ----------
+
+        :param sender_id, recipient_id: payment Account IDs of requested transfer
+        :param transferring_value: value of requested transfer
+        :param idempotency_key: key of requested transfer
+        :raises IdempotencyKeyConflictException: if sender saved other transfer with this key
+        """
+        processed_transfer = processed_transfers_cache.get((sender_id, idempotency_key))
+
+        if processed_transfer is None:
+            processed_transfer = (
+                Transaction.objects.filter(tx_sender_id=sender_id, idempotency_key=idempotency_key)
+                .values_list("tx_id", "tx_recip_id", "tx_value")
+                .first()
+            )
+            if processed_transfer is None:
+                return None
+
+            processed_transfers_cache.set((sender_id, idempotency_key), processed_transfer)
+
+        return check_processed_transfer(
+            processed_transfer, sender_id, recipient_id, transferring_value, idempotency_key
+        )
+
+    def get_processed_batch_results(
+        self, transfers: List[TransferSchema], idempotency_keys: List[str]
+    ) -> Optional[List[TransferResultSchema]]:
+        """
+        Returns results of batch that was already saved with these keys (or None).
+        Batch is saved in one DB transaction, so transfers without saved transactions
+        failed back then and are returned with NOT_MADE_IN_PROCESSED_BATCH error.
+        Keys are looked up like in get_tx_id_by_idempotency_key: in LRU cache,
+        then by uniq_tx_sender_idempotency_key index with one query per sender.
+        ----------
+
+        :param transfers: transfers of batch
+        :param idempotency_keys: keys of these transfers (see get_batch_idempotency_keys)
+        :raises IdempotencyKeyConflictException: if sender saved other transfer with one of keys
+        """
+        processed_transfers, missed_keys = {}, defaultdict(list)
+
+        for tx, key in zip(transfers, idempotency_keys):
+            processed_transfer = processed_transfers_cache.get((tx.sender_id, key))
+
+            if processed_transfer is None:
+                missed_keys[tx.sender_id].append(key)
+            else:
+                processed_transfers[(tx.sender_id, key)] = processed_transfer
+
+        for sender_id, keys in missed_keys.items():
+            saved_transfers = Transaction.objects.filter(tx_sender_id=sender_id, idempotency_key__in=keys).values_list(
+                "idempotency_key", "tx_id", "tx_recip_id", "tx_value"
+            )
+
+            for key, *processed_transfer in saved_transfers:
+                processed_transfers[(sender_id, key)] = tuple(processed_transfer)
+                processed_transfers_cache.set((sender_id, key), tuple(processed_transfer))
 
-            with transaction.atomic():
-                if sender_acc_model.value - transferring_value >= 0:
-                    sender_acc_model.value = F("value") - transferring_value
-                    recipient_acc_model.value = F("value") + transferring_value
+        if not processed_transfers:
+            return None
 
-                    sender_acc_model.save()
-                    recipient_acc_model.save()
+        results = []
+        for tx, key in zip(transfers, idempotency_keys):
+            tx_id = check_processed_transfer(
+                processed_transfers.get((tx.sender_id, key)), tx.sender_id, tx.recipient_id, tx.value, key
+            )
+            error = NOT_MADE_IN_PROCESSED_BATCH if tx_id is None else None
+            results.append(TransferResultSchema(**tx.dict(), tx_id=tx_id, error=error))
+
+        return results
+
+    def try_transfer_many(
+        self, transfers: List[TransferSchema], idempotency_key: Optional[str] = None
+    ) -> List[TransferResultSchema]:
+        """
+        Makes all transfers in a single DB transaction (group commit).
+        Every involved account is locked once, net balance deltas are applied
+        with one bulk UPDATE and Transaction rows are saved with bulk_create.
+
+        Transfers are applied in order, so an item fails (without affecting others)
+        if sender balance is already insufficient at its turn.
 
-                    tx_image = None
+        Transfers of batch with idempotency_key are saved with keys of their own
+        (see get_batch_idempotency_keys). Batch that was already saved isn't made again,
+        its results are returned instead (see get_processed_batch_results).
+        ----------
 
-                    if image_file:
-                        tx_image = RemoteImage.objects.create(content=image_file)
+        :param transfers: list of transfers
+        :param idempotency_key: optional unique key of this batch (e.g. from Telegram update_id)
+        :return: result for each transfer, in the same order
 
-                    saved_tx = Transaction.objects.create(
-                        tx_sender=sender_acc_model,
-                        tx_recip=recipient_acc_model,
-                        tx_value=transferring_value,
-                        tx_image=tx_image,
+        :raises TransferException: if something went wrong in transaction block
+        """
+        idempotency_keys = None
+
+        if idempotency_key is not None:
+            idempotency_keys = get_batch_idempotency_keys(idempotency_key, len(transfers))
+
+            try:
+                processed_results = self.get_processed_batch_results(transfers, idempotency_keys)
+            except IdempotencyKeyConflictException:
+                PrometheusMetrics.inc_failed_transfers_counter(TRANSFER_ERROR, len(transfers))
+                raise
+
+            if processed_results is not None:
+                logger.info(f"Batch of payment transactions with key {idempotency_key} was already saved")
+                return processed_results
+
+        logger.info(f"Started batch of {len(transfers)} payment transactions...")
+
+        try:
+            results = self._run_with_retries(self._transfer_many_in_atomic_block, transfers, idempotency_keys)
+        except TransferException:
+            PrometheusMetrics.inc_failed_transfers_counter(TRANSFER_ERROR, len(transfers))
+            raise
+
+        for result in results:
+            if result.error not in (None, NOT_MADE_IN_PROCESSED_BATCH):
+                PrometheusMetrics.inc_failed_transfers_counter(result.error)
+
+        if idempotency_keys is not None:
+            for result, key in zip(results, idempotency_keys):
+                if result.tx_id is not None:
+                    processed_transfers_cache.set(
+                        (result.sender_id, key), (result.tx_id, result.recipient_id, Decimal(str(result.value)))
                     )
 
-                    logger.info(f"OK! Payment transaction was successfully saved with ID {saved_tx.tx_id}")
+        return results
 
-                else:
-                    logger.info(f"Balance of {sender_acc.uniq_id} was not sufficient for payment transaction")
-                    raise InsufficientBalanceException()
+    def _run_with_retries(self, operation: Callable[..., T], *args) -> T:
+        """
+        Runs operation and repeats it if DB rolled it back because of
+        lock conflict. Other DB errors are raised as TransferException.
+        """
+        for attempt in range(1, TRANSFER_MAX_ATTEMPTS + 1):
+            try:
+                return operation(*args)
+
+            except DatabaseError as err:
+                if not is_retryable_db_error(err) or attempt == TRANSFER_MAX_ATTEMPTS:
+                    logger.info(f"Error during {operation.__name__} call:\n{err}")
+                    raise TransferException
 
-        except DatabaseError as err:
-            logger.info(f"Error during try_transfer_to call:\n{err}")
-            raise TransferException
+                logger.info(f"Transfer attempt {attempt} was rolled back due to lock conflict, retrying...")
+                sleep_with_jittered_backoff(attempt)
 
-    def get_list_of_inter_usernames(self, user_id: int) -> List[str]:
+    def _transfer_in_atomic_block(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        transferring_value: float,
+        image_id: Optional[int],
+        idempotency_key: Optional[str],
+    ) -> int:
         """
-        Retuns list of usernames for users who have
-        interacted with user_id
+        Single attempt of payment transaction. Both accounts are locked
+        with one SELECT ... FOR UPDATE in uniq_id order, so concurrent
+        transfers between the same accounts wait for each other instead of deadlocking.
+
+        If concurrent duplicate has already saved transaction with the same
+        idempotency_key, the whole attempt is rolled back and ID of that transaction is returned.
         ----------
 
-        :param user_id: Telegram ID of specified user
+        :raises InsufficientBalanceException: if locked sender balance was insufficient
+        :raises TransferException: if one of the accounts doesn't exist anymore
         """
+        try:
+            return self._save_transfer(sender_id, recipient_id, transferring_value, image_id, idempotency_key)
 
-        tx_list = list(
-            Transaction.objects.filter(Q(tx_sender__owner__tlg_id=user_id) | Q(tx_recip__owner__tlg_id=user_id))
-            .order_by("tx_sender__owner__tlg_id", "tx_recip__owner__tlg_id")
-            .distinct("tx_sender__owner__tlg_id", "tx_recip__owner__tlg_id")
-            .values_list("tx_sender__owner", "tx_recip__owner")
-        )
+        except IntegrityError:
+            if idempotency_key is None:
+                raise
+
+            original_tx_id = self.get_tx_id_by_idempotency_key(
+                sender_id, recipient_id, transferring_value, idempotency_key
+            )
+            if original_tx_id is None:
+                raise
+
+            logger.info(f"Payment transaction with key {idempotency_key} was saved concurrently, rolled back duplicate")
+            return original_tx_id
+
+    def _save_transfer(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        transferring_value: float,
+        image_id: Optional[int],
+        idempotency_key: Optional[str],
+    ) -> int:
+        value = Decimal(str(transferring_value))
+
+        with transaction.atomic():
+            locked_accounts = lock_accounts_in_order([sender_id, recipient_id])
+
+            if sender_id not in locked_accounts or recipient_id not in locked_accounts:
+                logger.info(f"Unable to lock accounts {sender_id} and {recipient_id} for payment transaction")
+                raise TransferException()
+
+            if locked_accounts[sender_id].value < value:
+                logger.info(f"Balance of {sender_id} was not sufficient for payment transaction")
+                raise InsufficientBalanceException()
+
+            Account.objects.filter(uniq_id__in=[sender_id, recipient_id]).update(
+                value=F("value")
+                + Case(
+                    When(uniq_id=sender_id, then=Value(-value)),
+                    default=Value(value),
+                    output_field=DecimalField(max_digits=19, decimal_places=2),
+                )
+            )
+
+            saved_tx = Transaction.objects.create(
+                tx_sender_id=sender_id,
+                tx_recip_id=recipient_id,
+                tx_value=value,
+                tx_image_id=image_id,
+                idempotency_key=idempotency_key,
+            )
+
+            upsert_counterparties(
+                {(locked_accounts[sender_id].owner_id, locked_accounts[recipient_id].owner_id): 1},
+                interaction_at=saved_tx.tx_timestamp,
+            )
+            upsert_daily_rollups([(sender_id, recipient_id, value)], day=timezone.localdate(saved_tx.tx_timestamp))
+            observe_transfers_on_commit([(locked_accounts[sender_id].currency, value)])
+
+            logger.info(f"OK! Payment transaction was successfully saved with ID {saved_tx.tx_id}")
+
+        return saved_tx.tx_id
+
+    def _transfer_many_in_atomic_block(
+        self, transfers: List[TransferSchema], idempotency_keys: Optional[List[str]]
+    ) -> List[TransferResultSchema]:
+        """
+        Single attempt of batch payment transaction.
+
+        If concurrent duplicate has already saved the same batch, the whole attempt
+        is rolled back and results of that batch are returned.
+        """
+        try:
+            return self._save_transfers(transfers, idempotency_keys)
+
+        except IntegrityError:
+            if idempotency_keys is None:
+                raise
+
+            processed_results = self.get_processed_batch_results(transfers, idempotency_keys)
+            if processed_results is None:
+                raise
+
+            logger.info("Batch of payment transactions was saved concurrently, rolled back duplicate")
+            return processed_results
+
+    def _save_transfers(
+        self, transfers: List[TransferSchema], idempotency_keys: Optional[List[str]]
+    ) -> List[TransferResultSchema]:
+        with transaction.atomic():
+            locked_accounts = lock_accounts_in_order(
+                account_id for tx in transfers for account_id in (tx.sender_id, tx.recipient_id)
+            )
+            balances = {uniq_id: account.value for uniq_id, account in locked_accounts.items()}
+
+            deltas = defaultdict(Decimal)
+            transfers_counts = defaultdict(int)
+            results, new_txs = [], []
+
+            for index, tx in enumerate(transfers):
+                value = Decimal(str(tx.value))
+                error = get_batch_transfer_error(tx, value, balances)
+
+                results.append(TransferResultSchema(**tx.dict(), error=error))
+                if error is not None:
+                    continue
 
-        unique_tx_list = [list(i) for i in set(frozenset(tx_tuple) for tx_tuple in tx_list)]
-        unique_ids = [tuple[1] if tuple[0] == user_id else tuple[0] for tuple in unique_tx_list]
+                balances[tx.sender_id] -= value
+                balances[tx.recipient_id] += value
 
-        return list(User.objects.filter(tlg_id__in=unique_ids).values_list("username", flat=True).all())
+                deltas[tx.sender_id] -= value
+                deltas[tx.recipient_id] += value
 
-    def get_list_of_transactions_for_the_last_month(self, user_id: int) -> List[Dict[str, Any]]:
+                new_txs.append(
+                    Transaction(
+                        tx_sender_id=tx.sender_id,
+                        tx_recip_id=tx.recipient_id,
+                        tx_value=value,
+                        idempotency_key=idempotency_keys[index] if idempotency_keys is not None else None,
+                    )
+                )
+                transfers_counts[
+                    (locked_accounts[tx.sender_id].owner_id, locked_accounts[tx.recipient_id].owner_id)
+                ] += 1
+
+            deltas = {uniq_id: delta for uniq_id, delta in deltas.items() if delta != 0}
+
+            if deltas:
+                Account.objects.filter(uniq_id__in=deltas.keys()).update(
+                    value=F("value")
+                    + Case(
+                        *[When(uniq_id=uniq_id, then=Value(delta)) for uniq_id, delta in deltas.items()],
+                        output_field=DecimalField(max_digits=19, decimal_places=2),
+                    )
+                )
+
+            saved_txs = iter(Transaction.objects.bulk_create(new_txs))
+            for result in results:
+                if result.error is None:
+                    result.tx_id = next(saved_txs).tx_id
+
+            upsert_counterparties(transfers_counts, interaction_at=timezone.now())
+            upsert_daily_rollups(
+                [(tx.tx_sender_id, tx.tx_recip_id, tx.tx_value) for tx in new_txs], day=timezone.localdate()
+            )
+            observe_transfers_on_commit((locked_accounts[tx.tx_sender_id].currency, tx.tx_value) for tx in new_txs)
+
+            logger.info(f"OK! Batch saved {len(new_txs)} of {len(transfers)} payment transactions")
+
+        return results
+
+    def get_list_of_inter_usernames(self, user_id: int, limit: int, offset: int = 0) -> List[str]:
         """
-        Returns list of payment transactions for the last
-        month for Telegram user with ID user_id
+        Retuns list of usernames for users who have interacted
+        with user_id, the most recent interactions go first.
         ----------
+
         :param user_id: Telegram ID of specified user
+        :param limit, offset: page of usernames
         """
+        return list(
+            Counterparty.objects.filter(user_id=user_id)
+            .order_by("-last_interaction_at")
+            .values_list("counterparty__username", flat=True)[offset : offset + limit]
+        )
 
-        today = timezone.now()
+    def get_history_page(
+        self,
+        account_id: int,
+        after_tx_id: Optional[int] = None,
+        limit: int = HISTORY_PAGE_SIZE,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns page of payment transactions of account in (tx_timestamp, tx_id) order.
 
-        number_of_days_in_month = calendar.monthrange(today.year, today.month)[1]
-        some_day_a_month_ago = today - timedelta(days=number_of_days_in_month)
+        Incoming and outgoing transactions are read with two range scans over
+        (account, tx_timestamp, tx_id) indexes, each stops after limit rows,
+        and both sides are merged in Python. So the cost of page doesn't depend
+        on the size of account history.
+        ----------
+        :param account_id: ID of payment account
+        :param after_tx_id: ID of the last transaction from the previous page
+        :param limit: max number of transactions on the page
+        :param date_from: only transactions made at or after this moment
+        :param date_to: only transactions made before this moment
+        """
+        page_filter = Q()
+        if date_from is not None:
+            page_filter &= Q(tx_timestamp__gte=date_from)
+        if date_to is not None:
+            page_filter &= Q(tx_timestamp__lt=date_to)
 
-        tx_list = list(
-            Transaction.objects.filter(
-                Q(Q(tx_sender__owner__tlg_id=user_id) | Q(tx_recip__owner__tlg_id=user_id))
-                & Q(tx_timestamp__gt=some_day_a_month_ago)
-                & Q(tx_timestamp__lte=today + timedelta(days=1))
+        cursor_exclude = Q(pk__in=[])
+        if after_tx_id is not None:
+            cursor_timestamp = (
+                Transaction.objects.filter(tx_id=after_tx_id).values_list("tx_timestamp", flat=True).first()
             )
-            .annotate(
-                date=Concat(
-                    ExtractDay("tx_timestamp"),
-                    Value("."),
-                    ExtractMonth("tx_timestamp"),
-                    Value("."),
-                    ExtractYear("tx_timestamp"),
-                    output_field=CharField(),
-                ),
-                sender_name=Concat(
-                    "tx_sender__owner__first_name", Value(" "), "tx_sender__owner__last_name", output_field=CharField()
-                ),
-                recip_name=Concat(
-                    "tx_recip__owner__first_name", Value(" "), "tx_recip__owner__last_name", output_field=CharField()
-                ),
+            if cursor_timestamp is None:
+                return []
+
+            page_filter &= Q(tx_timestamp__gte=cursor_timestamp)
+            cursor_exclude = Q(tx_timestamp=cursor_timestamp, tx_id__lte=after_tx_id)
+
+        def get_side(side_filter: Q) -> List[Dict[str, Any]]:
+            return list(
+                Transaction.objects.filter(side_filter & page_filter)
+                .exclude(cursor_exclude)
+                .order_by("tx_timestamp", "tx_id")
+                .annotate(
+                    sender_name=Concat(
+                        "tx_sender__owner__first_name",
+                        Value(" "),
+                        "tx_sender__owner__last_name",
+                        output_field=CharField(),
+                    ),
+                    recip_name=Concat(
+                        "tx_recip__owner__first_name",
+                        Value(" "),
+                        "tx_recip__owner__last_name",
+                        output_field=CharField(),
+                    ),
+                )
+                .values("tx_id", "tx_value", "tx_timestamp", "sender_name", "recip_name", "tx_image")[:limit]
             )
-            .values("tx_id", "tx_value", "sender_name", "recip_name", "date", "tx_image")
+
+        merged = heapq.merge(
+            get_side(Q(tx_sender_id=account_id)),
+            get_side(Q(tx_recip_id=account_id)),
+            key=lambda tx_data: (tx_data["tx_timestamp"], tx_data["tx_id"]),
         )
+        return list(islice(merged, limit))
+
+    def get_period_summaries(
+        self, account_id: int, date_from: date, date_to: date, period: str = DAY_PERIOD
+    ) -> List[PeriodSummarySchema]:
+        """
+        Returns totals of payment account for each day (or month) of period.
+        Reads only daily rollups, so it's O(days) for any number of transactions.
+        ----------
+        :param account_id: ID of payment account
+        :param date_from, date_to: first and last days of period (inclusive)
+        :param period: DAY_PERIOD or MONTH_PERIOD
+        """
+        period_start = TruncMonth("day") if period == MONTH_PERIOD else F("day")
 
-        return tx_list
+        return [
+            get_summary_from_totals(totals)
+            for totals in DailyAccountRollup.objects.filter(account_id=account_id, day__range=(date_from, date_to))
+            .annotate(period_start=period_start)
+            .values("period_start")
+            .annotate(**ROLLUP_TOTALS)
+            .order_by("period_start")
+        ]
+
+    def get_summary(self, account_id: int, date_from: date, date_to: date) -> PeriodSummarySchema:
+        """
+        Returns totals of payment account for the whole period from daily rollups.
+        ----------
+        :param account_id: ID of payment account
+        :param date_from, date_to: first and last days of period (inclusive)
+        """
+        totals = DailyAccountRollup.objects.filter(account_id=account_id, day__range=(date_from, date_to)).aggregate(
+            **ROLLUP_TOTALS
+        )
+        return get_summary_from_totals(totals)
 
     def get_list_of_latest_unseen_transactions(self, user_id: int) -> List[Dict[str, Any]]:
         """
-        Returns list of the latest unseen transactions.
+        Returns list of the latest unseen transactions and marks them as shown.
+
+        Rows are claimed atomically, so concurrent calls for the same user
+        never return the same transaction twice. On Postgres it's a single
+        UPDATE ... RETURNING statement, other backends use a locked fallback.
+        ----------
+        :param user_id: Telegram ID of recipient
         """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(CLAIM_UNSEEN_TRANSACTIONS_SQL, {"user_id": user_id})
+                columns = [column.name for column in cursor.description]
+
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        tx_ids = list(
-            Transaction.objects.filter(Q(already_shown_flag=False) & Q(tx_recip__owner__tlg_id=user_id)).values_list(
-                "tx_id", flat=True
+        with transaction.atomic():
+            tx_ids = list(
+                Transaction.objects.select_for_update()
+                .filter(Q(already_shown_flag=False) & Q(tx_recip=get_account_of_user(user_id)))
+                .values_list("tx_id", flat=True)
             )
-        )
 
-        Transaction.objects.filter(tx_id__in=tx_ids).update(already_shown_flag=True)
-
-        res_tx_list = list(
-            Transaction.objects.filter(tx_id__in=tx_ids)
-            .annotate(
-                sender_name=Concat(
-                    "tx_sender__owner__first_name", Value(" "), "tx_sender__owner__last_name", output_field=CharField()
-                ),
-                recip_name=Concat(
-                    "tx_recip__owner__first_name", Value(" "), "tx_recip__owner__last_name", output_field=CharField()
-                ),
+            Transaction.objects.filter(tx_id__in=tx_ids).update(already_shown_flag=True)
+
+            res_tx_list = list(
+                Transaction.objects.filter(tx_id__in=tx_ids)
+                .annotate(
+                    sender_name=Concat(
+                        "tx_sender__owner__first_name",
+                        Value(" "),
+                        "tx_sender__owner__last_name",
+                        output_field=CharField(),
+                    ),
+                    recip_name=Concat(
+                        "tx_recip__owner__first_name",
+                        Value(" "),
+                        "tx_recip__owner__last_name",
+                        output_field=CharField(),
+                    ),
+                    tx_image_file_id=F("tx_image__tlg_file_id"),
+                )
+                .values("tx_id", "tx_value", "sender_name", "recip_name", "tx_image", "tx_image_file_id")
             )
-            .values("tx_id", "tx_value", "sender_name", "recip_name", "tx_image")
-        )
 
         return res_tx_list
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 
 from ninja import Schema
 
@@ -17,3 +18,45 @@ class TransactionSchema(Schema):
     tx_image: RemoteImageSchema
 
     already_shown_flag: bool
+
+
+# Reasons of failed transfers in batch
+INSUFFICIENT_BALANCE = "insufficient_balance"
+ACCOUNT_NOT_FOUND = "account_not_found"
+SELF_TRANSFER = "self_transfer"
+INVALID_VALUE = "invalid_value"
+
+# Reason of transfer from already processed batch (redelivered update), which failed back then
+NOT_MADE_IN_PROCESSED_BATCH = "not_made_in_processed_batch"
+
+# Reason of transfer which failed because of DB error
+TRANSFER_ERROR = "transfer_error"
+
+
+class TransferSchema(Schema):
+    sender_id: int
+    recipient_id: int
+    value: float
+
+
+class TransferResultSchema(TransferSchema):
+    tx_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+# Periods of transaction summaries
+DAY_PERIOD = "day"
+MONTH_PERIOD = "month"
+
+
+class PeriodSummarySchema(Schema):
+    period_start: Optional[date] = None
+
+    incoming_value: float = 0
+    incoming_count: int = 0
+
+    outgoing_value: float = 0
+    outgoing_count: int = 0
+
+    net_value: float = 0
+    count: int = 0
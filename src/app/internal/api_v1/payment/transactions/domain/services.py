@@ -1,26 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
-from asgiref.sync import sync_to_async
 from django.core.files.images import ImageFile
 
 from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
-from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
+from app.internal.api_v1.payment.transactions.domain.entities import (
+    DAY_PERIOD,
+    PeriodSummarySchema,
+    TransferResultSchema,
+    TransferSchema,
+)
+from app.internal.api_v1.utils.database.domain.services import db_sync_to_async
 
 
 class ITransactionRepository(ABC):
     @abstractmethod
     def try_transfer_to(
-        self, sender_acc: AccountSchema, recipient_acc: AccountSchema, transferring_value: float, image_file: ImageFile
-    ) -> None:
+        self,
+        sender_acc: AccountSchema,
+        recipient_acc: AccountSchema,
+        transferring_value: float,
+        image_file: ImageFile,
+        idempotency_key: Optional[str] = None,
+    ) -> int:
         pass
 
     @abstractmethod
-    def get_list_of_inter_usernames(self, user_id: int) -> List[str]:
+    def get_tx_id_by_idempotency_key(
+        self, sender_id: int, recipient_id: int, transferring_value: float, idempotency_key: str
+    ) -> Optional[int]:
         pass
 
     @abstractmethod
-    def get_list_of_transactions_for_the_last_month(self, user_id: int) -> List[Dict[str, Any]]:
+    def try_transfer_many(
+        self, transfers: List[TransferSchema], idempotency_key: Optional[str] = None
+    ) -> List[TransferResultSchema]:
+        pass
+
+    @abstractmethod
+    def get_list_of_inter_usernames(self, user_id: int, limit: int, offset: int = 0) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_history_page(
+        self,
+        account_id: int,
+        after_tx_id: Optional[int],
+        limit: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_period_summaries(
+        self, account_id: int, date_from: date, date_to: date, period: str = DAY_PERIOD
+    ) -> List[PeriodSummarySchema]:
+        pass
+
+    @abstractmethod
+    def get_summary(self, account_id: int, date_from: date, date_to: date) -> PeriodSummarySchema:
         pass
 
     @abstractmethod
@@ -32,44 +72,122 @@ class TransactionService:
     def __init__(self, tx_repo: ITransactionRepository):
         self._tx_repo = tx_repo
 
-    @sync_to_async
+    @db_sync_to_async
     def atry_transfer_to(
-        self, sender_acc: AccountSchema, recipient_acc: AccountSchema, transferring_value: float, image_file: ImageFile
-    ) -> None:
-        self.try_transfer_to(
+        self,
+        sender_acc: AccountSchema,
+        recipient_acc: AccountSchema,
+        transferring_value: float,
+        image_file: ImageFile,
+        idempotency_key: Optional[str] = None,
+    ) -> int:
+        return self.try_transfer_to(
             sender_acc=sender_acc,
             recipient_acc=recipient_acc,
             transferring_value=transferring_value,
             image_file=image_file,
+            idempotency_key=idempotency_key,
         )
 
     def try_transfer_to(
-        self, sender_acc: AccountSchema, recipient_acc: AccountSchema, transferring_value: float, image_file: ImageFile
-    ) -> None:
-        PrometheusMetrics.set_tx_values_gauge(transferring_value)
-
-        self._tx_repo.try_transfer_to(
+        self,
+        sender_acc: AccountSchema,
+        recipient_acc: AccountSchema,
+        transferring_value: float,
+        image_file: ImageFile,
+        idempotency_key: Optional[str] = None,
+    ) -> int:
+        return self._tx_repo.try_transfer_to(
             sender_acc=sender_acc,
             recipient_acc=recipient_acc,
             transferring_value=transferring_value,
             image_file=image_file,
+            idempotency_key=idempotency_key,
+        )
+
+    @db_sync_to_async
+    def aget_tx_id_by_idempotency_key(
+        self, sender_id: int, recipient_id: int, transferring_value: float, idempotency_key: str
+    ) -> Optional[int]:
+        return self.get_tx_id_by_idempotency_key(
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            transferring_value=transferring_value,
+            idempotency_key=idempotency_key,
         )
 
-    @sync_to_async
-    def aget_list_of_inter_usernames(self, user_id: int) -> List[str]:
-        return self.get_list_of_inter_usernames(user_id=user_id)
+    def get_tx_id_by_idempotency_key(
+        self, sender_id: int, recipient_id: int, transferring_value: float, idempotency_key: str
+    ) -> Optional[int]:
+        return self._tx_repo.get_tx_id_by_idempotency_key(
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            transferring_value=transferring_value,
+            idempotency_key=idempotency_key,
+        )
 
-    def get_list_of_inter_usernames(self, user_id: int) -> List[str]:
-        return self._tx_repo.get_list_of_inter_usernames(user_id=user_id)
+    @db_sync_to_async
+    def atry_transfer_many(
+        self, transfers: List[TransferSchema], idempotency_key: Optional[str] = None
+    ) -> List[TransferResultSchema]:
+        return self.try_transfer_many(transfers=transfers, idempotency_key=idempotency_key)
+
+    def try_transfer_many(
+        self, transfers: List[TransferSchema], idempotency_key: Optional[str] = None
+    ) -> List[TransferResultSchema]:
+        return self._tx_repo.try_transfer_many(transfers=transfers, idempotency_key=idempotency_key)
+
+    @db_sync_to_async
+    def aget_list_of_inter_usernames(self, user_id: int, limit: int, offset: int = 0) -> List[str]:
+        return self.get_list_of_inter_usernames(user_id=user_id, limit=limit, offset=offset)
+
+    def get_list_of_inter_usernames(self, user_id: int, limit: int, offset: int = 0) -> List[str]:
+        return self._tx_repo.get_list_of_inter_usernames(user_id=user_id, limit=limit, offset=offset)
+
+    @db_sync_to_async
+    def aget_history_page(
+        self,
+        account_id: int,
+        after_tx_id: Optional[int],
+        limit: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.get_history_page(account_id, after_tx_id, limit, date_from, date_to)
+
+    def get_history_page(
+        self,
+        account_id: int,
+        after_tx_id: Optional[int],
+        limit: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        return self._tx_repo.get_history_page(
+            account_id=account_id, after_tx_id=after_tx_id, limit=limit, date_from=date_from, date_to=date_to
+        )
+
+    @db_sync_to_async
+    def aget_period_summaries(
+        self, account_id: int, date_from: date, date_to: date, period: str = DAY_PERIOD
+    ) -> List[PeriodSummarySchema]:
+        return self.get_period_summaries(account_id, date_from, date_to, period)
+
+    def get_period_summaries(
+        self, account_id: int, date_from: date, date_to: date, period: str = DAY_PERIOD
+    ) -> List[PeriodSummarySchema]:
+        return self._tx_repo.get_period_summaries(
+            account_id=account_id, date_from=date_from, date_to=date_to, period=period
+        )
 
-    @sync_to_async
-    def aget_list_of_transactions_for_the_last_month(self, user_id: int) -> List[Dict[str, Any]]:
-        return self.get_list_of_transactions_for_the_last_month(user_id=user_id)
+    @db_sync_to_async
+    def aget_summary(self, account_id: int, date_from: date, date_to: date) -> PeriodSummarySchema:
+        return self.get_summary(account_id, date_from, date_to)
 
-    def get_list_of_transactions_for_the_last_month(self, user_id: int) -> List[Dict[str, Any]]:
-        return self._tx_repo.get_list_of_transactions_for_the_last_month(user_id=user_id)
+    def get_summary(self, account_id: int, date_from: date, date_to: date) -> PeriodSummarySchema:
+        return self._tx_repo.get_summary(account_id=account_id, date_from=date_from, date_to=date_to)
 
-    @sync_to_async
+    @db_sync_to_async
     def aget_list_of_latest_unseen_transactions(self, user_id: int) -> List[Dict[str, Any]]:
         return self.get_list_of_latest_unseen_transactions(user_id=user_id)
 
@@ -1,8 +1,18 @@
 from django.contrib import admin
 
-from app.internal.api_v1.payment.transactions.db.models import Transaction
+from app.internal.api_v1.payment.transactions.db.models import Counterparty, DailyAccountRollup, Transaction
 
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(Counterparty)
+class CounterpartyAdmin(admin.ModelAdmin):
+    pass
+
+
+@admin.register(DailyAccountRollup)
+class DailyAccountRollupAdmin(admin.ModelAdmin):
+    pass
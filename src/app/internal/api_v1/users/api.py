@@ -2,11 +2,13 @@ from ninja_extra import NinjaExtraAPI
 
 from app.internal.api_v1.users.db.repositories import UserRepository
 from app.internal.api_v1.users.domain.services import UserService
-from app.internal.api_v1.users.presentation.rest.handlers import RestUserHandlers
+from app.internal.api_v1.users.presentation.rest.handlers import AsyncRestUserHandlers, RestUserHandlers
 from app.internal.api_v1.users.presentation.rest.routers import get_users_router
+from app.internal.api_v1.utils.authentication.db.caches import inactive_users, revoked_tokens
+from app.internal.api_v1.utils.authentication.presentation.handlers import JWTClaimsAuth
 
 
-def register_users_api(global_api: NinjaExtraAPI):
+def register_users_api(global_api: NinjaExtraAPI, async_views: bool):
     """
     Builds User part of REST APi and
     attaches routers to global Ninja API
@@ -15,7 +17,11 @@ def register_users_api(global_api: NinjaExtraAPI):
     user_repo = UserRepository()
     user_service = UserService(user_repo=user_repo)
 
-    rest_user_handlers = RestUserHandlers(user_service=user_service)
-    user_router = get_users_router(rest_user_handlers=rest_user_handlers)
+    handlers_class = AsyncRestUserHandlers if async_views else RestUserHandlers
+    rest_user_handlers = handlers_class(user_service=user_service)
+    user_router = get_users_router(
+        rest_user_handlers=rest_user_handlers,
+        auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+    )
 
     global_api.add_router("/users", user_router)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from app.internal.api_v1.users.db.models import User
+from app.internal.api_v1.utils.caching.domain.services import TTLCache
+
+# Telegram ID -> whether user has a verified phone number. The cache is per process,
+# so changes made by another process (e.g. REST API) are visible after ttl at most
+VERIFIED_PHONE_CACHE_SIZE = 100000
+verified_phone_cache: TTLCache[bool] = TTLCache(
+    ttl=settings.VERIFIED_PHONE_CACHE_TTL, maxsize=VERIFIED_PHONE_CACHE_SIZE
+)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_verified_phone_cache(sender, instance: User, **kwargs) -> None:
+    verified_phone_cache.invalidate(instance.tlg_id)
@@ -1,11 +1,12 @@
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from telegram import User as TelegramUser
 
+from app.internal.api_v1.users.db.caches import verified_phone_cache
 from app.internal.api_v1.users.db.exceptions import UserNotFoundException
 from app.internal.api_v1.users.db.models import User
-from app.internal.api_v1.users.domain.entities import UserSchema
+from app.internal.api_v1.users.domain.entities import USER_SCHEMA_FIELDS, UserSchema
 from app.internal.api_v1.users.domain.services import IUserRepository
 
 logger = logging.getLogger("stdout_with_tlg")
@@ -22,13 +23,13 @@ class UserRepository(IUserRepository):
         :return: User object
         :raises UserNotFoundException: if user not found in DB
         """
-        user_option: Optional[User] = User.objects.filter(tlg_id=tlg_id).first()
+        user_option: Optional[Tuple] = User.objects.filter(tlg_id=tlg_id).values_list(*USER_SCHEMA_FIELDS).first()
 
         if user_option is None:
             logger.info(f"User with ID {tlg_id} not found in DB")
             raise UserNotFoundException("Can't find user with such ID")
 
-        return UserSchema.from_orm(user_option)
+        return UserSchema.from_values(user_option)
 
     def get_user_by_username(self, username: str) -> UserSchema:
         """
@@ -40,13 +41,13 @@ class UserRepository(IUserRepository):
         :return: User object
         :raises UserNotFoundException: if user not found in DB
         """
-        user_option: Optional[User] = User.objects.filter(username=username).first()
+        user_option: Optional[Tuple] = User.objects.filter(username=username).values_list(*USER_SCHEMA_FIELDS).first()
 
         if user_option is None:
             logger.info(f"User with username {username} not found in DB")
             raise UserNotFoundException("Can't find user with such username")
 
-        return UserSchema.from_orm(user_option)
+        return UserSchema.from_values(user_option)
 
     def get_user_field_by_id(self, tlg_id: int, field_name: str) -> Any:
         """
@@ -63,6 +64,25 @@ class UserRepository(IUserRepository):
 
         return User.objects.values_list(field_name, flat=True).get(pk=tlg_id)
 
+    def get_phone_verification_statuses(self, tlg_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        Returns whether Users have a verified phone number (with a single query)
+        and stores result in verified_phone_cache. Users missing in DB are absent from result.
+        ----------
+
+        :param tlg_ids: Telegram IDs of Users
+        :return: Telegram ID -> True if phone number is verified
+        """
+        statuses = {
+            tlg_id: bool(phone_number)
+            for tlg_id, phone_number in User.objects.filter(tlg_id__in=tlg_ids).values_list("tlg_id", "phone_number")
+        }
+
+        for tlg_id, is_verified in statuses.items():
+            verified_phone_cache.set(tlg_id, is_verified)
+
+        return statuses
+
     def update_user_phone_number(self, tlg_id: int, new_phone_number: str) -> None:
         """
         Updates phone number for a specific User.
@@ -72,6 +92,7 @@ class UserRepository(IUserRepository):
         :param new_phone_number: already validated phone number
         """
         User.objects.filter(tlg_id=tlg_id).update(phone_number=new_phone_number)
+        verified_phone_cache.set(tlg_id, bool(new_phone_number))
         logger.info(f"Updated phone number for user with {tlg_id} ID")
 
     def update_user_password(self, tlg_id: int, new_password: str) -> None:
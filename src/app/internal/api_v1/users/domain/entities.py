@@ -1,5 +1,10 @@
+from typing import Sequence
+
 from ninja import Schema
 
+# Fields of UserSchema in order of values_list() rows that UserSchema.from_values() accepts
+USER_SCHEMA_FIELDS = ("tlg_id", "username", "first_name", "last_name", "phone_number")
+
 
 class MessageResponseSchema(Schema):
     message: str
@@ -16,6 +21,18 @@ class UserSchema(Schema):
     last_name: str
     phone_number: str
 
+    @classmethod
+    def from_values(cls, row: Sequence) -> "UserSchema":
+        """
+        Builds schema straight from values_list(*USER_SCHEMA_FIELDS) row:
+        neither model instance is created nor validation is run,
+        DB columns already have types of schema fields
+        ----------
+
+        :param row: values of USER_SCHEMA_FIELDS
+        """
+        return cls.construct(**dict(zip(USER_SCHEMA_FIELDS, row)))
+
     def __str__(self) -> str:
         """
         Returns a human-readable representation of Telegram User
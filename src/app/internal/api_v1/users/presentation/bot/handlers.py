@@ -26,6 +26,7 @@ from app.internal.api_v1.users.presentation.bot.telegram_messages import (
     get_success_phone_msg,
     get_unique_start_msg,
 )
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import HANDLER_USER_ERROR, set_handler_outcome
 from app.internal.api_v1.utils.s3.db.models import RemoteImage
 from app.internal.api_v1.utils.s3.db.repositories import S3Repository
 from app.internal.api_v1.utils.s3.domain.services import S3Service
@@ -75,11 +76,13 @@ class TelegramUserHandlers:
         command_data = update.message.text.split(" ")
 
         if len(command_data) != 2:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_PN_MSG)
             return
 
         phone_number = command_data[1]
         if not phone_number.startswith("+"):
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=NOT_INT_FORMAT_MSG)
             return
 
@@ -88,11 +91,13 @@ class TelegramUserHandlers:
 
         except NumberParseException:
             logger.info("User did not provide a valid phone number and it caused ParseError")
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=INVALID_PN_MSG)
             return
 
         if not is_valid_number(parsed_number):
             logger.info("Provided number was parsed, but is not valid anyway")
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=INVALID_PN_MSG)
             return
 
@@ -117,6 +122,7 @@ class TelegramUserHandlers:
             user_from_db: UserSchema = await self._user_service.aget_user_by_id(tlg_id=user_id)
 
         except UserNotFoundException:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=USER_NOT_FOUND_MSG)
             return
 
@@ -136,6 +142,7 @@ class TelegramUserHandlers:
         command_data = update.message.text.split(" ")
 
         if len(command_data) != 2:
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=ABSENT_PASSWORD_MSG)
             return
 
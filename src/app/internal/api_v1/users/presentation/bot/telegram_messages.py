@@ -19,6 +19,7 @@ HELP_MSG = (
     + "/me - returns known info about your account (verified phone req.)\n"
     + "/check_card and /check_account - returns balance of specified card or account\n"
     + "/list_fav; /add_fav and /del_fav - commands for management of your favourites\n"
+    + "/send_batch - makes many transfers to payment accounts at once\n"
     + "/list_inter - returns list of users you have interacted with\n"
     + "/set_password - updates your password"
 )
@@ -5,4 +5,5 @@ INVALID_PHONE_NUMBER = "Invalid phone number"
 PHONE_NUMBER_SUCCESS = "Successfully updated your phone number!"
 
 NOT_VERIFIED = "No verified phone number"
+USER_NOT_FOUND = "There is no user with such ID"
 PASSWORD_SUCCESS = "OK! Your password was successfully updated"
@@ -1,18 +1,37 @@
-import asyncio
 import logging
+from typing import Optional
 
 from phonenumber_field.phonenumber import PhoneNumber
 from phonenumbers import is_valid_number
 from phonenumbers.phonenumberutil import NumberParseException
 
+from app.internal.api_v1.users.db.exceptions import UserNotFoundException
 from app.internal.api_v1.users.domain.entities import MessageResponseSchema
 from app.internal.api_v1.users.domain.services import UserService
 
-from .content_messages import INVALID_PHONE_NUMBER, NOT_VERIFIED, PASSWORD_SUCCESS, PHONE_NUMBER_SUCCESS
+from .content_messages import INVALID_PHONE_NUMBER, NOT_VERIFIED, PASSWORD_SUCCESS, PHONE_NUMBER_SUCCESS, USER_NOT_FOUND
 
 logger = logging.getLogger("stdout_with_tlg")
 
 
+def parse_phone_number(new_phone: str) -> Optional[PhoneNumber]:
+    """
+    Returns parsed phone number or None if it is not a valid one
+    """
+    try:
+        parsed_number = PhoneNumber.from_string(new_phone)
+
+    except NumberParseException:
+        logger.info("User did not provide a valid phone number and it caused ParseError")
+        return None
+
+    if not is_valid_number(parsed_number):
+        logger.info("Provided number was parsed, but is not valid anyway")
+        return None
+
+    return parsed_number
+
+
 class RestUserHandlers:
     def __init__(self, user_service: UserService):
         self._user_service = user_service
@@ -24,7 +43,11 @@ class RestUserHandlers:
 
         logger.info("Got new GET request on /api/me endpoint!")
 
-        user_from_db = self._user_service.get_user_by_id(request.user.tlg_id)
+        try:
+            user_from_db = self._user_service.get_user_by_id(request.user.tlg_id)
+
+        except UserNotFoundException:
+            return 404, MessageResponseSchema.create(USER_NOT_FOUND)
 
         if user_from_db.phone_number == "":
             return 403, MessageResponseSchema.create(NOT_VERIFIED)
@@ -38,15 +61,8 @@ class RestUserHandlers:
 
         logger.info("Got new GET request on /api/users/phone endpoint!")
 
-        try:
-            parsed_number = PhoneNumber.from_string(new_phone)
-
-        except NumberParseException:
-            logger.info("User did not provide a valid phone number and it caused ParseError")
-            return 400, MessageResponseSchema.create(INVALID_PHONE_NUMBER)
-
-        if not is_valid_number(parsed_number):
-            logger.info("Provided number was parsed, but is not valid anyway")
+        parsed_number = parse_phone_number(new_phone)
+        if parsed_number is None:
             return 400, MessageResponseSchema.create(INVALID_PHONE_NUMBER)
 
         self._user_service.update_user_phone_number(tlg_id=request.user.tlg_id, new_phone_number=parsed_number)
@@ -63,3 +79,57 @@ class RestUserHandlers:
         self._user_service.update_user_password(tlg_id=request.user.tlg_id, new_password=new_password)
 
         return 200, MessageResponseSchema.create(PASSWORD_SUCCESS)
+
+
+class AsyncRestUserHandlers:
+    """
+    Async versions of RestUserHandlers for ASGI server (REST_ASYNC_VIEWS),
+    requests wait for DB without blocking a worker
+    """
+
+    def __init__(self, user_service: UserService):
+        self._user_service = user_service
+
+    async def get_me(self, request):
+        """
+        Returns info about Telegram User
+        """
+
+        logger.info("Got new GET request on /api/me endpoint!")
+
+        try:
+            user_from_db = await self._user_service.aget_user_by_id(request.user.tlg_id)
+
+        except UserNotFoundException:
+            return 404, MessageResponseSchema.create(USER_NOT_FOUND)
+
+        if user_from_db.phone_number == "":
+            return 403, MessageResponseSchema.create(NOT_VERIFIED)
+
+        return 200, user_from_db
+
+    async def set_phone(self, request, new_phone: str):
+        """
+        Sets new phone for this user
+        """
+
+        logger.info("Got new GET request on /api/users/phone endpoint!")
+
+        parsed_number = parse_phone_number(new_phone)
+        if parsed_number is None:
+            return 400, MessageResponseSchema.create(INVALID_PHONE_NUMBER)
+
+        await self._user_service.aupdate_user_phone_number(tlg_id=request.user.tlg_id, new_phone_number=parsed_number)
+
+        return 200, MessageResponseSchema.create(PHONE_NUMBER_SUCCESS)
+
+    async def set_password(self, request, new_password: str):
+        """
+        Sets new password for this user
+        """
+
+        logger.info("Got new POST request on /api/users/password endpoint!")
+
+        await self._user_service.aupdate_user_password(tlg_id=request.user.tlg_id, new_password=new_password)
+
+        return 200, MessageResponseSchema.create(PASSWORD_SUCCESS)
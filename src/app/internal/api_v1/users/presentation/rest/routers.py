@@ -1,11 +1,13 @@
+from typing import Union
+
 from ninja import Router
-from ninja_jwt.authentication import JWTAuth
+from ninja.security import HttpBearer
 
 from app.internal.api_v1.users.domain.entities import MessageResponseSchema, UserSchema
-from app.internal.api_v1.users.presentation.rest.handlers import RestUserHandlers
+from app.internal.api_v1.users.presentation.rest.handlers import AsyncRestUserHandlers, RestUserHandlers
 
 
-def get_users_router(rest_user_handlers: RestUserHandlers):
+def get_users_router(rest_user_handlers: Union[RestUserHandlers, AsyncRestUserHandlers], auth: HttpBearer):
     """
     Creates router for /users/* requests
     """
@@ -20,7 +22,7 @@ def get_users_router(rest_user_handlers: RestUserHandlers):
             403: MessageResponseSchema,
             404: MessageResponseSchema,
         },
-        auth=JWTAuth(),
+        auth=auth,
         description="Returns full information about Telegram user",
     )
 
@@ -32,7 +34,7 @@ def get_users_router(rest_user_handlers: RestUserHandlers):
             200: MessageResponseSchema,
             400: MessageResponseSchema,
         },
-        auth=JWTAuth(),
+        auth=auth,
         description="Resets phone number for this user",
     )
 
@@ -41,7 +43,7 @@ def get_users_router(rest_user_handlers: RestUserHandlers):
         methods=["POST"],
         view_func=rest_user_handlers.set_password,
         response={200: MessageResponseSchema},
-        auth=JWTAuth(),
+        auth=auth,
         description="Resets password for this user",
     )
 
@@ -0,0 +1,49 @@
+from typing import Set
+
+from django.conf import settings
+from django.db import connection
+
+from app.internal.api_v1.utils.authentication.db.repositories import InactiveUserRepository, RevokedTokenRepository
+from app.internal.api_v1.utils.caching.domain.services import RefreshingSet
+
+
+def load_revoked_jtis() -> Set[str]:
+    # Runs in background thread of the set, its connection is closed till the next reload
+    try:
+        return RevokedTokenRepository().get_revoked_jtis()
+    finally:
+        connection.close()
+
+
+def load_inactive_user_ids() -> Set[int]:
+    # The same as load_revoked_jtis
+    try:
+        return InactiveUserRepository().get_inactive_user_ids()
+    finally:
+        connection.close()
+
+
+# JTIs of revoked tokens. The set is per process, so a revoked token
+# is rejected after REVOKED_TOKENS_REFRESH_INTERVAL seconds at most
+revoked_tokens: RefreshingSet[str] = RefreshingSet(
+    load=load_revoked_jtis, refresh_interval=settings.REVOKED_TOKENS_REFRESH_INTERVAL
+)
+
+# IDs of deactivated users, their tokens are rejected after REVOKED_TOKENS_REFRESH_INTERVAL seconds at most
+inactive_users: RefreshingSet[int] = RefreshingSet(
+    load=load_inactive_user_ids, refresh_interval=settings.REVOKED_TOKENS_REFRESH_INTERVAL
+)
+
+
+def load_authentication_caches() -> None:
+    """
+    Loads revoked tokens and inactive users on startup of server process,
+    so the first requests don't wait for DB (right in event loop for async views)
+    """
+    for refreshing_set in (revoked_tokens, inactive_users):
+        try:
+            refreshing_set.load()
+        except Exception:
+            # Logged by the set, the first check reloads it in background
+            # and tokens are rejected till then
+            pass
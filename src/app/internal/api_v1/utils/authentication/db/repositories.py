@@ -0,0 +1,25 @@
+from typing import Set
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from ninja_jwt.settings import api_settings
+from ninja_jwt.token_blacklist.models import BlacklistedToken
+
+
+class RevokedTokenRepository:
+    def get_revoked_jtis(self) -> Set[str]:
+        """
+        Returns JTIs of blacklisted tokens that haven't expired yet
+        (expired ones are rejected anyway)
+        """
+        return set(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).values_list("token__jti", flat=True)
+        )
+
+
+class InactiveUserRepository:
+    def get_inactive_user_ids(self) -> Set[int]:
+        """
+        Returns IDs (as in USER_ID_CLAIM of tokens) of deactivated users
+        """
+        return set(get_user_model().objects.filter(is_active=False).values_list(api_settings.USER_ID_FIELD, flat=True))
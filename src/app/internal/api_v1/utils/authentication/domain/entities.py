@@ -0,0 +1,82 @@
+from typing import Dict, Optional, Type
+
+from django.contrib.auth.models import AbstractUser
+from django.utils.functional import cached_property
+from ninja import Schema
+from ninja_jwt.models import TokenUser
+from ninja_jwt.schema import TokenObtainPairInputSchema, TokenRefreshInputSchema
+from ninja_jwt.settings import api_settings
+from ninja_jwt.tokens import AccessToken, RefreshToken
+from ninja_jwt.utils import token_error
+from pydantic import root_validator
+
+# JTI of refresh token that access token was made from. Only refresh tokens are blacklisted
+# (on rotation and by /token/blacklist), so access tokens are revoked by this claim
+REFRESH_JTI_CLAIM = "refresh_jti"
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry its JTI in REFRESH_JTI_CLAIM
+    """
+
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+        access[REFRESH_JTI_CLAIM] = self[api_settings.JTI_CLAIM]
+
+        return access
+
+
+class ClaimsTokenObtainPairInputSchema(TokenObtainPairInputSchema):
+    """
+    Issues token pair whose access tokens are revoked with the refresh one (REFRESH_JTI_CLAIM)
+    """
+
+    @classmethod
+    def get_token(cls, user: AbstractUser) -> Dict:
+        refresh = ClaimsRefreshToken.for_user(user)
+
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+class ClaimsTokenRefreshInputSchema(TokenRefreshInputSchema):
+    @classmethod
+    def get_response_schema(cls) -> Type[Schema]:
+        return ClaimsTokenRefreshOutputSchema
+
+
+class ClaimsTokenRefreshOutputSchema(Schema):
+    """
+    Refreshes token pair like TokenRefreshOutputSchema, but access token is made
+    from the rotated refresh token, so it isn't revoked by blacklisting of the given one
+    """
+
+    refresh: str
+    access: Optional[str]
+
+    @root_validator
+    @token_error
+    def validate_schema(cls, values: Dict) -> dict:
+        refresh = ClaimsRefreshToken(values["refresh"])
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+        values.update(refresh=str(refresh), access=str(refresh.access_token))
+        return values
+
+
+class TokenPrincipal(TokenUser):
+    """
+    Authenticated user of REST API built from claims of validated access token
+    """
+
+    @cached_property
+    def tlg_id(self) -> int:
+        return self.token[api_settings.USER_ID_CLAIM]
@@ -0,0 +1,47 @@
+from django.utils.translation import gettext_lazy as _
+from ninja_jwt.authentication import JWTStatelessUserAuthentication
+from ninja_jwt.exceptions import AuthenticationFailed, InvalidToken
+from ninja_jwt.settings import api_settings
+
+from app.internal.api_v1.utils.authentication.domain.entities import REFRESH_JTI_CLAIM
+from app.internal.api_v1.utils.caching.domain.exceptions import SetNotLoadedException
+from app.internal.api_v1.utils.caching.domain.services import RefreshingSet
+
+
+class JWTClaimsAuth(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that trusts claims of validated access token: request.user
+    is TokenPrincipal (Telegram ID), users table isn't queried.
+    Tokens made from blacklisted refresh tokens and tokens of inactive users are rejected
+    by cached sets, so sync views and async ones (Ninja authenticates them right
+    in event loop) don't query DB either. Until the sets are loaded, all tokens are rejected.
+    """
+
+    def __init__(self, revoked_tokens: RefreshingSet[str], inactive_users: RefreshingSet[int]):
+        super().__init__()
+        self._revoked_tokens = revoked_tokens
+        self._inactive_users = inactive_users
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+
+        for jti_claim in (REFRESH_JTI_CLAIM, api_settings.JTI_CLAIM):
+            if self._contains(self._revoked_tokens, validated_token.get(jti_claim)):
+                raise InvalidToken(_("Token is blacklisted"))
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if self._contains(self._inactive_users, validated_token[api_settings.USER_ID_CLAIM]):
+            raise AuthenticationFailed(_("User is inactive"))
+
+        return user
+
+    @staticmethod
+    def _contains(refreshing_set: RefreshingSet, item) -> bool:
+        try:
+            return item in refreshing_set
+        except SetNotLoadedException:
+            raise AuthenticationFailed(_("Revoked tokens aren't loaded yet, try again later"))
@@ -0,0 +1,13 @@
+from ninja_extra import api_controller
+from ninja_extra.permissions import AllowAny
+from ninja_jwt.controller import TokenBlackListController, TokenObtainPairController, TokenVerificationController
+
+
+@api_controller("/token", permissions=[AllowAny], tags=["token"])
+class TokenController(TokenVerificationController, TokenObtainPairController, TokenBlackListController):
+    """
+    Obtains, refreshes and verifies token pairs like NinjaJWTDefaultController,
+    blacklists refresh tokens (logout) as well
+    """
+
+    auto_import = False
@@ -0,0 +1,155 @@
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, FrozenSet, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from app.internal.api_v1.utils.caching.domain.exceptions import SetNotLoadedException
+
+logger = logging.getLogger("stdout_with_tlg")
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe in-process cache with bounded number of entries.
+    The least recently used entry is evicted when cache is full.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns cached value (and marks it as recently used) or None
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe in-process cache, entries expire ttl seconds after they were set.
+    With maxsize, the oldest entry is evicted when cache is full.
+    """
+
+    def __init__(self, ttl: float, maxsize: Optional[int] = None):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns cached value or None if there is no such key or it has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RefreshingSet(Generic[V]):
+    """
+    Thread-safe in-process set, contents are loaded by load function.
+    When contents get older than refresh_interval seconds, they are reloaded
+    in background thread and checks keep using current contents meanwhile.
+    Checks never wait for DB: until contents are loaded (on startup by load,
+    or in background after failed startup load and after clear) they raise
+    SetNotLoadedException, so a check in event loop doesn't block it.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[V]], refresh_interval: float):
+        self._load = load
+        self._refresh_interval = refresh_interval
+        self._items: Optional[FrozenSet[V]] = None
+        self._loaded_at = 0.0
+        self._reloading: Optional[Future] = None
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refreshing-set")
+
+    def __contains__(self, item: V) -> bool:
+        with self._lock:
+            items = self._items
+
+            if items is None or time.monotonic() - self._loaded_at >= self._refresh_interval:
+                if self._reloading is None:
+                    self._reloading = self._executor.submit(self._reload)
+
+        if items is None:
+            raise SetNotLoadedException()
+
+        return item in items
+
+    def load(self) -> None:
+        """
+        Loads contents in calling thread, so checks work from the first one
+        """
+        self._reload()
+
+    def _reload(self) -> FrozenSet[V]:
+        try:
+            items = frozenset(self._load())
+        except Exception:
+            logger.exception("Unable to reload set, current contents are kept")
+            with self._lock:
+                self._reloading = None
+            raise
+
+        with self._lock:
+            self._items, self._loaded_at, self._reloading = items, time.monotonic(), None
+
+        return items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items = None
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = Lock()
+
+# Replacement of advisory locks for DB backends without them (SQLite in tests)
+_process_named_lock = Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Returns pool of DB_THREAD_POOL_SIZE threads for DB work,
+    every thread of it keeps its own DB connection
+    """
+    global _db_executor
+
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(max_workers=settings.DB_THREAD_POOL_SIZE, thread_name_prefix="db")
+
+        return _db_executor
+
+
+def call_with_db_connection(func: Callable, *args, **kwargs) -> Any:
+    """
+    Calls func in a DB pool thread, dropping connections that are
+    expired (CONN_MAX_AGE) or broken before and after the call
+    """
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def db_sync_to_async(func: Callable):
+    """
+    Replacement of @sync_to_async for sync code working with DB.
+    Plain @sync_to_async is thread sensitive, so DB work of all concurrent
+    updates is serialized onto a single thread. With DB_THREAD_POOL_SIZE > 0
+    calls are spread over a pool of DB threads instead.
+    ----------
+
+    :param func: sync function (or method) that works with DB
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not settings.DB_THREAD_POOL_SIZE:
+            return await sync_to_async(func)(*args, **kwargs)
+
+        return await sync_to_async(call_with_db_connection, thread_sensitive=False, executor=get_db_executor())(
+            func, *args, **kwargs
+        )
+
+    return wrapper
+
+
+@contextmanager
+def named_lock(name: str) -> Iterator[None]:
+    """
+    Lock shared by all processes working with DB: session advisory lock in Postgres
+    (it doesn't need a DB transaction, so it can be held during slow I/O).
+    With other DB backends it's a lock of this process.
+    ----------
+
+    :param name: name of locked resource
+    """
+    if connection.vendor != "postgresql":
+        with _process_named_lock:
+            yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", [name])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [name])
+
+
+def lock_table_against_writes(model) -> None:
+    """
+    Locks table of the model till the end of current DB transaction,
+    so concurrent inserts, updates and deletes wait for it (reads don't).
+    In Postgres it's SHARE ROW EXCLUSIVE table lock, other DB backends
+    (SQLite in tests) serialize writing transactions themselves.
+    ----------
+
+    :param model: Django model, which table is locked
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} IN SHARE ROW EXCLUSIVE MODE")
@@ -1,61 +1,229 @@
-import asyncio
 import logging
+import time
+from collections import deque
 from logging import Handler, LogRecord
-from queue import Queue
-from threading import Thread
+from threading import Condition, Thread
+from typing import Iterable, List, Optional
 
 import requests
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from requests.exceptions import RequestException
 
 logger = logging.getLogger("stdout")
 
+# Max length of Telegram message
+TLG_MESSAGE_MAX_LENGTH = 4096
+
+# Attempts to send one message (429 responses and network errors are retried)
+TLG_LOGS_SEND_MAX_ATTEMPTS = 3
+TLG_LOGS_REQUEST_TIMEOUT = 10
+
+
+def pack_log_lines(lines: Iterable[str], max_length: int = TLG_MESSAGE_MAX_LENGTH) -> List[str]:
+    """
+    Joins log lines into as few messages as possible, every one is not longer than max_length.
+    Lines longer than max_length are split.
+    """
+    messages, message = [], ""
+
+    for line in lines:
+        for start in range(0, max(len(line), 1), max_length):
+            chunk = line[start : start + max_length]
+
+            if message and len(message) + 1 + len(chunk) > max_length:
+                messages.append(message)
+                message = ""
+
+            message = f"{message}\n{chunk}" if message else chunk
+
+    if message:
+        messages.append(message)
+
+    return messages
+
 
 class TelegramLogsHandler(Handler):
-    def __init__(self, logs_bot_token: str, logs_chat_id: str):
+    """
+    Sends log records to Telegram chat from a background thread.
+
+    Records are buffered (up to queue_size, the rest are dropped and counted),
+    coalesced into messages of up to 4096 characters once per flush_interval
+    and sent over one keep-alive HTTP session. 429 responses are retried after
+    the delay requested by Telegram. flush() and close() drain the buffer.
+    """
+
+    def __init__(
+        self,
+        logs_bot_token: str,
+        logs_chat_id: str,
+        queue_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_retry_after: float = 60.0,
+    ):
         super().__init__()
 
-        self._token = logs_bot_token
+        self._url = f"https://api.telegram.org/bot{logs_bot_token}/sendMessage"
         self._chat_id = logs_chat_id
 
-        self._updates_queue = Queue()
-        self.start_logs_bot()
+        self._queue_size = queue_size
+        self._flush_interval = flush_interval
+        self._max_retry_after = max_retry_after
+
+        self._session = requests.Session()
+
+        self._condition = Condition()
+        self._pending: "deque[str]" = deque()
+        self._number_of_dropped = 0
+        self._number_of_flush_waiters = 0
+        self._is_sending = False
+        self._is_closed = False
+
+        self._thread = self.start_logs_bot()
 
-    def start_logs_bot(self):
+    def start_logs_bot(self) -> Thread:
         """
         Starts thread with Telegram logs manager function
         """
-        th = Thread(daemon=True, target=self.telegram_logs_manager)
+        th = Thread(daemon=True, target=self.telegram_logs_manager, name="telegram_logs")
         th.start()
 
-    def telegram_logs_manager(self):
+        return th
+
+    def emit(self, record: LogRecord):
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._condition:
+            if len(self._pending) >= self._queue_size:
+                self._number_of_dropped += 1
+                return
+
+            self._pending.append(text)
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None):
         """
-        Recieves logs from queue and sends them to Telegram channel
+        Sends all buffered records without waiting for flush interval
+        and waits (up to timeout seconds, max_retry_after by default) until they are sent
         """
-        url = f"https://api.telegram.org/bot{self._token}/sendMessage"
+        with self._condition:
+            self._number_of_flush_waiters += 1
+            self._condition.notify_all()
+
+            try:
+                self._condition.wait_for(
+                    lambda: not self._thread.is_alive()
+                    or not (self._pending or self._number_of_dropped or self._is_sending),
+                    timeout=timeout if timeout is not None else self._max_retry_after,
+                )
+            finally:
+                self._number_of_flush_waiters -= 1
 
+    def close(self):
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout=self._max_retry_after)
+        self._session.close()
+
+        super().close()
+
+    def telegram_logs_manager(self):
+        """
+        Recieves logs from buffer and sends them to Telegram channel,
+        records of one flush interval are sent together
+        """
         while True:
-            update = self._updates_queue.get()
-            if update:
-                params = {"chat_id": self._chat_id, "text": self.format(update)}
-                try:
-                    requests.get(url, params=params)
-                except RequestException:
-                    logger.info("Some error occured during sending logs to Telegram!")
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._number_of_dropped or self._is_closed)
 
-    def emit(self, record: LogRecord):
-        self._updates_queue.put(record)
+                if not (self._pending or self._number_of_dropped):
+                    return
+
+                # Gives more records a chance to join this batch
+                self._condition.wait_for(
+                    lambda: self._number_of_flush_waiters or self._is_closed, timeout=self._flush_interval
+                )
+
+                lines, number_of_dropped = list(self._pending), self._number_of_dropped
+                self._pending.clear()
+                self._number_of_dropped = 0
+                self._is_sending = True
+
+            if number_of_dropped:
+                lines.append(f"{number_of_dropped} log records were dropped: Telegram logs buffer is full")
+
+            try:
+                for message in pack_log_lines(lines):
+                    self.send_message(message)
+            finally:
+                with self._condition:
+                    self._is_sending = False
+                    self._condition.notify_all()
+
+    def send_message(self, text: str) -> None:
+        """
+        Sends message to logs chat. If Telegram responds with 429,
+        waits for retry_after seconds (but not longer than max_retry_after) and retries
+        """
+        for attempt in range(1, TLG_LOGS_SEND_MAX_ATTEMPTS + 1):
+            retry_after = attempt
+
+            try:
+                response = self._session.post(
+                    self._url, data={"chat_id": self._chat_id, "text": text}, timeout=TLG_LOGS_REQUEST_TIMEOUT
+                )
+
+                if response.status_code != requests.codes.too_many_requests:
+                    if not response.ok:
+                        logger.info(f"Telegram rejected logs message with status {response.status_code}")
+                    return
+
+                retry_after = response.json().get("parameters", {}).get("retry_after", retry_after)
+
+            except (RequestException, ValueError):
+                logger.info("Some error occured during sending logs to Telegram!")
+
+            if attempt < TLG_LOGS_SEND_MAX_ATTEMPTS:
+                time.sleep(min(retry_after, self._max_retry_after))
+
+        logger.info("Logs message was not sent to Telegram after retries")
 
 
 class RestLoggingMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
 
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        self.log_request(request)
+
+        response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        # User of session may be loaded from DB, that can't be done in event loop
+        await sync_to_async(self.log_request)(request)
+
+        response = await self.get_response(request)
+        return response
+
+    @staticmethod
+    def log_request(request) -> None:
         # Decied not to add Body and Headers in log message due to their length
         logger.info(
             f"Got new request with METHOD: {request.method} "
             + f"on ENDPOINT: {request.path} from USER: {request.user} "
         )
-
-        response = self.get_response(request)
-        return response
@@ -0,0 +1,37 @@
+from typing import Optional, Type
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Model
+
+# Planner estimate of number of rows, -1 (or 0) if table wasn't analyzed yet
+ESTIMATED_NUMBER_OF_ROWS_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+
+
+def get_estimated_number_of_rows(model: Type[Model]) -> Optional[int]:
+    """
+    Returns pg_class.reltuples estimate for the table of model (Postgres only)
+    or None if there is no estimate
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATED_NUMBER_OF_ROWS_SQL, [model._meta.db_table])
+        row = cursor.fetchone()
+
+    return row[0] if row is not None and row[0] > 0 else None
+
+
+def get_number_of_rows(model: Type[Model]) -> int:
+    """
+    Returns number of rows in the table of model. Tables larger than
+    METRICS_ROW_COUNT_ESTIMATE_FROM rows are not counted, planner estimate is used instead.
+    """
+    estimate_from = settings.METRICS_ROW_COUNT_ESTIMATE_FROM
+    if estimate_from:
+        estimated_number_of_rows = get_estimated_number_of_rows(model)
+        if estimated_number_of_rows is not None and estimated_number_of_rows >= estimate_from:
+            return estimated_number_of_rows
+
+    return model.objects.count()
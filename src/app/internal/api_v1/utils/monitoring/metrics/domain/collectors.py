@@ -0,0 +1,50 @@
+import logging
+from typing import Callable, Dict, Iterator, Tuple
+
+from django.db import DatabaseError, close_old_connections
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.internal.api_v1.utils.caching.domain.services import TTLCache
+
+logger = logging.getLogger("stdout_with_tlg")
+
+
+class RowCountCollector(Collector):
+    """
+    Exposes numbers of DB rows as gauges. Numbers are computed lazily
+    at scrape time (not in request handlers) and cached for ttl seconds.
+    """
+
+    def __init__(self, row_counters: Dict[str, Tuple[str, Callable[[], int]]], ttl: float):
+        """
+        :param row_counters: gauge name -> (gauge description, function returning number of rows)
+        :param ttl: how long computed numbers are reused by scrapes
+        """
+        self._row_counters = row_counters
+        self._cache: TTLCache[int] = TTLCache(ttl=ttl)
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        """
+        Describes gauges without computing them, so registration doesn't query DB
+        """
+        for name, (documentation, _) in self._row_counters.items():
+            yield GaugeMetricFamily(name, documentation)
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        # Scrapes are served by a long-living metrics server thread
+        close_old_connections()
+
+        for name, (documentation, count_rows) in self._row_counters.items():
+            number_of_rows = self._cache.get(name)
+
+            if number_of_rows is None:
+                try:
+                    number_of_rows = count_rows()
+                except DatabaseError as err:
+                    logger.info(f"Unable to count rows for {name} gauge:\n{err}")
+                    continue
+
+                self._cache.set(name, number_of_rows)
+
+            yield GaugeMetricFamily(name, documentation, value=number_of_rows)
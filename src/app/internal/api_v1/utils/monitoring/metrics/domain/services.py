@@ -0,0 +1,146 @@
+import os
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Optional
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from prometheus_client import REGISTRY, CollectorRegistry
+from prometheus_client.multiprocess import MultiProcessCollector
+from telegram import Update
+from telegram.ext import Application, BaseHandler, CommandHandler, ContextTypes
+
+from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
+
+# Outcomes of processed Telegram commands
+HANDLER_OK = "ok"
+HANDLER_USER_ERROR = "user_error"
+HANDLER_EXCEPTION = "exception"
+
+
+class HandlerStats:
+    """
+    Outcome and SQL queries of the command being processed
+    """
+
+    def __init__(self):
+        self.outcome = HANDLER_OK
+        self.number_of_queries = 0
+        self.sql_seconds = 0.0
+
+
+# Stats of the current command. Context variables are copied into threads
+# by sync_to_async, so DB threads account queries to the command that made them
+current_handler_stats: ContextVar[Optional[HandlerStats]] = ContextVar("current_handler_stats", default=None)
+
+
+def set_handler_outcome(outcome: str) -> None:
+    """
+    Sets outcome of the command being processed, e.g. HANDLER_USER_ERROR
+    when handler responds with an error message instead of raising
+    """
+    handler_stats = current_handler_stats.get()
+
+    if handler_stats is not None:
+        handler_stats.outcome = outcome
+
+
+def account_sql_query(execute: Callable, sql, params, many, context):
+    """
+    DB execute wrapper, adds query and its time to stats of the current command
+    """
+    handler_stats = current_handler_stats.get()
+    if handler_stats is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        handler_stats.number_of_queries += 1
+        handler_stats.sql_seconds += time.perf_counter() - started_at
+
+
+def install_sql_query_accounting(connection: BaseDatabaseWrapper, **kwargs) -> None:
+    """
+    connection_created receiver, installs account_sql_query on every DB connection
+    """
+    if account_sql_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(account_sql_query)
+
+
+def get_handler_command(handler: BaseHandler) -> str:
+    """
+    Returns metrics label of handler: command for command handlers
+    (/check_card and /check_account are different commands) and callback name for others
+    """
+    if isinstance(handler, CommandHandler):
+        return f"/{min(handler.commands)}"
+
+    return getattr(handler.callback, "__name__", type(handler).__name__)
+
+
+def instrument_handler(command: str, callback: Callable):
+    """
+    Wraps handler callback, so that latency, outcome, number of SQL queries
+    and their total time are recorded for every processed command.
+    ----------
+
+    :param command: metrics label of handler
+    :param callback: handler callback
+    """
+
+    @wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        handler_stats = HandlerStats()
+        stats_token = current_handler_stats.set(handler_stats)
+
+        PrometheusMetrics.inc_handlers_in_progress_gauge(command)
+        started_at = time.perf_counter()
+
+        try:
+            return await callback(update, context)
+
+        except Exception:
+            handler_stats.outcome = HANDLER_EXCEPTION
+            raise
+
+        finally:
+            PrometheusMetrics.observe_handler_latency_histogram(command, time.perf_counter() - started_at)
+            PrometheusMetrics.dec_handlers_in_progress_gauge(command)
+
+            PrometheusMetrics.inc_handler_outcomes_counter(command, handler_stats.outcome)
+            PrometheusMetrics.observe_handler_sql_queries_histogram(command, handler_stats.number_of_queries)
+            PrometheusMetrics.observe_handler_sql_time_histogram(command, handler_stats.sql_seconds)
+
+            current_handler_stats.reset(stats_token)
+
+    return wrapper
+
+
+def instrument_application_handlers(application: Application) -> None:
+    """
+    Instruments callbacks of all handlers registered in application
+    and starts accounting SQL queries of DB connections created from now on
+    """
+    connection_created.connect(install_sql_query_accounting, dispatch_uid="install_sql_query_accounting")
+
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            handler.callback = instrument_handler(get_handler_command(handler), handler.callback)
+
+
+def get_metrics_registry() -> CollectorRegistry:
+    """
+    Returns registry served on metrics endpoint. In prometheus multiprocess mode
+    (PROMETHEUS_MULTIPROC_DIR is set for bot and gunicorn workers) it collects
+    metrics of all processes, otherwise it's the default registry of this process
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+
+    return registry
@@ -1,4 +1,8 @@
-from prometheus_client import Counter, Gauge
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from prometheus_client import Counter, Gauge, Histogram
 
 
 class PrometheusMetrics:
@@ -20,22 +24,230 @@ class PrometheusMetrics:
     def inc_send_to_card_counter(cls):
         cls.send_to_card_counter.inc()
 
-    tx_values_gauge = Gauge("gauge_for_tx_values", "Payment transactions values")
+    transfer_amounts_histogram = Histogram(
+        "histogram_for_transfer_amounts",
+        "Values of committed payment transfers",
+        ["currency"],
+        buckets=settings.TRANSFER_AMOUNT_BUCKETS,
+    )
+    transfers_counter = Counter("counter_for_transfers", "Number of committed payment transfers", ["currency"])
+    transfers_volume_counter = Counter(
+        "counter_for_transfers_volume", "Total value of committed payment transfers", ["currency"]
+    )
+
+    @classmethod
+    def observe_committed_transfer(cls, currency, tx_value):
+        cls.transfer_amounts_histogram.labels(currency=currency).observe(tx_value)
+        cls.transfers_counter.labels(currency=currency).inc()
+        cls.transfers_volume_counter.labels(currency=currency).inc(tx_value)
+
+    failed_transfers_counter = Counter(
+        "counter_for_failed_transfers", "Number of payment transfers which were not made", ["reason"]
+    )
+
+    @classmethod
+    def inc_failed_transfers_counter(cls, reason, number_of_transfers=1):
+        cls.failed_transfers_counter.labels(reason=reason).inc(number_of_transfers)
+
+    waiting_updates_gauge = Gauge(
+        "gauge_for_waiting_updates",
+        "Number of Telegram updates waiting for previous updates of the same user",
+        multiprocess_mode="livesum",
+    )
+
+    @classmethod
+    def inc_waiting_updates_gauge(cls):
+        cls.waiting_updates_gauge.inc()
+
+    @classmethod
+    def dec_waiting_updates_gauge(cls):
+        cls.waiting_updates_gauge.dec()
+
+    updates_in_progress_gauge = Gauge(
+        "gauge_for_updates_in_progress", "Number of Telegram updates being processed", multiprocess_mode="livesum"
+    )
+
+    @classmethod
+    def inc_updates_in_progress_gauge(cls):
+        cls.updates_in_progress_gauge.inc()
+
+    @classmethod
+    def dec_updates_in_progress_gauge(cls):
+        cls.updates_in_progress_gauge.dec()
+
+    update_wait_histogram = Histogram(
+        "histogram_for_update_wait_seconds",
+        "Time Telegram updates wait for previous updates of the same user and for a free processing slot",
+    )
+
+    @classmethod
+    def observe_update_wait_histogram(cls, wait_seconds):
+        cls.update_wait_histogram.observe(wait_seconds)
+
+    handler_latency_histogram = Histogram(
+        "histogram_for_handler_latency_seconds", "Time bot spends processing Telegram command", ["command"]
+    )
+
+    @classmethod
+    def observe_handler_latency_histogram(cls, command, latency_seconds):
+        cls.handler_latency_histogram.labels(command=command).observe(latency_seconds)
+
+    handler_outcomes_counter = Counter(
+        "counter_for_handler_outcomes",
+        "Number of processed Telegram commands by outcome (ok, user_error, exception)",
+        ["command", "outcome"],
+    )
+
+    @classmethod
+    def inc_handler_outcomes_counter(cls, command, outcome):
+        cls.handler_outcomes_counter.labels(command=command, outcome=outcome).inc()
+
+    handlers_in_progress_gauge = Gauge(
+        "gauge_for_handlers_in_progress",
+        "Number of Telegram commands being processed",
+        ["command"],
+        multiprocess_mode="livesum",
+    )
+
+    @classmethod
+    def inc_handlers_in_progress_gauge(cls, command):
+        cls.handlers_in_progress_gauge.labels(command=command).inc()
+
+    @classmethod
+    def dec_handlers_in_progress_gauge(cls, command):
+        cls.handlers_in_progress_gauge.labels(command=command).dec()
+
+    handler_sql_queries_histogram = Histogram(
+        "histogram_for_handler_sql_queries",
+        "Number of SQL queries made while processing Telegram command",
+        ["command"],
+        buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50),
+    )
+
+    @classmethod
+    def observe_handler_sql_queries_histogram(cls, command, number_of_queries):
+        cls.handler_sql_queries_histogram.labels(command=command).observe(number_of_queries)
+
+    handler_sql_time_histogram = Histogram(
+        "histogram_for_handler_sql_seconds",
+        "Total time of SQL queries made while processing Telegram command",
+        ["command"],
+    )
 
     @classmethod
-    def set_tx_values_gauge(cls, tx_value):
-        cls.tx_values_gauge.set(tx_value)
+    def observe_handler_sql_time_histogram(cls, command, sql_seconds):
+        cls.handler_sql_time_histogram.labels(command=command).observe(sql_seconds)
 
-    cards_number_gauge = Gauge("gauge_for_current_number_of_cards", "Displays current number of user Cards in DB")
+    rest_request_latency_histogram = Histogram(
+        "histogram_for_rest_request_latency_seconds", "Time REST API spends processing request", ["method", "route"]
+    )
 
     @classmethod
-    def set_cards_number_gauge(cls, current_card_number):
-        cls.cards_number_gauge.set(current_card_number)
+    def observe_rest_request_latency_histogram(cls, method, route, latency_seconds):
+        cls.rest_request_latency_histogram.labels(method=method, route=route).observe(latency_seconds)
 
-    accounts_number_gauge = Gauge(
-        "gauge_for_current_number_of_accounts", "Returns current number of payment Accounts in DB"
+    rest_responses_counter = Counter(
+        "counter_for_rest_responses", "Number of REST API responses by status code", ["method", "route", "status"]
     )
 
     @classmethod
-    def set_accounts_number_gauge(cls, current_account_number):
-        cls.accounts_number_gauge.set(current_account_number)
+    def inc_rest_responses_counter(cls, method, route, status):
+        cls.rest_responses_counter.labels(method=method, route=route, status=status).inc()
+
+    rest_response_size_histogram = Histogram(
+        "histogram_for_rest_response_size_bytes",
+        "Size of REST API response bodies",
+        ["route"],
+        buckets=(100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000),
+    )
+
+    @classmethod
+    def observe_rest_response_size_histogram(cls, route, size_bytes):
+        cls.rest_response_size_histogram.labels(route=route).observe(size_bytes)
+
+    rest_requests_in_progress_gauge = Gauge(
+        "gauge_for_rest_requests_in_progress",
+        "Number of REST API requests being processed",
+        ["method"],
+        multiprocess_mode="livesum",
+    )
+
+    @classmethod
+    def inc_rest_requests_in_progress_gauge(cls, method):
+        cls.rest_requests_in_progress_gauge.labels(method=method).inc()
+
+    @classmethod
+    def dec_rest_requests_in_progress_gauge(cls, method):
+        cls.rest_requests_in_progress_gauge.labels(method=method).dec()
+
+
+# Route label of requests which didn't match any URL pattern
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Method label of requests with any other (client controlled) method, so they don't create new time series
+KNOWN_HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"))
+OTHER_METHOD = "other"
+
+
+def get_method_label(request) -> str:
+    """
+    Returns method label of request: standard HTTP method or OTHER_METHOD
+    """
+    return request.method if request.method in KNOWN_HTTP_METHODS else OTHER_METHOD
+
+
+class RestMetricsMiddleware:
+    """
+    Records latency, status code and response size of every REST API request by route
+    (URL pattern, not path, so IDs in URLs don't create new time series)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        method = get_method_label(request)
+        PrometheusMetrics.inc_rest_requests_in_progress_gauge(method)
+        started_at = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            PrometheusMetrics.dec_rest_requests_in_progress_gauge(method)
+
+        self.observe_response(request, response, time.perf_counter() - started_at)
+        return response
+
+    async def __acall__(self, request):
+        method = get_method_label(request)
+        PrometheusMetrics.inc_rest_requests_in_progress_gauge(method)
+        started_at = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            PrometheusMetrics.dec_rest_requests_in_progress_gauge(method)
+
+        self.observe_response(request, response, time.perf_counter() - started_at)
+        return response
+
+    @staticmethod
+    def observe_response(request, response, latency: float) -> None:
+        method = get_method_label(request)
+        resolver_match = getattr(request, "resolver_match", None)
+        route = resolver_match.route if resolver_match is not None else UNMATCHED_ROUTE
+
+        PrometheusMetrics.observe_rest_request_latency_histogram(method, route, latency)
+        PrometheusMetrics.inc_rest_responses_counter(method, route, response.status_code)
+
+        if not response.streaming:
+            PrometheusMetrics.observe_rest_response_size_histogram(route, len(response.content))
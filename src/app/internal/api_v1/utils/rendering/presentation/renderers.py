@@ -0,0 +1,24 @@
+from typing import Any
+
+import orjson
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+# Datetimes are passed to NinjaJSONEncoder, so they are formatted as by default renderer
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renders Ninja responses with orjson instead of json.dumps.
+    Types that orjson doesn't serialize natively (schemas, Decimal, datetimes, ...)
+    are converted by NinjaJSONEncoder, so output has the same values as with default renderer.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self):
+        self._encoder = NinjaJSONEncoder()
+
+    def render(self, request, data: Any, *, response_status: int) -> bytes:
+        return orjson.dumps(data, default=self._encoder.default, option=ORJSON_OPTIONS)
@@ -3,4 +3,9 @@ from django.db import models
 
 class RemoteImage(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    content = models.ImageField(null=False)
+    # Content is stored by SHA-256 of its bytes, so identical photos share one object in storage
+    content = models.ImageField(null=False, db_index=True)
+
+    # Original Telegram photo, so it can be sent again by file_id without downloading it from S3
+    tlg_file_id = models.CharField(max_length=256, blank=True, default="")
+    tlg_file_unique_id = models.CharField(max_length=64, blank=True, default="", db_index=True)
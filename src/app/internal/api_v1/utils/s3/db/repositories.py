@@ -1,10 +1,37 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
 from django.conf import settings
 from django.core.files.images import ImageFile
 from storages.backends.s3boto3 import S3Boto3Storage
 
+from app.internal.api_v1.utils.caching.domain.services import TTLCache
+from app.internal.api_v1.utils.database.domain.services import named_lock
 from app.internal.api_v1.utils.s3.db.models import RemoteImage
 from app.internal.api_v1.utils.s3.domain.services import IS3Repository
 
+logger = logging.getLogger("stdout_with_tlg")
+
+# Max number of orphaned images removed by one sweep
+ORPHANED_IMAGES_SWEEP_BATCH = 100
+
+
+def get_image_content_lock_name(content_name: str) -> str:
+    """
+    Returns name of lock held while content is uploaded and referenced by a new image
+    or checked for references and deleted by sweeper
+    """
+    return f"remote-image-content:{content_name}"
+
+
+# Image ID -> presigned URL. URL is reused until PRESIGNED_URL_REUSE_MARGIN seconds before it expires
+PRESIGNED_URLS_CACHE_SIZE = 10000
+presigned_urls_cache: TTLCache[str] = TTLCache(
+    ttl=max(settings.PRESIGNED_URL_EXPIRES_IN - settings.PRESIGNED_URL_REUSE_MARGIN, 0),
+    maxsize=PRESIGNED_URLS_CACHE_SIZE,
+)
+
 
 class YandexCloudStorage(S3Boto3Storage):
     bucket_name = settings.AWS_STORAGE_BUCKET_NAME
@@ -21,15 +48,81 @@ class S3Repository(IS3Repository):
         """
         return await RemoteImage.objects.aget(pk=image_id)
 
-    async def get_presigned_url_for_image(self, image_id: int):
+    def get_stored_image_name(self, tlg_file_unique_id: str) -> Optional[str]:
         """
-        Returns presigned_url for image
+        Returns name of stored content of the same Telegram photo (or None).
+        Only images attached to transactions are reused, they are never removed by sweeper.
         """
-        image = await RemoteImage.objects.aget(pk=image_id)
-
-        presigned_url = image.content.storage.bucket.meta.client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": f"{settings.AWS_STORAGE_BUCKET_NAME}", "Key": f"telegram/{image.content.name}"},
+        return (
+            RemoteImage.objects.filter(tlg_file_unique_id=tlg_file_unique_id, transaction__isnull=False)
+            .values_list("content", flat=True)
+            .first()
         )
 
-        return presigned_url
+    def get_presigned_urls(self, image_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Returns presigned URLs for images. Cached URLs are reused,
+        names of the other images are loaded with a single query and signed.
+        ----------
+
+        :param image_ids: IDs of images
+        :return: presigned URL by image ID (missing images are skipped)
+        """
+        presigned_urls, missing_ids = {}, []
+
+        for image_id in set(image_ids):
+            presigned_url = presigned_urls_cache.get(image_id)
+
+            if presigned_url is None:
+                missing_ids.append(image_id)
+            else:
+                presigned_urls[image_id] = presigned_url
+
+        if not missing_ids:
+            return presigned_urls
+
+        s3_client = RemoteImage._meta.get_field("content").storage.bucket.meta.client
+
+        for image_id, name in RemoteImage.objects.filter(pk__in=missing_ids).values_list("pk", "content"):
+            presigned_url = s3_client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": f"{settings.AWS_STORAGE_BUCKET_NAME}", "Key": f"telegram/{name}"},
+                ExpiresIn=settings.PRESIGNED_URL_EXPIRES_IN,
+            )
+
+            presigned_urls_cache.set(image_id, presigned_url)
+            presigned_urls[image_id] = presigned_url
+
+        return presigned_urls
+
+    def delete_orphaned_images(self, uploaded_before: datetime) -> int:
+        """
+        Removes images which were uploaded before uploaded_before, but aren't
+        attached to any transaction (their transfer failed or was a duplicate).
+        Row is deleted first, so there is never a row pointing to a deleted object.
+        Content shared with other images is kept. Content is content-addressed,
+        so the same photo may be uploaded again by a concurrent transfer (see stage_image):
+        check of references and deletion hold the same lock as upload of this content.
+        ----------
+
+        :param uploaded_before: only images uploaded before this moment are removed,
+        younger ones may still be linked by transfers in progress
+        :return: number of removed images
+        """
+        orphaned_images = RemoteImage.objects.filter(transaction__isnull=True, uploaded_at__lt=uploaded_before)
+        deleted = 0
+
+        for image in orphaned_images.order_by("uploaded_at")[:ORPHANED_IMAGES_SWEEP_BATCH]:
+            with named_lock(get_image_content_lock_name(image.content.name)):
+                deleted_rows, _ = RemoteImage.objects.filter(pk=image.pk, transaction__isnull=True).delete()
+                if not deleted_rows:
+                    continue
+
+                if not RemoteImage.objects.filter(content=image.content.name).exists():
+                    image.content.delete(save=False)
+
+            deleted += 1
+
+        logger.info(f"Removed {deleted} orphaned images from object storage")
+
+        return deleted
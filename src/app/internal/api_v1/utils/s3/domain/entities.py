@@ -1,8 +1,23 @@
 from datetime import datetime
 
+from django.core.files.images import ImageFile
 from ninja import Schema
 
 
 class RemoteImageSchema(Schema):
     uploaded_at: datetime
     content: str
+
+
+class TelegramImageFile(ImageFile):
+    """
+    Image downloaded from Telegram, which remembers IDs of the original photo.
+    Already stored image (is_stored) has no file, it's saved by its name only.
+    """
+
+    def __init__(self, file, name: str, tlg_file_id: str, tlg_file_unique_id: str, is_stored: bool = False):
+        super().__init__(file, name=name)
+
+        self.tlg_file_id = tlg_file_id
+        self.tlg_file_unique_id = tlg_file_unique_id
+        self.is_stored = is_stored
@@ -1,11 +1,125 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
 from abc import ABC, abstractmethod
-from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from datetime import datetime, timedelta
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Dict, List, Optional
 
 from asgiref.sync import sync_to_async
-from django.core.files.images import ImageFile
+from django.conf import settings
+from django.utils import timezone
+from PIL import Image
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from app.internal.api_v1.utils.database.domain.services import db_sync_to_async
+from app.internal.api_v1.utils.s3.domain.entities import TelegramImageFile
+
+logger = logging.getLogger("stdout_with_tlg")
+
+_image_executor: Optional[ProcessPoolExecutor] = None
+_image_executor_lock = Lock()
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """
+    Returns pool of IMAGE_PROCESS_POOL_SIZE processes for CPU-bound image processing.
+    Processes are spawned, not forked: forked child would inherit locks of DB pool,
+    logs and cache threads of bot process, but not the threads themselves.
+    """
+    global _image_executor
+
+    with _image_executor_lock:
+        if _image_executor is None:
+            _image_executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PROCESS_POOL_SIZE, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return _image_executor
+
+
+def shutdown_image_executor() -> None:
+    """
+    Stops image process pool (if it was started), e.g. on bot shutdown
+    """
+    global _image_executor
+
+    with _image_executor_lock:
+        if _image_executor is not None:
+            _image_executor.shutdown(cancel_futures=True)
+            _image_executor = None
+
+
+def get_file_sha256(path: str, chunk_size: int = 64 * 1024) -> str:
+    """
+    Returns SHA-256 hex digest of file content, which is read in chunks
+    """
+    content_hash = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def recompress_image(path: str, max_side: int, quality: int) -> str:
+    """
+    Downscales image to fit into max_side x max_side and recompresses it to JPEG.
+    Image file is replaced by recompressed one if it's smaller.
+    Runs in image process pool, so file is passed by path (content is never pickled)
+    and nothing is logged here (logs handlers live in bot process).
+    ----------
+
+    :param path: path of image file
+    :param max_side: max width and height of image
+    :param quality: JPEG quality
+    :return: SHA-256 hex digest of resulting content
+    :raises OSError: if file is not an image
+    """
+    recompressed_path = f"{path}.recompressed"
+
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((max_side, max_side))
+            image.convert("RGB").save(
+                recompressed_path, format="JPEG", quality=quality, optimize=True, progressive=True
+            )
+
+        if os.path.getsize(recompressed_path) < os.path.getsize(path):
+            os.replace(recompressed_path, path)
+
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(recompressed_path)
+
+    return get_file_sha256(path)
+
+
+async def arecompress_image(path: str) -> str:
+    """
+    Runs recompress_image in image process pool
+    (or in a thread if IMAGE_PROCESS_POOL_SIZE is 0).
+    Original file is kept if it's not an image.
+    """
+    args = (path, settings.IMAGE_MAX_SIDE, settings.IMAGE_JPEG_QUALITY)
+
+    try:
+        if not settings.IMAGE_PROCESS_POOL_SIZE:
+            return await sync_to_async(recompress_image, thread_sensitive=False)(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(get_image_executor(), recompress_image, *args)
+
+    except OSError as err:
+        logger.info(f"Unable to recompress image, original is kept:\n{err}")
+        return await sync_to_async(get_file_sha256, thread_sensitive=False)(path)
+
 
 class IS3Repository(ABC):
     @abstractmethod
@@ -13,7 +127,15 @@ class IS3Repository(ABC):
         pass
 
     @abstractmethod
-    async def get_presigned_url_for_image(self, image_id: int):
+    def get_stored_image_name(self, tlg_file_unique_id: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def get_presigned_urls(self, image_ids: List[int]) -> Dict[int, str]:
+        pass
+
+    @abstractmethod
+    def delete_orphaned_images(self, uploaded_before: datetime) -> int:
         pass
 
 
@@ -21,24 +143,86 @@ class S3Service:
     def __init__(self, s3_repo: IS3Repository):
         self._s3_repo = s3_repo
 
-    async def aconvert_telegram_photo_to_image(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> ImageFile:
+    async def aconvert_telegram_photo_to_image(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ) -> TelegramImageFile:
         """
         Recieves Telegram Update object, extracts photo and creates ImageFile
+        (with file IDs of the photo, so it can be sent again without downloading).
+
+        Photo that is already stored (the same file_unique_id) isn't downloaded again.
+        Others are downloaded into a temporary file, recompressed by image process pool
+        right in this file and named by SHA-256 of content, so identical photos share
+        one object in storage. Content is never held in memory of bot process.
         """
 
-        photo_id = update.message.photo[-1].file_id
-        photo_file = await context.bot.get_file(photo_id)
+        photo = update.message.photo[-1]
+
+        stored_name = await self.aget_stored_image_name(tlg_file_unique_id=photo.file_unique_id)
+        if stored_name is not None:
+            return TelegramImageFile(
+                None,
+                name=stored_name,
+                tlg_file_id=photo.file_id,
+                tlg_file_unique_id=photo.file_unique_id,
+                is_stored=True,
+            )
+
+        photo_file = await context.bot.get_file(photo.file_id)
 
-        memory_file = BytesIO()
-        await photo_file.download_to_memory(memory_file)
+        with NamedTemporaryFile(prefix="photo-") as downloaded_file:
+            await photo_file.download_to_memory(downloaded_file)
+            downloaded_file.flush()
 
-        image_name = f"{photo_id}.jpg"
-        image_file = ImageFile(BytesIO(memory_file.getvalue()), name=image_name)
+            content_hash = await arecompress_image(downloaded_file.name)
 
-        return image_file
+            # Recompressed file replaces downloaded one, so it's opened by path. It's removed
+            # from disk on exit, but stays readable (for upload) until image file is closed
+            image_file = open(downloaded_file.name, "rb")
 
-    async def aget_presigned_url_for_image(self, image_id: int):
-        return await self._s3_repo.get_presigned_url_for_image(image_id=image_id)
+        return TelegramImageFile(
+            image_file,
+            name=f"{content_hash}.jpg",
+            tlg_file_id=photo.file_id,
+            tlg_file_unique_id=photo.file_unique_id,
+        )
+
+    @db_sync_to_async
+    def aget_stored_image_name(self, tlg_file_unique_id: str) -> Optional[str]:
+        return self.get_stored_image_name(tlg_file_unique_id=tlg_file_unique_id)
+
+    def get_stored_image_name(self, tlg_file_unique_id: str) -> Optional[str]:
+        return self._s3_repo.get_stored_image_name(tlg_file_unique_id=tlg_file_unique_id)
+
+    @db_sync_to_async
+    def aget_presigned_urls(self, image_ids: List[int]) -> Dict[int, str]:
+        return self.get_presigned_urls(image_ids=image_ids)
+
+    def get_presigned_urls(self, image_ids: List[int]) -> Dict[int, str]:
+        return self._s3_repo.get_presigned_urls(image_ids=image_ids)
 
     async def aget_image_from_s3_bucket(self, image_id: int):
         return await self._s3_repo.get_image_from_s3_bucket(image_id=image_id)
+
+    @db_sync_to_async
+    def adelete_orphaned_images(self, max_age: timedelta) -> int:
+        return self.delete_orphaned_images(max_age=max_age)
+
+    def delete_orphaned_images(self, max_age: timedelta) -> int:
+        return self._s3_repo.delete_orphaned_images(uploaded_before=timezone.now() - max_age)
+
+    async def arun_orphaned_images_sweeper(self, interval: float, max_age: timedelta) -> None:
+        """
+        Background task, which removes orphaned images every interval seconds
+        ----------
+
+        :param interval: seconds between sweeps
+        :param max_age: images younger than max_age are never removed
+        """
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.adelete_orphaned_images(max_age=max_age)
+            except Exception as err:
+                logger.info(f"Error during orphaned images sweep:\n{err}")
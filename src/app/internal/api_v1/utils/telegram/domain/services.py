@@ -1,18 +1,89 @@
+import asyncio
 import logging
+import time
 from functools import wraps
-from typing import Callable
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
 
-from asgiref.sync import sync_to_async
-from telegram import Update
-from telegram.ext import ContextTypes
+from telegram import InputMediaPhoto, Update
+from telegram.constants import MediaGroupLimit, MessageLimit
+from telegram.ext import Application, ContextTypes
 
-from app.internal.api_v1.users.db.exceptions import UserNotFoundException
+from app.internal.api_v1.users.db.caches import verified_phone_cache
 from app.internal.api_v1.users.db.repositories import UserRepository
+from app.internal.api_v1.users.domain.services import UserService
 from app.internal.api_v1.users.presentation.bot.telegram_messages import NO_VERIFIED_PN, USER_NOT_FOUND_MSG
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import HANDLER_USER_ERROR, set_handler_outcome
+from app.internal.api_v1.utils.monitoring.metrics.presentation.handlers import PrometheusMetrics
 
 logger = logging.getLogger("stdout_with_tlg")
 
 
+class VerifiedPhoneLoader:
+    """
+    Loads phone verification statuses of users. Cached statuses are returned
+    without leaving event loop, the rest requested during one loop iteration
+    are loaded together (with a single query in a single thread hop).
+    """
+
+    def __init__(self, user_service: UserService):
+        self._user_service = user_service
+
+        # Requests waiting for the next load, separately for every running event loop
+        self._pending: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, List[asyncio.Future]]]" = (
+            WeakKeyDictionary()
+        )
+        # Event loop keeps only weak references to tasks
+        self._load_tasks: Set[asyncio.Task] = set()
+
+    async def ais_phone_verified(self, tlg_id: int) -> Optional[bool]:
+        """
+        Returns True if user has a verified phone number,
+        False if he doesn't and None if there is no such user
+        ----------
+
+        :param tlg_id: Telegram ID of user
+        """
+        is_verified = verified_phone_cache.get(tlg_id)
+        if is_verified is not None:
+            return is_verified
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(loop, {})
+        if not pending:
+            loop.call_soon(self._start_loading, loop)
+
+        future = loop.create_future()
+        pending.setdefault(tlg_id, []).append(future)
+
+        return await future
+
+    def _start_loading(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = loop.create_task(self._aload(self._pending.pop(loop, {})))
+
+        self._load_tasks.add(task)
+        task.add_done_callback(self._load_tasks.discard)
+
+    async def _aload(self, pending: Dict[int, List[asyncio.Future]]) -> None:
+        try:
+            statuses = await self._user_service.aget_phone_verification_statuses(tlg_ids=list(pending))
+        except Exception as err:
+            for futures in pending.values():
+                for future in futures:
+                    # Waiter could have been cancelled meanwhile
+                    if not future.done():
+                        future.set_exception(err)
+            return
+
+        for tlg_id, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(statuses.get(tlg_id))
+
+
+verified_phone_loader = VerifiedPhoneLoader(user_service=UserService(user_repo=UserRepository()))
+
+
 def verified_phone_required(func: Callable):
     """
     This is utility function just for Telegram usage. It restricts access
@@ -25,22 +96,135 @@ def verified_phone_required(func: Callable):
 
     @wraps(func)
     async def wrapper(self_of_wrapped, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        user_repo = UserRepository()
-
         chat_id, user_id = update.effective_chat.id, update.effective_user.id
-        try:
-            user_phone_number: str = await sync_to_async(user_repo.get_user_field_by_id)(
-                tlg_id=update.effective_user.id, field_name="phone_number"
-            )
+        is_phone_verified = await verified_phone_loader.ais_phone_verified(tlg_id=user_id)
 
-        except UserNotFoundException:
+        if is_phone_verified is None:
             logger.info(f"User with ID {user_id} was not found in DB")
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=USER_NOT_FOUND_MSG)
 
-        if user_phone_number:
+        elif is_phone_verified:
             await func(self_of_wrapped, update, context)
+
         else:
             logger.info(f"User with {user_id} ID don't have access to this function: {func.__name__}")
+            set_handler_outcome(HANDLER_USER_ERROR)
             await context.bot.send_message(chat_id=chat_id, text=NO_VERIFIED_PN)
 
     return wrapper
+
+
+def pack_lines_into_messages(lines: Iterable[str], max_length: int = MessageLimit.MAX_TEXT_LENGTH) -> List[str]:
+    """
+    Joins lines into as few messages as possible (every one is not longer than max_length),
+    so a long list costs a few rate-limited Bot API calls instead of one call per line.
+    Lines longer than max_length are split.
+    ----------
+
+    :param lines: message lines (with line breaks)
+    :param max_length: max length of one message
+    """
+    messages, message = [], ""
+
+    for line in lines:
+        for start in range(0, len(line), max_length):
+            chunk = line[start : start + max_length]
+
+            if len(message) + len(chunk) > max_length:
+                messages.append(message)
+                message = ""
+
+            message += chunk
+
+    if message:
+        messages.append(message)
+
+    return messages
+
+
+async def send_photos_with_captions(
+    context: ContextTypes.DEFAULT_TYPE, chat_id: int, photos: List[Tuple[Union[bytes, str], str]]
+) -> None:
+    """
+    Sends photos grouped into media groups (up to 10 photos in each),
+    so every group costs one Bot API call.
+    ----------
+
+    :param context: context object
+    :param chat_id: Telegram Chat ID
+    :param photos: photo contents (or Telegram file IDs) with their captions
+    """
+    for start in range(0, len(photos), MediaGroupLimit.MAX_MEDIA_LENGTH):
+        group = [
+            (content, caption[: MessageLimit.CAPTION_LENGTH])
+            for content, caption in photos[start : start + MediaGroupLimit.MAX_MEDIA_LENGTH]
+        ]
+
+        # Media group must contain at least 2 photos
+        if len(group) == 1:
+            content, caption = group[0]
+            await context.bot.send_photo(chat_id=chat_id, photo=content, caption=caption)
+        else:
+            media = [InputMediaPhoto(media=content, caption=caption) for content, caption in group]
+            await context.bot.send_media_group(chat_id=chat_id, media=media)
+
+
+def get_update_ordering_key(update: object) -> Hashable:
+    """
+    Returns key of updates that must be processed in order they came:
+    the same for all updates of one user (or chat, if update has no user)
+    and unique for other updates
+    """
+    if isinstance(update, Update):
+        if update.effective_user is not None:
+            return ("user", update.effective_user.id)
+
+        if update.effective_chat is not None:
+            return ("chat", update.effective_chat.id)
+
+    return ("update", id(update))
+
+
+class OrderedConcurrentApplication(Application):
+    """
+    Application that processes up to max_updates_in_progress updates concurrently.
+    Updates of the same user are still processed one by one, in order they came,
+    so one slow command doesn't stall other users and transfers of a user stay ordered.
+    """
+
+    def __init__(self, max_updates_in_progress: int, **kwargs):
+        super().__init__(**kwargs)
+
+        self._updates_in_progress = asyncio.BoundedSemaphore(max_updates_in_progress)
+        self._ordering_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._updates_per_ordering_key: Dict[Hashable, int] = {}
+
+    async def process_update(self, update: object) -> None:
+        ordering_key = get_update_ordering_key(update)
+        ordering_lock = self._ordering_locks.setdefault(ordering_key, asyncio.Lock())
+        self._updates_per_ordering_key[ordering_key] = self._updates_per_ordering_key.get(ordering_key, 0) + 1
+
+        waiting_since = time.monotonic()
+        PrometheusMetrics.inc_waiting_updates_gauge()
+
+        try:
+            async with ordering_lock, self._updates_in_progress:
+                PrometheusMetrics.dec_waiting_updates_gauge()
+                PrometheusMetrics.observe_update_wait_histogram(time.monotonic() - waiting_since)
+                waiting_since = None
+
+                PrometheusMetrics.inc_updates_in_progress_gauge()
+                try:
+                    await super().process_update(update)
+                finally:
+                    PrometheusMetrics.dec_updates_in_progress_gauge()
+
+        finally:
+            if waiting_since is not None:
+                PrometheusMetrics.dec_waiting_updates_gauge()
+
+            self._updates_per_ordering_key[ordering_key] -= 1
+            if not self._updates_per_ordering_key[ordering_key]:
+                del self._updates_per_ordering_key[ordering_key]
+                del self._ordering_locks[ordering_key]
@@ -1,12 +1,20 @@
 import logging
+from datetime import timedelta
 
 from django.conf import settings
 from prometheus_client import start_http_server
 from telegram.ext import AIORateLimiter, Application, ApplicationBuilder
 
 from app.internal.api_v1.favourites.bot import register_telegram_favourite_handlers
-from app.internal.api_v1.payment.bot import register_telegram_payment_handlers
+from app.internal.api_v1.payment.bot import register_payment_row_count_collector, register_telegram_payment_handlers
 from app.internal.api_v1.users.bot import register_telegram_user_handlers
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import (
+    get_metrics_registry,
+    instrument_application_handlers,
+)
+from app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from app.internal.api_v1.utils.s3.domain.services import S3Service, shutdown_image_executor
+from app.internal.api_v1.utils.telegram.domain.services import OrderedConcurrentApplication
 
 from .ngrok_parser import parse_ngrok_url
 
@@ -20,18 +28,61 @@ def get_bot_application() -> Application:
     command handlers.
     :return: Bot Application instance
     """
-    application = ApplicationBuilder().token(settings.TLG_TOKEN).rate_limiter(AIORateLimiter()).build()
+    builder = (
+        ApplicationBuilder()
+        .token(settings.TLG_TOKEN)
+        .rate_limiter(AIORateLimiter())
+        .post_init(start_background_tasks)
+        .post_shutdown(stop_background_workers)
+    )
+
+    if settings.BOT_UPDATES_IN_PROGRESS > 1:
+        # Updates wait for their turn in OrderedConcurrentApplication, not in Application's own limit
+        builder = builder.concurrent_updates(True).application_class(
+            OrderedConcurrentApplication, kwargs={"max_updates_in_progress": settings.BOT_UPDATES_IN_PROGRESS}
+        )
+
+    application = builder.build()
 
     setup_application_handlers(application)
 
     return application
 
 
+async def start_background_tasks(application: Application):
+    """
+    Starts background tasks of bot, they are cancelled on bot shutdown.
+    ----------
+    :param application: Bot Application instance
+    """
+    if settings.ORPHANED_IMAGES_SWEEP_INTERVAL:
+        s3_service = S3Service(s3_repo=S3Repository())
+        application.create_task(
+            s3_service.arun_orphaned_images_sweeper(
+                interval=settings.ORPHANED_IMAGES_SWEEP_INTERVAL,
+                max_age=timedelta(seconds=settings.ORPHANED_IMAGE_MAX_AGE),
+            )
+        )
+
+
+async def stop_background_workers(application: Application):
+    """
+    Stops worker processes of bot on its shutdown.
+    ----------
+    :param application: Bot Application instance
+    """
+    shutdown_image_executor()
+
+
 def start_metrics_endpoint():
     """
     Starts endpoint for metrics collection.
+    In prometheus multiprocess mode it serves metrics of REST API workers too.
     """
-    start_http_server(settings.METRICS_PORT)
+    registry = get_metrics_registry()
+
+    register_payment_row_count_collector(registry)
+    start_http_server(settings.METRICS_PORT, registry=registry)
 
 
 def start_polling_bot():
@@ -86,3 +137,5 @@ def setup_application_handlers(application: Application):
     register_telegram_user_handlers(application)
     register_telegram_favourite_handlers(application)
     register_telegram_payment_handlers(application)
+
+    instrument_application_handlers(application)
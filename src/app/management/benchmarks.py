@@ -0,0 +1,58 @@
+from typing import Iterable, List, Tuple, Type
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Model
+
+
+def add_database_guard_argument(parser) -> None:
+    """
+    Adds required --database argument to a benchmark command that writes to DB
+    """
+    parser.add_argument(
+        "--database",
+        required=True,
+        help="Name of the DB that benchmark writes to, must be the configured one (a guard against production DB)",
+    )
+
+
+def check_database_guard(database_name: str) -> None:
+    """
+    Raises CommandError unless database_name is the name of configured DB,
+    so a benchmark is never run against a DB by accident
+    ----------
+
+    :param database_name: value of --database argument
+    """
+    configured_name = connection.settings_dict["NAME"]
+
+    if database_name != configured_name:
+        raise CommandError(f"Benchmark writes to DB {configured_name!r}, pass --database {configured_name} to confirm")
+
+
+def get_free_ids(base: int, number: int, id_fields: Iterable[Tuple[Type[Model], str]]) -> List[int]:
+    """
+    Returns number of IDs starting from base that aren't used by any of id_fields,
+    so benchmark rows never collide with existing ones
+    ----------
+
+    :param base: the least ID
+    :param number: number of IDs
+    :param id_fields: models and names of their ID fields
+    """
+    id_fields = list(id_fields)
+    free_ids, start = [], base
+
+    while len(free_ids) < number:
+        candidates = range(start, start + number)
+
+        used_ids = set()
+        for model, field_name in id_fields:
+            used_ids.update(
+                model.objects.filter(**{f"{field_name}__in": candidates}).values_list(field_name, flat=True)
+            )
+
+        free_ids.extend(candidate for candidate in candidates if candidate not in used_ids)
+        start += number
+
+    return free_ids[:number]
@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Max
+
+from app.internal.api_v1.payment.transactions.db.models import Counterparty, Transaction
+from app.internal.api_v1.utils.database.domain.services import lock_table_against_writes
+
+
+class Command(BaseCommand):
+    help = "Rebuilds counterparty edges (used by /list_inter) from the existing transactions"
+
+    def handle(self, *args, **options):
+        # Transfers upsert edges in their own DB transactions: the ones committed before
+        # the lock are aggregated below, others wait and add their counts to rebuilt edges
+        with transaction.atomic():
+            lock_table_against_writes(Counterparty)
+            edges = self._aggregate_edges()
+
+            Counterparty.objects.all().delete()
+            Counterparty.objects.bulk_create(
+                [
+                    Counterparty(user_id=user_id, counterparty_id=counterparty_id, **edge)
+                    for (user_id, counterparty_id), edge in sorted(edges.items())
+                ],
+                batch_size=1000,
+            )
+
+        self.stdout.write(f"counterparty edges: {len(edges)}")
+
+    @staticmethod
+    def _aggregate_edges() -> dict:
+        pairs = (
+            Transaction.objects.annotate(sender=F("tx_sender__owner_id"), recipient=F("tx_recip__owner_id"))
+            .values("sender", "recipient")
+            .annotate(transfers_count=Count("tx_id"), last_interaction_at=Max("tx_timestamp"))
+            .order_by()
+        )
+
+        edges = defaultdict(lambda: {"transfers_count": 0, "last_interaction_at": None})
+        for pair in pairs:
+            if pair["sender"] == pair["recipient"]:
+                continue
+
+            for user_id, counterparty_id in ((pair["sender"], pair["recipient"]), (pair["recipient"], pair["sender"])):
+                edge = edges[(user_id, counterparty_id)]
+                edge["transfers_count"] += pair["transfers_count"]
+                if edge["last_interaction_at"] is None or edge["last_interaction_at"] < pair["last_interaction_at"]:
+                    edge["last_interaction_at"] = pair["last_interaction_at"]
+
+        return edges
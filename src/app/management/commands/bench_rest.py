@@ -0,0 +1,138 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from ninja_jwt.tokens import AccessToken
+
+from app.internal.api_v1.favourites.db.models import Favourite
+from app.internal.api_v1.users.db.models import User
+from app.management.benchmarks import add_database_guard_argument, check_database_guard, get_free_ids
+
+# Benchmark users get free IDs starting from this one, only created ones are removed afterwards
+BENCH_ID_BASE = 2_100_000_000
+BENCH_FAVOURITES = 5
+
+BENCH_ENDPOINTS = ("/api/users/me", "/api/favourites")
+BENCH_WARMUP_REQUESTS = 20
+BENCH_REQUEST_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput and latency of REST API servers side by side, e.g. WSGI and ASGI ones:\n"
+        "bench_rest --target wsgi=http://127.0.0.1:8080 --target asgi=http://127.0.0.1:8081"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True, help="Server as name=base_url (can be repeated)"
+        )
+        parser.add_argument("--requests", type=int, default=2000, help="Number of requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent clients")
+        add_database_guard_argument(parser)
+
+    def handle(self, *args, **options):
+        targets = [self.parse_target(target) for target in options["target"]]
+        number_of_requests, concurrency = options["requests"], options["concurrency"]
+        check_database_guard(options["database"])
+
+        bench_ids = get_free_ids(
+            BENCH_ID_BASE, BENCH_FAVOURITES + 1, id_fields=[(User, "tlg_id"), (Favourite, "tlg_id")]
+        )
+        created_ids: List[int] = []
+
+        try:
+            access_token = self.create_bench_user(bench_ids, created_ids)
+
+            self.stdout.write(f"{'server':<10} {'endpoint':<20} {'rps':>8} {'p50, ms':>8} {'p99, ms':>8} {'errors':>7}")
+
+            for endpoint in BENCH_ENDPOINTS:
+                for name, base_url in targets:
+                    url = base_url.rstrip("/") + endpoint
+                    self.run_requests(url, access_token, BENCH_WARMUP_REQUESTS, concurrency)
+
+                    elapsed, latencies, errors = self.run_requests(url, access_token, number_of_requests, concurrency)
+                    self.report(name, endpoint, elapsed, latencies, errors)
+
+        finally:
+            # IDs are free for favourites too, so only the bench user's favourite can match
+            Favourite.objects.filter(tlg_id__in=created_ids).delete()
+            User.objects.filter(tlg_id__in=created_ids).delete()
+
+    @staticmethod
+    def parse_target(target: str) -> Tuple[str, str]:
+        name, separator, base_url = target.partition("=")
+        if not separator:
+            raise CommandError(f"Target must look like name=base_url, got: {target}")
+
+        return name, base_url
+
+    def create_bench_user(self, bench_ids: List[int], created_ids: List[int]) -> str:
+        """
+        Creates user with verified phone number and favourites (with bench_ids),
+        returns access token of this user. IDs of created users are appended to created_ids
+        """
+        user_id, *favourite_ids = bench_ids
+
+        user = User.objects.create(tlg_id=user_id, username="bench", first_name="Bench", phone_number="+79990000000")
+        created_ids.append(user_id)
+
+        favourite_users = []
+        for offset, favourite_id in enumerate(favourite_ids, start=1):
+            favourite_users.append(
+                User.objects.create(tlg_id=favourite_id, username=f"bench{offset}", first_name="Bench")
+            )
+            created_ids.append(favourite_id)
+
+        favourite = Favourite.objects.create(tlg_id=user.tlg_id)
+        favourite.favourites.add(*favourite_users)
+
+        return str(AccessToken.for_user(user))
+
+    @staticmethod
+    def run_requests(
+        url: str, access_token: str, number_of_requests: int, concurrency: int
+    ) -> Tuple[float, List[float], int]:
+        """
+        Sends number_of_requests GET requests from concurrency clients (each with its own connection),
+        returns elapsed time, sorted latencies and number of non-200 responses
+        """
+        local = threading.local()
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        def send_request(_) -> Tuple[float, bool]:
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+
+            started_at = time.perf_counter()
+            try:
+                is_ok = local.session.get(url, headers=headers, timeout=BENCH_REQUEST_TIMEOUT).status_code == 200
+            except requests.RequestException:
+                is_ok = False
+
+            return time.perf_counter() - started_at, is_ok
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(send_request, range(number_of_requests)))
+        elapsed = time.perf_counter() - started_at
+
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, is_ok in results if not is_ok)
+
+        return elapsed, latencies, errors
+
+    def report(self, name: str, endpoint: str, elapsed: float, latencies: List[float], errors: int):
+        """
+        Prints throughput and latency percentiles of one server and endpoint
+        """
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+        self.stdout.write(
+            f"{name:<10} {endpoint:<20} {len(latencies) / elapsed:>8.1f} {p50:>8.1f} {p99:>8.1f} {errors:>7}"
+        )
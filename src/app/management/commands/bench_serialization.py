@@ -0,0 +1,100 @@
+import timeit
+from typing import Any, Callable, List
+
+from django.core.management.base import BaseCommand
+from ninja import Schema
+from ninja.operation import ResponseObject
+from ninja.renderers import BaseRenderer, JSONRenderer
+
+from app.internal.api_v1.users.db.models import User
+from app.internal.api_v1.users.domain.entities import USER_SCHEMA_FIELDS, UserSchema
+from app.internal.api_v1.utils.rendering.presentation.renderers import ORJSONRenderer
+
+# The same as favs_limit of favourites list endpoint
+BENCH_FAVOURITES = 5
+
+
+def create_response_model(response_param: Any) -> type:
+    """
+    Creates response model the way Ninja operations do
+    for validation of view results
+    """
+    return type("NinjaResponseSchema", (Schema,), {"__annotations__": {"response": response_param}})
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures serialization cost of REST responses (per user and per favourites list):\n"
+        "model instances with UserSchema.from_orm and default renderer against\n"
+        "values_list() rows with UserSchema.from_values and orjson renderer. DB is not queried."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000, help="Number of serializations per measurement")
+        parser.add_argument("--repeat", type=int, default=5, help="Number of measurements (the best one is shown)")
+
+    def handle(self, *args, **options):
+        number, repeat = options["number"], options["repeat"]
+
+        users = [
+            User(
+                tlg_id=1_000_000 + offset,
+                username=f"bench{offset}",
+                first_name="Bench",
+                last_name="User",
+                phone_number="+79990000000",
+            )
+            for offset in range(BENCH_FAVOURITES)
+        ]
+
+        # What DB cursor returns for User.objects.all() and for values_list(*USER_SCHEMA_FIELDS)
+        model_field_names = [field.attname for field in User._meta.concrete_fields]
+        model_rows = [tuple(getattr(user, name) for name in model_field_names) for user in users]
+        value_rows = [tuple(getattr(user, name) for name in USER_SCHEMA_FIELDS) for user in users]
+
+        def build_from_models(rows) -> List[UserSchema]:
+            return [UserSchema.from_orm(User.from_db("default", model_field_names, row)) for row in rows]
+
+        def build_from_values(rows) -> List[UserSchema]:
+            return [UserSchema.from_values(row) for row in rows]
+
+        pipelines = [
+            ("from_orm + json", build_from_models, model_rows, JSONRenderer()),
+            ("from_values + json", build_from_values, value_rows, JSONRenderer()),
+            ("from_values + orjson", build_from_values, value_rows, ORJSONRenderer()),
+        ]
+
+        self.stdout.write(f"{'pipeline':<22} {'per user, us':>13} {'per favourites list, us':>24}")
+
+        for name, build, rows, renderer in pipelines:
+            per_user = self.measure(
+                lambda: build(rows[:1])[0],
+                create_response_model(UserSchema),
+                renderer,
+                number,
+                repeat,
+            )
+            per_list = self.measure(
+                lambda: build(rows),
+                create_response_model(List[UserSchema]),
+                renderer,
+                number,
+                repeat,
+            )
+
+            self.stdout.write(f"{name:<22} {per_user:>13.1f} {per_list:>24.1f}")
+
+    @staticmethod
+    def measure(
+        build_result: Callable[[], Any], response_model: type, renderer: BaseRenderer, number: int, repeat: int
+    ) -> float:
+        """
+        Returns best time (in microseconds) of building view result,
+        its validation by response model and rendering (as in Ninja operation)
+        """
+
+        def serialize() -> bytes:
+            data = response_model.from_orm(ResponseObject(build_result())).dict()["response"]
+            return renderer.render(None, data, response_status=200)
+
+        return min(timeit.repeat(serialize, number=number, repeat=repeat)) / number * 1_000_000
@@ -0,0 +1,108 @@
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.internal.api_v1.payment.accounts.db.models import Account
+from app.internal.api_v1.payment.accounts.domain.entities import AccountSchema
+from app.internal.api_v1.payment.transactions.db.exceptions import InsufficientBalanceException, TransferException
+from app.internal.api_v1.payment.transactions.db.repositories import TransactionRepository
+from app.internal.api_v1.payment.transactions.domain.services import TransactionService
+from app.internal.api_v1.users.db.models import User
+from app.management.benchmarks import add_database_guard_argument, check_database_guard, get_free_ids
+
+logger = logging.getLogger("stdout")
+
+# Benchmark users and accounts get free IDs starting from this one,
+# only created ones are removed afterwards
+BENCH_ID_BASE = 2_000_000_000
+
+
+class Command(BaseCommand):
+    help = "Concurrency stress benchmark for payment transfers into the same hot account"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transfers", type=int, default=1000, help="Total number of transfers")
+        parser.add_argument("--workers", type=int, default=8, help="Number of concurrent senders")
+        add_database_guard_argument(parser)
+
+    def handle(self, *args, **options):
+        transfers, workers = options["transfers"], options["workers"]
+        check_database_guard(options["database"])
+
+        bench_ids = get_free_ids(BENCH_ID_BASE, workers + 1, id_fields=[(User, "tlg_id"), (Account, "uniq_id")])
+        created_ids: List[int] = []
+        try:
+            self.run_benchmark(bench_ids, created_ids, transfers, workers)
+        finally:
+            # Only users created by benchmark, their accounts and transactions are deleted by cascade
+            User.objects.filter(tlg_id__in=created_ids).delete()
+
+    def run_benchmark(self, bench_ids: List[int], created_ids: List[int], transfers: int, workers: int):
+        """
+        Sends transfers from workers concurrent senders into the same hot account
+        """
+        hot_account, sender_accounts = self.create_bench_accounts(bench_ids, created_ids, balance=transfers)
+        tx_service = TransactionService(tx_repo=TransactionRepository())
+
+        def run_sender(sender_account: AccountSchema, number_of_transfers: int):
+            latencies, failures = [], 0
+            try:
+                for _ in range(number_of_transfers):
+                    started_at = time.perf_counter()
+                    try:
+                        tx_service.try_transfer_to(sender_account, hot_account, 1, None)
+                    except (InsufficientBalanceException, TransferException):
+                        failures += 1
+                    latencies.append(time.perf_counter() - started_at)
+            finally:
+                connection.close()
+
+            return latencies, failures
+
+        per_worker = [transfers // workers + (1 if i < transfers % workers else 0) for i in range(workers)]
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_sender, sender_accounts, per_worker))
+        elapsed = time.perf_counter() - started_at
+
+        latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+        failures = sum(worker_failures for _, worker_failures in results)
+
+        final_value = Account.objects.values_list("value", flat=True).get(uniq_id=hot_account.uniq_id)
+        self.report(elapsed, latencies, failures, expected=len(latencies) - failures, actual=int(final_value))
+
+    def create_bench_accounts(self, bench_ids: List[int], created_ids: List[int], balance: int):
+        """
+        Creates one hot recipient and sender accounts (with owners) with bench_ids,
+        IDs of created owners are appended to created_ids
+        """
+        accounts = []
+        for offset, uniq_id in enumerate(bench_ids):
+            owner = User.objects.create(tlg_id=uniq_id, username=f"bench{offset}", first_name="Bench")
+            created_ids.append(uniq_id)
+            account = Account.objects.create(
+                uniq_id=uniq_id, owner=owner, party="PER", currency="USD", value=0 if offset == 0 else balance
+            )
+            accounts.append(AccountSchema.from_orm(account))
+
+        return accounts[0], accounts[1:]
+
+    def report(self, elapsed: float, latencies, failures: int, expected: int, actual: int):
+        """
+        Prints throughput and latency percentiles
+        """
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+        self.stdout.write(
+            f"transfers: {len(latencies)}, failed: {failures}, elapsed: {elapsed:.2f}s\n"
+            f"throughput: {len(latencies) / elapsed:.1f} transfers/sec\n"
+            f"latency: p50 {p50:.1f}ms, p99 {p99:.1f}ms\n"
+            f"hot account balance: {actual} (expected {expected})"
+        )
@@ -0,0 +1,58 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from app.internal.api_v1.payment.transactions.db.models import DailyAccountRollup, Transaction
+from app.internal.api_v1.utils.database.domain.services import lock_table_against_writes
+
+
+class Command(BaseCommand):
+    help = "Rebuilds daily account rollups (used by /state_* summaries) from the existing transactions"
+
+    def handle(self, *args, **options):
+        # Transfers upsert rollups in their own DB transactions: the ones committed before
+        # the lock are aggregated below, others wait and add their totals to rebuilt rollups
+        with transaction.atomic():
+            lock_table_against_writes(DailyAccountRollup)
+            rollups = self._aggregate_rollups()
+
+            DailyAccountRollup.objects.all().delete()
+            DailyAccountRollup.objects.bulk_create(
+                [
+                    DailyAccountRollup(account_id=account_id, day=day, **rollup)
+                    for (account_id, day), rollup in sorted(rollups.items())
+                ],
+                batch_size=1000,
+            )
+
+        self.stdout.write(f"daily rollups: {len(rollups)}")
+
+    @staticmethod
+    def _aggregate_rollups() -> dict:
+        rollups = defaultdict(
+            lambda: {
+                "incoming_value": Decimal(0),
+                "incoming_count": 0,
+                "outgoing_value": Decimal(0),
+                "outgoing_count": 0,
+            }
+        )
+
+        for account_field, direction in (("tx_recip_id", "incoming"), ("tx_sender_id", "outgoing")):
+            totals = (
+                Transaction.objects.annotate(day=TruncDate("tx_timestamp"))
+                .values(account_field, "day")
+                .annotate(total_value=Sum("tx_value"), total_count=Count("tx_id"))
+                .order_by()
+            )
+
+            for row in totals:
+                rollup = rollups[(row[account_field], row["day"])]
+                rollup[f"{direction}_value"] += row["total_value"]
+                rollup[f"{direction}_count"] += row["total_count"]
+
+        return rollups
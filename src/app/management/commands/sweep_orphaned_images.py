@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from app.internal.api_v1.utils.s3.domain.services import S3Service
+
+
+class Command(BaseCommand):
+    help = "Removes transfer images which weren't attached to any transaction (e.g. their transfer failed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age", type=int, default=settings.ORPHANED_IMAGE_MAX_AGE, help="Younger images are kept (in seconds)"
+        )
+
+    def handle(self, *args, **options):
+        s3_service = S3Service(s3_repo=S3Repository())
+        deleted = s3_service.delete_orphaned_images(max_age=timedelta(seconds=options["max_age"]))
+
+        self.stdout.write(f"orphaned images: {deleted}")
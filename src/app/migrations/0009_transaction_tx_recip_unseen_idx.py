@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0008_rename_already_show_flag_transaction_already_shown_flag"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("already_shown_flag", False)), fields=["tx_recip"], name="tx_recip_unseen_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0009_transaction_tx_recip_unseen_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["tx_sender", "tx_timestamp"], name="tx_sender_timestamp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["tx_recip", "tx_timestamp"], name="tx_recip_timestamp_idx"),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="tx_recip",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name="recip", to="app.account"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="tx_sender",
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name="sender", to="app.account"
+            ),
+        ),
+    ]
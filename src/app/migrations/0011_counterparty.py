@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0010_transaction_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counterparty",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("last_interaction_at", models.DateTimeField()),
+                ("transfers_count", models.PositiveIntegerField(default=0)),
+                (
+                    "counterparty",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="counterparties",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Counterparty",
+                "db_table": "payment_counterparties",
+                "indexes": [models.Index(fields=["user", "-last_interaction_at"], name="counterparty_recency_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="counterparty",
+            constraint=models.UniqueConstraint(fields=("user", "counterparty"), name="uniq_counterparty_edge"),
+        ),
+    ]
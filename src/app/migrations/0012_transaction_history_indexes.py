@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0011_counterparty"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["tx_sender", "tx_timestamp", "tx_id"], name="tx_sender_history_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["tx_recip", "tx_timestamp", "tx_id"], name="tx_recip_history_idx"),
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="tx_sender_timestamp_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="tx_recip_timestamp_idx",
+        ),
+    ]
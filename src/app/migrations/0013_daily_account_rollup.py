@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0012_transaction_history_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyAccountRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("incoming_value", models.DecimalField(decimal_places=2, default=0, max_digits=19)),
+                ("incoming_count", models.PositiveIntegerField(default=0)),
+                ("outgoing_value", models.DecimalField(decimal_places=2, default=0, max_digits=19)),
+                ("outgoing_count", models.PositiveIntegerField(default=0)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="app.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily account rollup",
+                "db_table": "payment_daily_rollups",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyaccountrollup",
+            constraint=models.UniqueConstraint(fields=("account", "day"), name="uniq_daily_rollup"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0014_transaction_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="remoteimage",
+            name="tlg_file_id",
+            field=models.CharField(blank=True, default="", max_length=256),
+        ),
+        migrations.AddField(
+            model_name="remoteimage",
+            name="tlg_file_unique_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0015_remote_image_tlg_file_id"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="remoteimage",
+            name="content",
+            field=models.ImageField(db_index=True, upload_to=""),
+        ),
+        migrations.AlterField(
+            model_name="remoteimage",
+            name="tlg_file_unique_id",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0016_remote_image_dedup_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="transaction",
+            name="uniq_tx_idempotency_key",
+        ),
+        migrations.AddConstraint(
+            model_name="transaction",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("idempotency_key__isnull", False)),
+                fields=("tx_sender", "idempotency_key"),
+                name="uniq_tx_sender_idempotency_key",
+            ),
+        ),
+    ]
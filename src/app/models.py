@@ -1,6 +1,6 @@
 from app.internal.api_v1.favourites.db.models import Favourite
 from app.internal.api_v1.payment.accounts.db.models import Account
 from app.internal.api_v1.payment.cards.db.models import Card
-from app.internal.api_v1.payment.transactions.db.models import Transaction
+from app.internal.api_v1.payment.transactions.db.models import Counterparty, DailyAccountRollup, Transaction
 from app.internal.api_v1.users.db.models import User
 from app.internal.api_v1.utils.s3.db.models import RemoteImage
@@ -0,0 +1,27 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Users and favourites REST API are served with async views here (REST_ASYNC_VIEWS),
+so one worker keeps handling requests while others wait for DB.
+Run it with uvicorn workers:
+
+    gunicorn --chdir src -k uvicorn.workers.UvicornWorker config.asgi:application
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ.setdefault("REST_ASYNC_VIEWS", "True")
+
+application = get_asgi_application()
+
+# Apps are ready here, load caches that requests check before serving them
+from app.internal.api_v1.utils.authentication.db.caches import load_authentication_caches  # noqa: E402
+
+load_authentication_caches()
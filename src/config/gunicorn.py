@@ -0,0 +1,12 @@
+"""
+Gunicorn settings for REST API server.
+"""
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    """
+    Removes live gauges of exited worker from prometheus multiprocess directory
+    """
+    multiprocess.mark_process_dead(worker.pid)
@@ -24,7 +24,25 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Secrects and env. variables from .env file.
 # If you want to see examples - consider checking .env.example
-env = environ.Env(TLG_TOKEN=(str, ""), DEBUG=(bool, True))
+env = environ.Env(
+    TLG_TOKEN=(str, ""),
+    DEBUG=(bool, True),
+    METRICS_ROW_COUNT_TTL=(int, 60),
+    METRICS_ROW_COUNT_ESTIMATE_FROM=(int, 0),
+    VERIFIED_PHONE_CACHE_TTL=(int, 60),
+    DB_THREAD_POOL_SIZE=(int, 0),
+    BOT_UPDATES_IN_PROGRESS=(int, 1),
+    ORPHANED_IMAGES_SWEEP_INTERVAL=(int, 600),
+    ORPHANED_IMAGE_MAX_AGE=(int, 3600),
+    PRESIGNED_URL_EXPIRES_IN=(int, 3600),
+    PRESIGNED_URL_REUSE_MARGIN=(int, 300),
+    IMAGE_PROCESS_POOL_SIZE=(int, 0),
+    IMAGE_MAX_SIDE=(int, 1280),
+    IMAGE_JPEG_QUALITY=(int, 80),
+    REST_ASYNC_VIEWS=(bool, False),
+    REVOKED_TOKENS_REFRESH_INTERVAL=(int, 30),
+    TRANSFER_AMOUNT_BUCKETS=(list, ["1", "10", "50", "100", "500", "1000", "5000", "10000", "50000", "100000"]),
+)
 environ.Env.read_env(os.path.join(os.path.split(BASE_DIR)[0], ".env"))
 
 
@@ -63,6 +81,17 @@ AWS_S3_CUSTOM_DOMAIN = "storage.yandexcloud.net"
 AWS_QUERYSTRING_AUTH = False
 AWS_S3_ENDPOINT_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}"
 
+# Presigned URLs of images are valid for PRESIGNED_URL_EXPIRES_IN seconds and
+# are reused until PRESIGNED_URL_REUSE_MARGIN seconds before they expire
+PRESIGNED_URL_EXPIRES_IN = env("PRESIGNED_URL_EXPIRES_IN")
+PRESIGNED_URL_REUSE_MARGIN = env("PRESIGNED_URL_REUSE_MARGIN")
+
+# Transfer photos are downscaled to IMAGE_MAX_SIDE and recompressed with IMAGE_JPEG_QUALITY
+# in a pool of IMAGE_PROCESS_POOL_SIZE processes (0 to process them in a thread).
+IMAGE_PROCESS_POOL_SIZE = env("IMAGE_PROCESS_POOL_SIZE")
+IMAGE_MAX_SIDE = env("IMAGE_MAX_SIDE")
+IMAGE_JPEG_QUALITY = env("IMAGE_JPEG_QUALITY")
+
 
 STORAGES = {
     "default": {
@@ -75,6 +104,38 @@ STORAGES = {
 
 METRICS_PORT = int(env("METRICS_PORT"))
 
+# Row-count gauges are cached for METRICS_ROW_COUNT_TTL seconds. Tables with more than
+# METRICS_ROW_COUNT_ESTIMATE_FROM rows use Postgres planner estimate instead of COUNT(*) (0 to disable)
+METRICS_ROW_COUNT_TTL = env("METRICS_ROW_COUNT_TTL")
+METRICS_ROW_COUNT_ESTIMATE_FROM = env("METRICS_ROW_COUNT_ESTIMATE_FROM")
+
+# Buckets of transfer amounts histogram (comma separated)
+TRANSFER_AMOUNT_BUCKETS = [float(bucket) for bucket in env("TRANSFER_AMOUNT_BUCKETS")]
+
+# How long bot trusts cached phone verification status of user (in seconds)
+VERIFIED_PHONE_CACHE_TTL = env("VERIFIED_PHONE_CACHE_TTL")
+
+# Number of threads (and DB connections) bot uses for DB work of concurrent updates.
+# 0 keeps all DB work on a single thread (default sync_to_async behaviour)
+DB_THREAD_POOL_SIZE = env("DB_THREAD_POOL_SIZE")
+
+# Serve users and favourites REST API with async views.
+# Enabled by config.asgi (ASGI server), WSGI server keeps sync views
+REST_ASYNC_VIEWS = env("REST_ASYNC_VIEWS")
+
+# REST API checks tokens against in-process set of blacklisted JTIs
+# reloaded every REVOKED_TOKENS_REFRESH_INTERVAL seconds
+REVOKED_TOKENS_REFRESH_INTERVAL = env("REVOKED_TOKENS_REFRESH_INTERVAL")
+
+# Max number of Telegram updates bot processes concurrently (updates of one user are processed in order).
+# 1 means sequential processing
+BOT_UPDATES_IN_PROGRESS = env("BOT_UPDATES_IN_PROGRESS")
+
+# Transfer images are uploaded before transfer transaction. Bot removes images that weren't attached
+# to any transaction within ORPHANED_IMAGE_MAX_AGE seconds every ORPHANED_IMAGES_SWEEP_INTERVAL seconds (0 to disable)
+ORPHANED_IMAGES_SWEEP_INTERVAL = env("ORPHANED_IMAGES_SWEEP_INTERVAL")
+ORPHANED_IMAGE_MAX_AGE = env("ORPHANED_IMAGE_MAX_AGE")
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -86,7 +147,6 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "phonenumber_field",
     "rest_framework",
-    "debug_toolbar",
     "django_extensions",
     "ninja_jwt",
     "ninja_extra",
@@ -106,10 +166,18 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "app.internal.api_v1.utils.monitoring.logs.presentation.handlers.RestLoggingMiddleware",
+    "app.internal.api_v1.utils.monitoring.metrics.presentation.handlers.RestMetricsMiddleware",
 ]
 
+# Debug toolbar middleware is sync only, under ASGI it would move every request to a thread
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.clickjacking.XFrameOptionsMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -155,6 +223,9 @@ else:
         "PASSWORD": os.environ.get("SQL_PASSWORD", "password"),
         "HOST": os.environ.get("SQL_HOST", "localhost"),
         "PORT": os.environ.get("SQL_PORT", "5432"),
+        # Connections are kept by DB threads between updates
+        "CONN_MAX_AGE": int(os.environ.get("SQL_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 
 
@@ -274,15 +345,19 @@ NINJA_JWT = {
     "USER_AUTHENTICATION_RULE": "ninja_jwt.authentication.default_user_authentication_rule",
     "AUTH_TOKEN_CLASSES": ("ninja_jwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "token_type",
-    "TOKEN_USER_CLASS": "ninja_jwt.models.TokenUser",
+    "TOKEN_USER_CLASS": "app.internal.api_v1.utils.authentication.domain.entities.TokenPrincipal",
     "JTI_CLAIM": "jti",
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
     # For Controller Schemas
     # FOR OBTAIN PAIR
-    "TOKEN_OBTAIN_PAIR_INPUT_SCHEMA": "ninja_jwt.schema.TokenObtainPairInputSchema",
-    "TOKEN_OBTAIN_PAIR_REFRESH_INPUT_SCHEMA": "ninja_jwt.schema.TokenRefreshInputSchema",
+    "TOKEN_OBTAIN_PAIR_INPUT_SCHEMA": (
+        "app.internal.api_v1.utils.authentication.domain.entities.ClaimsTokenObtainPairInputSchema"
+    ),
+    "TOKEN_OBTAIN_PAIR_REFRESH_INPUT_SCHEMA": (
+        "app.internal.api_v1.utils.authentication.domain.entities.ClaimsTokenRefreshInputSchema"
+    ),
     # FOR SLIDING TOKEN
     "TOKEN_OBTAIN_SLIDING_INPUT_SCHEMA": "ninja_jwt.schema.TokenObtainSlidingInputSchema",
     "TOKEN_OBTAIN_SLIDING_REFRESH_INPUT_SCHEMA": "ninja_jwt.schema.TokenRefreshSlidingInputSchema",
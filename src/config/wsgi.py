@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Apps are ready here, load caches that requests check before serving them
+from app.internal.api_v1.utils.authentication.db.caches import load_authentication_caches  # noqa: E402
+
+load_authentication_caches()
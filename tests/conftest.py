@@ -1,10 +1,11 @@
 import datetime
+import itertools
 import json
 from unittest.mock import AsyncMock
 
 import pytest
 from django.test import AsyncClient, Client
-from telegram import Chat, Message, MessageEntity, Update, User
+from telegram import CallbackQuery, Chat, Message, MessageEntity, Update, User
 from telegram.ext import ApplicationBuilder
 
 from src.app.internal.api_v1.favourites.db.repositories import FavouriteRepository
@@ -14,18 +15,52 @@ from src.app.internal.api_v1.payment.accounts.db.repositories import AccountRepo
 from src.app.internal.api_v1.payment.accounts.domain.services import AccountService
 from src.app.internal.api_v1.payment.cards.db.repositories import CardRepository
 from src.app.internal.api_v1.payment.cards.domain.services import CardService
-from src.app.internal.api_v1.payment.presentation.bot.handlers import TelegramPaymentHandlers
-from src.app.internal.api_v1.payment.transactions.db.repositories import TransactionRepository
+from src.app.internal.api_v1.payment.context.db.repositories import PaymentContextRepository
+from src.app.internal.api_v1.payment.context.domain.services import PaymentContextResolver
+from src.app.internal.api_v1.payment.presentation.bot.handlers import (
+    TelegramPaymentHandlers,
+    history_pages_cache,
+    previous_history_page_cursors,
+)
+from src.app.internal.api_v1.payment.transactions.db.repositories import (
+    TransactionRepository,
+    processed_transfers_cache,
+)
 from src.app.internal.api_v1.payment.transactions.domain.services import TransactionService
-from src.app.internal.api_v1.users.db.repositories import UserRepository
+from src.app.internal.api_v1.users.db.repositories import UserRepository, verified_phone_cache
 from src.app.internal.api_v1.users.domain.services import UserService
 from src.app.internal.api_v1.users.presentation.bot.handlers import TelegramUserHandlers
-from src.app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from src.app.internal.api_v1.utils.s3.db.repositories import S3Repository, presigned_urls_cache
 from src.app.internal.api_v1.utils.s3.domain.services import S3Service
 from src.app.internal.bot import setup_application_handlers
 from src.app.models import User as UserModel
 
 
+@pytest.fixture(autouse=True)
+def clear_processed_transfers_cache():
+    yield
+    processed_transfers_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_verified_phone_cache():
+    yield
+    verified_phone_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_presigned_urls_cache():
+    yield
+    presigned_urls_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_history_pages_cache():
+    yield
+    history_pages_cache.clear()
+    previous_history_page_cursors.clear()
+
+
 @pytest.fixture
 def bot_application(mocked_context):
     application = ApplicationBuilder().bot(mocked_context.bot).updater(None).build()
@@ -75,6 +110,9 @@ def telegram_payment_handlers():
     s3_repo = S3Repository()
     s3_service = S3Service(s3_repo=s3_repo)
 
+    context_repo = PaymentContextRepository()
+    context_resolver = PaymentContextResolver(context_repo=context_repo)
+
     payment_handlers = TelegramPaymentHandlers(
         user_service=user_service,
         fav_service=fav_service,
@@ -82,6 +120,7 @@ def telegram_payment_handlers():
         card_service=card_service,
         tx_service=tx_service,
         s3_service=s3_service,
+        context_resolver=context_resolver,
     )
 
     return payment_handlers
@@ -129,9 +168,31 @@ def telegram_chat():
 
 @pytest.fixture
 def get_update_for_command(get_message_with_text, mocked_context):
-    def inner(message_text):
+    update_ids = itertools.count(123)
+
+    def inner(message_text, update_id=None):
         message = get_message_with_text(message_text)
-        custom_update = Update(update_id=123, message=message)
+        custom_update = Update(update_id=update_id or next(update_ids), message=message)
+
+        custom_update._bot = mocked_context.bot
+        return custom_update
+
+    return inner
+
+
+@pytest.fixture
+def get_update_for_callback(telegram_user, telegram_chat, mocked_context):
+    update_ids = itertools.count(1000)
+
+    def inner(callback_data, message_id=123):
+        message = Message(
+            message_id=message_id, date=datetime.datetime.now(), chat=telegram_chat, text="Message with buttons"
+        )
+
+        callback_query = CallbackQuery(
+            id=str(message_id), from_user=telegram_user, chat_instance="123", data=callback_data, message=message
+        )
+        custom_update = Update(update_id=next(update_ids), callback_query=callback_query)
 
         custom_update._bot = mocked_context.bot
         return custom_update
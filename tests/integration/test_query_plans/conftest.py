@@ -0,0 +1,144 @@
+import re
+from datetime import date, timedelta
+from io import StringIO
+from typing import Callable, List, Tuple
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.app.models import Account, DailyAccountRollup, Transaction, User
+
+# Plan lines with sequential scans of hot tables. SQLite may also walk every
+# user / payment account and reach transactions by index from each of them.
+SEQ_SCAN_PATTERNS = {
+    "sqlite": r"^SCAN (payment_transactions|payment_accounts|payment_counterparties|payment_daily_rollups|app_user)\b",
+    "postgresql": r"Seq Scan on (payment_transactions|payment_counterparties|payment_daily_rollups)\b",
+}
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# SQLite makes unconditional unique constraints part of their table, so their indexes are named by SQLite
+SQLITE_INDEX_NAMES = {"uniq_daily_rollup": "sqlite_autoindex_payment_daily_rollups_1"}
+
+
+def get_query_plan(sql: str) -> str:
+    """
+    Returns query plan of already executed SQL statement
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def get_query_plans(repository_call: Callable) -> List[Tuple[str, str]]:
+    """
+    Runs repository call and returns its explainable SQL statements with their query plans
+    """
+    with CaptureQueriesContext(connection) as captured:
+        repository_call()
+
+    queries = [query["sql"] for query in captured.captured_queries]
+    explained_queries = [sql for sql in queries if sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)]
+
+    assert explained_queries, "Repository call didn't run any queries"
+
+    return [(sql, get_query_plan(sql)) for sql in explained_queries]
+
+
+@pytest.fixture
+def seeded_transactions():
+    """
+    Seeds DB with users, accounts and transactions between them,
+    so that planner statistics look like production ones.
+    """
+    number_of_users, number_of_transactions = 100, 20000
+
+    users = User.objects.bulk_create(
+        User(tlg_id=tlg_id, username=f"user{tlg_id}", first_name="Still", last_name="Test")
+        for tlg_id in range(1, number_of_users + 1)
+    )
+    Account.objects.bulk_create(
+        Account(uniq_id=user.tlg_id, owner=user, party="PER", currency="USD", value=10**6) for user in users
+    )
+    Transaction.objects.bulk_create(
+        Transaction(
+            tx_sender_id=tx_number % number_of_users + 1,
+            tx_recip_id=(tx_number * 7 + tx_number // number_of_users + 3) % number_of_users + 1,
+            tx_value=tx_number % 1000 + 1,
+            already_shown_flag=tx_number % 10 != 0,
+            # Transfers made by the bot have keys, the ones made by REST API don't
+            idempotency_key=f"tlg-update:{tx_number}" if tx_number % 2 == 0 else None,
+        )
+        for tx_number in range(number_of_transactions)
+    )
+
+    call_command("backfill_counterparties", stdout=StringIO())
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return users
+
+
+@pytest.fixture
+def seeded_daily_rollups(seeded_transactions):
+    """
+    Seeds daily rollups of every account for the last year
+    """
+    today = date.today()
+
+    DailyAccountRollup.objects.bulk_create(
+        (
+            DailyAccountRollup(
+                account_id=user.tlg_id,
+                day=today - timedelta(days=days_ago),
+                incoming_value=days_ago + 1,
+                incoming_count=1,
+                outgoing_value=days_ago + 2,
+                outgoing_count=1,
+            )
+            for user in seeded_transactions
+            for days_ago in range(365)
+        ),
+        batch_size=1000,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return seeded_transactions
+
+
+def check_no_seq_scans(query_plans: List[Tuple[str, str]]) -> None:
+    pattern = SEQ_SCAN_PATTERNS[connection.vendor]
+    for sql, plan in query_plans:
+        assert not re.search(pattern, plan, re.MULTILINE), f"Sequential scan in plan of:\n{sql}\n\n{plan}"
+
+
+@pytest.fixture
+def assert_no_seq_scans():
+    def inner(repository_call):
+        check_no_seq_scans(get_query_plans(repository_call))
+
+    return inner
+
+
+@pytest.fixture
+def assert_index_is_used():
+    def inner(repository_call, index_name: str):
+        if connection.vendor == "sqlite":
+            index_name = SQLITE_INDEX_NAMES.get(index_name, index_name)
+
+        query_plans = get_query_plans(repository_call)
+        check_no_seq_scans(query_plans)
+
+        plans = [plan for _, plan in query_plans]
+        assert any(index_name in plan for plan in plans), f"{index_name} isn't used by:\n\n" + "\n\n".join(plans)
+
+    return inner
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.internal.api_v1.payment.accounts.db.repositories import AccountRepository
+from src.app.internal.api_v1.payment.transactions.db.repositories import (
+    TransactionRepository,
+    get_batch_idempotency_keys,
+)
+from src.app.internal.api_v1.payment.transactions.domain.entities import DAY_PERIOD, MONTH_PERIOD, TransferSchema
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_list_of_inter_usernames_plan(seeded_transactions, assert_no_seq_scans):
+    assert_no_seq_scans(lambda: TransactionRepository().get_list_of_inter_usernames(user_id=1, limit=20))
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_history_page_plan(seeded_transactions, assert_no_seq_scans):
+    tx_repo = TransactionRepository()
+    first_page = tx_repo.get_history_page(account_id=1, limit=20)
+
+    assert_no_seq_scans(lambda: tx_repo.get_history_page(account_id=1, after_tx_id=first_page[-1]["tx_id"], limit=20))
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_list_of_latest_unseen_transactions_plan(seeded_transactions, assert_no_seq_scans):
+    assert_no_seq_scans(lambda: TransactionRepository().get_list_of_latest_unseen_transactions(user_id=1))
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_try_transfer_to_plan(seeded_transactions, assert_no_seq_scans):
+    account_repo = AccountRepository()
+    sender, recipient = account_repo.get_account_by_id(uniq_id=1), account_repo.get_account_by_id(uniq_id=2)
+
+    assert_no_seq_scans(lambda: TransactionRepository().try_transfer_to(sender, recipient, 100, None))
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_try_transfer_many_plan(seeded_transactions, assert_no_seq_scans):
+    transfers = [TransferSchema(sender_id=1, recipient_id=recipient_id, value=10) for recipient_id in range(2, 12)]
+
+    assert_no_seq_scans(lambda: TransactionRepository().try_transfer_many(transfers))
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_get_tx_id_by_idempotency_key_plan(seeded_transactions, assert_index_is_used):
+    assert_index_is_used(
+        lambda: TransactionRepository().get_tx_id_by_idempotency_key(
+            sender_id=1, recipient_id=2, transferring_value=100, idempotency_key="tlg-update:not-processed"
+        ),
+        index_name="uniq_tx_sender_idempotency_key",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_processed_batch_results_plan(seeded_transactions, assert_index_is_used):
+    transfers = [TransferSchema(sender_id=1, recipient_id=recipient_id, value=10) for recipient_id in range(2, 12)]
+    idempotency_keys = get_batch_idempotency_keys("tlg-update:not-processed", len(transfers))
+
+    assert_index_is_used(
+        lambda: TransactionRepository().get_processed_batch_results(transfers, idempotency_keys),
+        index_name="uniq_tx_sender_idempotency_key",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+@pytest.mark.parametrize("period", [DAY_PERIOD, MONTH_PERIOD])
+def test_period_summaries_plan(seeded_daily_rollups, assert_index_is_used, period):
+    date_to = date.today()
+
+    assert_index_is_used(
+        lambda: TransactionRepository().get_period_summaries(
+            account_id=1, date_from=date_to - timedelta(days=90), date_to=date_to, period=period
+        ),
+        index_name="uniq_daily_rollup",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.query_plans
+@pytest.mark.django_db
+def test_summary_plan(seeded_daily_rollups, assert_index_is_used):
+    date_to = date.today()
+
+    assert_index_is_used(
+        lambda: TransactionRepository().get_summary(
+            account_id=1, date_from=date_to - timedelta(days=30), date_to=date_to
+        ),
+        index_name="uniq_daily_rollup",
+    )
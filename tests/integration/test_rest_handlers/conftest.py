@@ -2,10 +2,39 @@ import json
 
 import pytest
 from django.test import AsyncClient, Client
+from ninja.testing import TestAsyncClient
 
+from src.app.internal.api_v1.favourites.db.repositories import FavouriteRepository
+from src.app.internal.api_v1.favourites.domain.services import FavouriteService
+from src.app.internal.api_v1.favourites.presentation.rest.handlers import AsyncRestFavouritesHandlers
+from src.app.internal.api_v1.favourites.presentation.rest.routers import get_favourites_router
+from src.app.internal.api_v1.users.db.repositories import UserRepository
+from src.app.internal.api_v1.users.domain.services import UserService
+from src.app.internal.api_v1.users.presentation.rest.handlers import AsyncRestUserHandlers
+from src.app.internal.api_v1.users.presentation.rest.routers import get_users_router
+from src.app.internal.api_v1.utils.authentication.db.caches import load_inactive_user_ids, load_revoked_jtis
+from src.app.internal.api_v1.utils.authentication.presentation.handlers import JWTClaimsAuth
+from src.app.internal.api_v1.utils.caching.domain.services import RefreshingSet
 from src.app.models import User
 
 
+@pytest.fixture
+def revoked_tokens(transactional_db):
+    # Loaded like on startup of server process, tests reload it after revoking tokens
+    refreshing_set = RefreshingSet(load=load_revoked_jtis, refresh_interval=60)
+    refreshing_set.load()
+
+    return refreshing_set
+
+
+@pytest.fixture
+def inactive_users(transactional_db):
+    refreshing_set = RefreshingSet(load=load_inactive_user_ids, refresh_interval=60)
+    refreshing_set.load()
+
+    return refreshing_set
+
+
 @pytest.fixture(scope="session")
 def get_access_token_for_user(async_client):
     async def inner(some_user):
@@ -39,3 +68,35 @@ def user_model_with_id_and_username():
         return User(tlg_id=tlg_id, username=username, first_name="Still", last_name="Test", phone_number="")
 
     return inner
+
+
+@pytest.fixture
+def async_users_client(revoked_tokens, inactive_users):
+    """
+    Client of users router with async views (as served by ASGI server)
+    """
+    user_service = UserService(user_repo=UserRepository())
+    router = get_users_router(
+        AsyncRestUserHandlers(user_service=user_service),
+        auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+    )
+
+    return TestAsyncClient(router)
+
+
+@pytest.fixture
+def async_favourites_client(revoked_tokens, inactive_users):
+    """
+    Client of favourites router with async views (as served by ASGI server)
+    """
+    user_repo = UserRepository()
+    handlers = AsyncRestFavouritesHandlers(
+        fav_service=FavouriteService(fav_repo=FavouriteRepository(user_repo=user_repo)),
+        user_service=UserService(user_repo=user_repo),
+    )
+
+    return TestAsyncClient(
+        get_favourites_router(
+            handlers, auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users)
+        )
+    )
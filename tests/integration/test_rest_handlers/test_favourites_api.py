@@ -1,5 +1,8 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from src.app.internal.api_v1.favourites.db.repositories import FavouriteRepository
 from src.app.internal.api_v1.favourites.presentation.rest.content_messages import (
     ADDED_SUCCESS,
     DELETED_SUCCESS,
@@ -9,6 +12,7 @@ from src.app.internal.api_v1.favourites.presentation.rest.content_messages impor
     NOT_IN_FAV,
     SELF_OPS_PROHIBITED,
 )
+from src.app.internal.api_v1.users.db.repositories import UserRepository
 from src.app.internal.api_v1.users.domain.entities import UserSchema
 from src.app.models import Favourite
 
@@ -248,3 +252,58 @@ async def test_del_favourites_endpoint_valid(
 
     fav_obj = await Favourite.objects.aget(pk=already_verified_user.id)
     assert await fav_obj.favourites.acontains(new_fav) is False
+
+
+@pytest.mark.rest
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_async_favourites_endpoints(
+    user_model_with_id_and_username,
+    get_access_token_for_user,
+    already_verified_user,
+    async_favourites_client,
+):
+    access_token = await get_access_token_for_user(already_verified_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    fav_response = await async_favourites_client.get("", headers=headers)
+    assert fav_response.status_code == 404
+    assert fav_response.json()["message"] == FAVS_NOT_FOUND
+
+    fav_user = user_model_with_id_and_username(tlg_id=777, username="One")
+    await fav_user.asave()
+
+    add_response = await async_favourites_client.put("?tlg_id=777", headers=headers)
+    assert add_response.status_code == 200
+    assert add_response.json()["message"] == ADDED_SUCCESS
+
+    fav_response = await async_favourites_client.get("", headers=headers)
+    assert fav_response.status_code == 200
+    assert fav_response.json() == [UserSchema.from_orm(fav_user)]
+
+    del_response = await async_favourites_client.delete(f"?tlg_id={already_verified_user.id}", headers=headers)
+    assert del_response.status_code == 403
+    assert del_response.json()["message"] == SELF_OPS_PROHIBITED
+
+
+@pytest.mark.rest
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_favourites_list_is_built_from_values_by_one_query(user_model_with_id_and_username, already_verified_user):
+    favourite_users = [user_model_with_id_and_username(tlg_id=tlg_id, username=f"fav{tlg_id}") for tlg_id in (7, 8, 9)]
+    for user_model in favourite_users:
+        user_model.save()
+
+    fav_obj = Favourite.objects.create(tlg_id=already_verified_user.id)
+    fav_obj.favourites.add(*favourite_users)
+
+    fav_repo = FavouriteRepository(user_repo=UserRepository())
+    with CaptureQueriesContext(connection) as captured:
+        favs_list = fav_repo.get_limited_list_of_favourites(tlg_id=already_verified_user.id, favs_limit=2)
+
+    assert len(captured) == 1
+    assert len(favs_list) == 2
+    assert all(fav in [UserSchema.from_orm(user_model) for user_model in favourite_users] for fav in favs_list)
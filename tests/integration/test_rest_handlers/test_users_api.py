@@ -1,15 +1,27 @@
 import json
 
 import pytest
+from django.db import DatabaseError, connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from ninja.testing import TestClient
+from prometheus_client import REGISTRY
 
+from src.app.internal.api_v1.users.db.repositories import UserRepository
 from src.app.internal.api_v1.users.domain.entities import UserSchema
+from src.app.internal.api_v1.users.domain.services import UserService
 from src.app.internal.api_v1.users.presentation.rest.content_messages import (
     INVALID_PHONE_NUMBER,
     NOT_VERIFIED,
     PASSWORD_SUCCESS,
     PHONE_NUMBER_SUCCESS,
+    USER_NOT_FOUND,
 )
+from src.app.internal.api_v1.users.presentation.rest.handlers import RestUserHandlers
+from src.app.internal.api_v1.users.presentation.rest.routers import get_users_router
+from src.app.internal.api_v1.utils.authentication.domain.entities import ClaimsTokenObtainPairInputSchema
+from src.app.internal.api_v1.utils.authentication.presentation.handlers import JWTClaimsAuth
+from src.app.internal.api_v1.utils.caching.domain.services import RefreshingSet
 from src.app.models import User
 
 
@@ -116,3 +128,176 @@ async def test_password_endpoint_valid(get_access_token_for_user, already_verifi
     assert password_response.json()["message"] == PASSWORD_SUCCESS
 
     assert old_password != updated_password
+
+
+@pytest.mark.rest
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_rest_metrics_are_recorded_by_route(async_client):
+    samples = [
+        ("counter_for_rest_responses_total", {"method": "GET", "route": "api/users/me", "status": "401"}),
+        ("counter_for_rest_responses_total", {"method": "GET", "route": "<unmatched>", "status": "404"}),
+        ("histogram_for_rest_request_latency_seconds_count", {"method": "GET", "route": "api/users/me"}),
+        ("histogram_for_rest_response_size_bytes_count", {"route": "api/users/me"}),
+        ("gauge_for_rest_requests_in_progress", {"method": "GET"}),
+        ("counter_for_rest_responses_total", {"method": "other", "route": "api/users/me", "status": "405"}),
+    ]
+    values_before = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+
+    assert (await async_client.get(path="/api/users/me")).status_code == 401
+    assert (await async_client.get(path="/api/users/me/123")).status_code == 404
+    assert (await async_client.generic("FOO", "/api/users/me")).status_code == 405
+
+    values_after = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+    assert [after - before for before, after in zip(values_before, values_after)] == [1, 1, 1, 2, 0, 1]
+    assert (
+        REGISTRY.get_sample_value(
+            "counter_for_rest_responses_total", {"method": "FOO", "route": "api/users/me", "status": "405"}
+        )
+        is None
+    )
+
+
+@pytest.mark.rest
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_async_me_and_phone_endpoints(get_access_token_for_user, already_saved_user, async_users_client):
+    access_token = await get_access_token_for_user(already_saved_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    me_response = await async_users_client.get("/me", headers=headers)
+    assert me_response.status_code == 403
+    assert me_response.json()["message"] == NOT_VERIFIED
+
+    phone_response = await async_users_client.post("/phone?new_phone=%2B79131234567", headers=headers)
+    assert phone_response.status_code == 200
+    assert phone_response.json()["message"] == PHONE_NUMBER_SUCCESS
+
+    me_response = await async_users_client.get("/me", headers=headers)
+    user_model = await User.objects.aget(pk=already_saved_user.id)
+
+    assert me_response.status_code == 200
+    assert UserSchema.from_orm(user_model) == me_response.json()
+
+    # Authentication doesn't query DB, so deleted user is found out by view
+    await user_model.adelete()
+    me_response = await async_users_client.get("/me", headers=headers)
+
+    assert me_response.status_code == 404
+    assert me_response.json()["message"] == USER_NOT_FOUND
+
+
+@pytest.mark.rest
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_me_endpoint_trusts_token_claims_and_rejects_revoked_tokens(
+    already_verified_user, revoked_tokens, inactive_users
+):
+    user_model = User.objects.get(tlg_id=already_verified_user.id)
+    user_model.set_password("123456")
+    user_model.save()
+
+    token_client = Client()
+    pair = token_client.post(
+        "/api/token/pair", {"tlg_id": already_verified_user.id, "password": "123456"}, content_type="application/json"
+    ).json()
+
+    user_service = UserService(user_repo=UserRepository())
+    client = TestClient(
+        get_users_router(
+            RestUserHandlers(user_service=user_service),
+            auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+        )
+    )
+
+    # Caches are loaded on startup, then authentication doesn't query DB
+    with CaptureQueriesContext(connection) as captured:
+        me_response = client.get("/me", headers={"Authorization": f"Bearer {pair['access']}"})
+
+    assert me_response.status_code == 200
+    assert len(captured) == 1
+
+    # Refresh blacklists the old refresh token, access token made from it is revoked
+    refreshed_pair = token_client.post(
+        "/api/token/refresh", {"refresh": pair["refresh"]}, content_type="application/json"
+    ).json()
+    revoked_tokens.load()
+
+    assert client.get("/me", headers={"Authorization": f"Bearer {pair['access']}"}).status_code == 401
+    assert client.get("/me", headers={"Authorization": f"Bearer {refreshed_pair['access']}"}).status_code == 200
+
+    # Logout
+    blacklist_response = token_client.post(
+        "/api/token/blacklist", {"refresh": refreshed_pair["refresh"]}, content_type="application/json"
+    )
+    assert blacklist_response.status_code == 200
+    revoked_tokens.load()
+
+    assert client.get("/me", headers={"Authorization": f"Bearer {refreshed_pair['access']}"}).status_code == 401
+
+
+@pytest.mark.rest
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+def test_me_endpoint_rejects_tokens_of_inactive_users(already_verified_user, revoked_tokens, inactive_users):
+    user_model = User.objects.get(tlg_id=already_verified_user.id)
+    access_token = ClaimsTokenObtainPairInputSchema.get_token(user_model)["access"]
+
+    user_service = UserService(user_repo=UserRepository())
+    client = TestClient(
+        get_users_router(
+            RestUserHandlers(user_service=user_service),
+            auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+        )
+    )
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/me", headers=headers).status_code == 200
+
+    user_model.is_active = False
+    user_model.save()
+    inactive_users.load()
+
+    assert client.get("/me", headers=headers).status_code == 401
+
+
+@pytest.mark.rest
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+def test_me_endpoint_rejects_tokens_until_revoked_tokens_are_loaded(already_verified_user, inactive_users):
+    db_is_down = True
+
+    def load_revoked_jtis():
+        if db_is_down:
+            raise DatabaseError("connection refused")
+        return set()
+
+    revoked_tokens = RefreshingSet(load=load_revoked_jtis, refresh_interval=60)
+    with pytest.raises(DatabaseError):
+        revoked_tokens.load()
+
+    user_model = User.objects.get(tlg_id=already_verified_user.id)
+    access_token = ClaimsTokenObtainPairInputSchema.get_token(user_model)["access"]
+
+    user_service = UserService(user_repo=UserRepository())
+    client = TestClient(
+        get_users_router(
+            RestUserHandlers(user_service=user_service),
+            auth=JWTClaimsAuth(revoked_tokens=revoked_tokens, inactive_users=inactive_users),
+        )
+    )
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    # Failed startup load doesn't fail requests with 500 (and doesn't make them wait for DB)
+    assert client.get("/me", headers=headers).status_code == 401
+
+    db_is_down = False
+    revoked_tokens.load()
+
+    assert client.get("/me", headers=headers).status_code == 200
@@ -1,6 +1,9 @@
+import asyncio
+import threading
 from unittest.mock import call
 
 import pytest
+from django.db.backends.signals import connection_created
 
 from src.app.internal.api_v1.favourites.presentation.bot.telegram_messages import NOT_VALID_ID_MSG
 from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
@@ -111,3 +114,43 @@ async def test_check_payable_with_valid_args(
     )
 
     assert len(mocked_context.mock_calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_check_payable_concurrently_on_db_thread_pool(
+    settings,
+    telegram_payment_handlers,
+    mocked_context,
+    already_verified_user,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account_and_card,
+):
+    settings.DB_THREAD_POOL_SIZE = 4
+    _, account_model, card_model = await new_user_with_account_and_card(
+        user_tlg_id=101, account_uniq_id=102, card_uniq_id=103, account_value=100
+    )
+
+    connection_threads = set()
+
+    def remember_connection_thread(sender, connection, **kwargs):
+        connection_threads.add(threading.current_thread().name)
+
+    connection_created.connect(remember_connection_thread)
+    try:
+        await asyncio.gather(
+            *(
+                telegram_payment_handlers.check_payable(get_update_for_command(command), mocked_context)
+                for command in (f"/check_account {account_model.uniq_id}", f"/check_card {card_model.uniq_id}")
+            )
+        )
+    finally:
+        connection_created.disconnect(remember_connection_thread)
+
+    mocked_context.bot.send_message.assert_has_calls(
+        [call(chat_id=telegram_chat.id, text=get_message_with_balance(account_model))] * 2
+    )
+    assert connection_threads and all(thread_name.startswith("db") for thread_name in connection_threads)
@@ -0,0 +1,44 @@
+from contextlib import ExitStack
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from prometheus_client import REGISTRY
+
+# Handlers are instrumented by modules imported as app.* (not src.app.*),
+# so queries are accounted by execute wrapper of the same module
+from app.internal.api_v1.utils.monitoring.metrics.domain.services import account_sql_query
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_handler_metrics_record_outcomes_and_sql_queries(
+    bot_application, mocked_context, sender_with_bank_requisites, get_update_for_command
+):
+    samples = [
+        ("counter_for_handler_outcomes_total", {"command": "/list_inter", "outcome": "ok"}),
+        ("counter_for_handler_outcomes_total", {"command": "/set_phone", "outcome": "user_error"}),
+        ("histogram_for_handler_latency_seconds_count", {"command": "/list_inter"}),
+        ("histogram_for_handler_sql_queries_sum", {"command": "/list_inter"}),
+        ("histogram_for_handler_sql_queries_sum", {"command": "/set_phone"}),
+        ("gauge_for_handlers_in_progress", {"command": "/list_inter"}),
+    ]
+    values_before = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+
+    async def process_updates():
+        await bot_application.initialize()
+        await bot_application.process_update(get_update_for_command("/list_inter"))
+        await bot_application.process_update(get_update_for_command("/set_phone"))
+
+    # Accounting is installed only on DB connections created after handlers were instrumented
+    with ExitStack() as stack:
+        if account_sql_query not in connection.execute_wrappers:
+            stack.enter_context(connection.execute_wrapper(account_sql_query))
+
+        async_to_sync(process_updates)()
+
+    values_after = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+
+    # phone verification and list of counterparties for /list_inter, no queries for invalid /set_phone
+    assert [after - before for before, after in zip(values_before, values_after)] == [1, 1, 1, 2, 0, 0]
@@ -0,0 +1,90 @@
+import hashlib
+import os
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.conf import settings
+from PIL import Image
+
+from src.app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from src.app.internal.api_v1.utils.s3.domain.services import (
+    S3Service,
+    arecompress_image,
+    get_image_executor,
+    shutdown_image_executor,
+)
+from src.app.models import RemoteImage, Transaction
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_transfer_photo_is_recompressed_and_stored_once(mocker, mocked_context, sender_with_bank_requisites):
+    photo = BytesIO()
+    Image.effect_noise((2560, 1920), 64).convert("RGB").save(photo, format="JPEG", quality=95)
+
+    downloaded_paths = []
+
+    async def download_to_memory(out):
+        downloaded_paths.append(out.name)
+        out.write(photo.getvalue())
+
+    mocked_context.bot.get_file.return_value.download_to_memory = download_to_memory
+    update = MagicMock()
+    update.message.photo[-1].file_id, update.message.photo[-1].file_unique_id = "file-id", "file-unique-id"
+
+    s3_service = S3Service(s3_repo=S3Repository())
+    image_file = await s3_service.aconvert_telegram_photo_to_image(update, mocked_context)
+
+    content = image_file.read()
+    assert image_file.name == f"{hashlib.sha256(content).hexdigest()}.jpg"
+    assert len(content) < len(photo.getvalue())
+    with Image.open(BytesIO(content)) as image:
+        assert max(image.size) == settings.IMAGE_MAX_SIDE
+    assert not image_file.is_stored
+
+    # Photo is downloaded to and recompressed in a temporary file, which is removed when image is closed
+    assert not os.path.exists(downloaded_paths[0])
+    image_file.close()
+
+    # The same photo sent again is neither downloaded nor uploaded
+    image = await RemoteImage.objects.acreate(content=image_file.name, tlg_file_unique_id="file-unique-id")
+    await Transaction.objects.acreate(tx_sender_id=123, tx_recip_id=123, tx_value=1, tx_image=image)
+    mocked_context.bot.get_file.reset_mock()
+
+    stored_image_file = await s3_service.aconvert_telegram_photo_to_image(update, mocked_context)
+    assert stored_image_file.is_stored and stored_image_file.name == image_file.name
+    mocked_context.bot.get_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.valid_case
+async def test_image_process_pool_is_spawned_and_shut_down(settings, tmp_path):
+    settings.IMAGE_PROCESS_POOL_SIZE = 1
+
+    photo_path, not_image_path = tmp_path / "photo", tmp_path / "not_image"
+    Image.effect_noise((2560, 1920), 64).convert("RGB").save(photo_path, format="JPEG", quality=95)
+    not_image_path.write_bytes(b"not an image")
+    photo_size = photo_path.stat().st_size
+
+    try:
+        # Worker process reads and replaces the file itself, content isn't passed between processes
+        content_hash = await arecompress_image(str(photo_path))
+        assert photo_path.stat().st_size < photo_size
+        assert content_hash == hashlib.sha256(photo_path.read_bytes()).hexdigest()
+        assert set(tmp_path.iterdir()) == {photo_path, not_image_path}
+
+        # Error is raised in worker process and logged in this one, not an image is kept as is
+        assert await arecompress_image(str(not_image_path)) == hashlib.sha256(b"not an image").hexdigest()
+        assert not_image_path.read_bytes() == b"not an image"
+
+        image_executor = get_image_executor()
+        assert image_executor._mp_context.get_start_method() == "spawn"
+    finally:
+        shutdown_image_executor()
+
+    with pytest.raises(RuntimeError):
+        image_executor.submit(hashlib.sha256, b"")
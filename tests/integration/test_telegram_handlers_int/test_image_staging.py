@@ -0,0 +1,98 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.base import ContentFile
+from django.db import connection
+
+from src.app.internal.api_v1.payment.accounts.db.repositories import AccountRepository
+from src.app.internal.api_v1.payment.transactions.db.repositories import (
+    TransactionRepository,
+    processed_transfers_cache,
+    stage_image,
+)
+from src.app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from src.app.internal.api_v1.utils.s3.domain.services import S3Service
+from src.app.models import Account, RemoteImage
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_transfer_image_is_uploaded_before_transaction_and_orphans_are_swept(
+    mocker, sender_with_bank_requisites, new_user_with_account
+):
+    async_to_sync(new_user_with_account)(user_tlg_id=987, account_uniq_id=567, account_value=0)
+    Account.objects.filter(uniq_id=123).update(value=1000)
+
+    storage = RemoteImage._meta.get_field("content").storage
+    uploads_in_atomic_block = []
+    mocker.patch.object(
+        storage,
+        "_save",
+        side_effect=lambda name, content: uploads_in_atomic_block.append(connection.in_atomic_block) or name,
+    )
+    delete_from_storage = mocker.patch.object(storage, "delete")
+
+    account_repo, tx_repo = AccountRepository(), TransactionRepository()
+    sender, recipient = account_repo.get_account_by_id(uniq_id=123), account_repo.get_account_by_id(uniq_id=567)
+
+    tx_id = tx_repo.try_transfer_to(
+        sender, recipient, 100, ContentFile(b"photo", name="linked.jpg"), idempotency_key="client-key"
+    )
+
+    # Concurrent duplicate is rolled back, so its image is never linked to transaction
+    processed_transfers_cache.clear()
+    mocker.patch.object(TransactionRepository, "get_tx_id_by_idempotency_key", side_effect=[None, tx_id])
+    tx_repo.try_transfer_to(
+        sender, recipient, 100, ContentFile(b"photo", name="orphaned.jpg"), idempotency_key="client-key"
+    )
+
+    assert uploads_in_atomic_block == [False, False]
+    assert RemoteImage.objects.count() == 2
+
+    s3_service = S3Service(s3_repo=S3Repository())
+    assert s3_service.delete_orphaned_images(max_age=timedelta(hours=1)) == 0
+    assert s3_service.delete_orphaned_images(max_age=timedelta(0)) == 1
+
+    assert list(RemoteImage.objects.values_list("transaction", flat=True)) == [tx_id]
+    delete_from_storage.assert_called_once_with("orphaned.jpg")
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_sweeper_keeps_content_uploaded_again_by_concurrent_transfer(mocker, sender_with_bank_requisites):
+    storage = RemoteImage._meta.get_field("content").storage
+    delete_from_storage = mocker.patch.object(storage, "delete")
+
+    # Orphan left by failed transfer with the same photo
+    RemoteImage.objects.create(content="shared.jpg")
+
+    s3_service = S3Service(s3_repo=S3Repository())
+    sweeps = []
+
+    def sweep():
+        try:
+            sweeps.append(s3_service.delete_orphaned_images(max_age=timedelta(0)))
+        finally:
+            connection.close()
+
+    sweeper = threading.Thread(target=sweep)
+
+    def upload(name, content):
+        # Sweeper runs while the same content is uploaded again and waits for its reference
+        sweeper.start()
+        sweeper.join(timeout=0.5)
+        assert sweeper.is_alive()
+        return name
+
+    mocker.patch.object(storage, "_save", side_effect=upload)
+
+    image = stage_image(ContentFile(b"photo", name="shared.jpg"))
+    sweeper.join()
+
+    assert sweeps == [1]
+    assert list(RemoteImage.objects.values_list("pk", flat=True)) == [image.pk]
+    delete_from_storage.assert_not_called()
@@ -0,0 +1,109 @@
+from io import StringIO
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+
+from src.app.internal.api_v1.payment.presentation.bot.handlers import LIST_INTER_PAGE_SIZE
+from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
+    INVALID_PAGE,
+    NO_INTERACTED_USERS,
+    NO_MORE_INTERACTED_USERS,
+    get_result_message_for_list_interacted,
+)
+from src.app.models import Account, Counterparty, Transaction
+
+
+@pytest.fixture
+def new_user_with_username_and_account(new_user_with_account):
+    async def inner(user_tlg_id, account_uniq_id, username):
+        new_user_model, new_account_model = await new_user_with_account(user_tlg_id, account_uniq_id, 0)
+        new_user_model.username = username
+        await new_user_model.asave()
+
+        return new_user_model, new_account_model
+
+    return inner
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+async def test_list_inter_with_invalid_page(
+    telegram_payment_handlers, mocked_context, sender_with_bank_requisites, telegram_chat, get_update_for_command
+):
+    for command in ("/list_inter text", "/list_inter 0", "/list_inter -1"):
+        await telegram_payment_handlers.list_inter(get_update_for_command(command), mocked_context)
+        mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=INVALID_PAGE)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_list_inter_shows_most_recent_counterparties_first(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_username_and_account,
+):
+    await telegram_payment_handlers.list_inter(get_update_for_command("/list_inter"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_INTERACTED_USERS)
+
+    await Account.objects.filter(uniq_id=123).aupdate(value=1000)
+    await new_user_with_username_and_account(user_tlg_id=987, account_uniq_id=567, username="first")
+    await new_user_with_username_and_account(user_tlg_id=988, account_uniq_id=568, username="second")
+
+    for command in ("/send_batch 567:100", "/send_batch 568:100", "/send_batch 567:100"):
+        await telegram_payment_handlers.send_batch(get_update_for_command(command), mocked_context)
+
+    await telegram_payment_handlers.list_inter(get_update_for_command("/list_inter"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(
+        chat_id=telegram_chat.id, text=get_result_message_for_list_interacted(["first", "second"])
+    )
+
+    first_edge = await Counterparty.objects.aget(user_id=sender_with_bank_requisites.id, counterparty_id=987)
+    reverse_edge = await Counterparty.objects.aget(user_id=987, counterparty_id=sender_with_bank_requisites.id)
+    assert first_edge.transfers_count == reverse_edge.transfers_count == 2
+
+    await telegram_payment_handlers.list_inter(get_update_for_command("/list_inter 2"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_MORE_INTERACTED_USERS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_list_inter_pages_after_backfill(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_username_and_account,
+):
+    for offset in range(LIST_INTER_PAGE_SIZE + 1):
+        _, account_model = await new_user_with_username_and_account(
+            user_tlg_id=1000 + offset, account_uniq_id=1000 + offset, username=f"user{offset}"
+        )
+        await Transaction.objects.acreate(tx_sender_id=123, tx_recip=account_model, tx_value=1)
+
+    assert await Counterparty.objects.acount() == 0
+    await sync_to_async(call_command)("backfill_counterparties", stdout=StringIO())
+    assert await Counterparty.objects.acount() == 2 * (LIST_INTER_PAGE_SIZE + 1)
+
+    expected_usernames = [f"user{offset}" for offset in reversed(range(LIST_INTER_PAGE_SIZE + 1))]
+
+    await telegram_payment_handlers.list_inter(get_update_for_command("/list_inter"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(
+        chat_id=telegram_chat.id,
+        text=get_result_message_for_list_interacted(expected_usernames[:LIST_INTER_PAGE_SIZE], next_page=2),
+    )
+
+    await telegram_payment_handlers.list_inter(get_update_for_command("/list_inter 2"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(
+        chat_id=telegram_chat.id, text=get_result_message_for_list_interacted(expected_usernames[LIST_INTER_PAGE_SIZE:])
+    )
@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock
+
+import pytest
+from telegram.error import BadRequest
+
+from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import NO_LATEST_TXS
+from src.app.internal.api_v1.utils.s3.domain.services import S3Service
+from src.app.models import RemoteImage, Transaction
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_list_latest_shows_each_transaction_once(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    _, another_account_model = await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=1000)
+
+    for value in (100, 200):
+        await Transaction.objects.acreate(tx_sender=another_account_model, tx_recip_id=123, tx_value=value)
+
+    await Transaction.objects.acreate(tx_sender_id=123, tx_recip=another_account_model, tx_value=300)
+
+    await telegram_payment_handlers.list_latest(get_update_for_command("/list_latest"), mocked_context)
+
+    sent_texts = [call.kwargs["text"] for call in mocked_context.bot.send_message.call_args_list]
+    assert len(sent_texts) == 1
+    assert sent_texts[0].count("Sender: Still Test, Recipient: foo bar") == 2
+
+    assert await Transaction.objects.filter(tx_recip_id=123, already_shown_flag=False).acount() == 0
+    assert await Transaction.objects.filter(tx_recip_id=567, already_shown_flag=False).acount() == 1
+
+    await telegram_payment_handlers.list_latest(get_update_for_command("/list_latest"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_LATEST_TXS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_list_latest_sends_photos_by_file_id(
+    mocker,
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    _, another_account_model = await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=1000)
+
+    for tx_value in (100, 200):
+        image = await RemoteImage.objects.acreate(content=f"photo_{tx_value}.jpg", tlg_file_id=f"file-id-{tx_value}")
+        await Transaction.objects.acreate(
+            tx_sender=another_account_model, tx_recip_id=123, tx_value=tx_value, tx_image=image
+        )
+
+    s3_image = MagicMock()
+    s3_image.content.read.return_value = b"photo from S3"
+    get_image_from_s3 = mocker.patch.object(S3Service, "aget_image_from_s3_bucket", return_value=s3_image)
+
+    # Telegram accepts file IDs, so nothing is downloaded from S3
+    await telegram_payment_handlers.list_latest(get_update_for_command("/list_latest"), mocked_context)
+
+    media = mocked_context.bot.send_media_group.call_args.kwargs["media"]
+    assert [photo.media for photo in media] == ["file-id-100", "file-id-200"]
+    assert "Value: 100" in media[0].caption
+    get_image_from_s3.assert_not_called()
+
+    # Photos with rejected file IDs are sent from S3
+    await Transaction.objects.filter(tx_recip_id=123).aupdate(already_shown_flag=False)
+    mocked_context.bot.send_media_group.side_effect = [BadRequest("Wrong file identifier"), None]
+
+    await telegram_payment_handlers.list_latest(get_update_for_command("/list_latest"), mocked_context)
+
+    media = mocked_context.bot.send_media_group.call_args.kwargs["media"]
+    assert [photo.media.input_file_content for photo in media] == [b"photo from S3"] * 2
+    assert get_image_from_s3.call_count == 2
@@ -0,0 +1,66 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.app.models import Account, User
+
+# Transaction control statements are sent as queries only by some DB backends
+TRANSACTION_CONTROL_STATEMENTS = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE SAVEPOINT")
+
+# Max number of queries per command: handler name, command text, budget
+COMMAND_QUERY_BUDGETS = [
+    # payment context, idempotency key lookup,
+    # lock of accounts, balances update, transaction, counterparties and rollups upserts
+    ("send_to", "/send_to_account 567 10", 7),
+    ("send_to", "/send_to_card 5678 10", 7),
+    ("send_to", "/send_to_user 987 10", 7),
+    ("send_to", "/send_to_user @recipient 10", 7),
+    # payment context
+    ("send_to", "/send_to_user @nobody 10", 1),
+    ("send_to", "/send_to_card 999 10", 1),
+    ("send_to", "/send_to_account", 1),
+    # payment context, idempotency keys lookup (one for all transfers),
+    # lock of accounts, balances update, transactions, counterparties and rollups upserts
+    ("send_batch", "/send_batch 567:10 567:5", 7),
+    # phone verification (not cached yet) and command itself
+    ("check_payable", "/check_account 123", 2),
+    ("list_inter", "/list_inter", 2),
+    ("list_latest", "/list_latest", 2),
+    ("state_payable", "/state_account 123", 4),
+    ("state_payable", "/state_card 1234", 4),
+]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+@pytest.mark.parametrize("handler_name, command, budget", COMMAND_QUERY_BUDGETS)
+def test_command_query_budget(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    get_update_for_command,
+    new_user_with_account_and_card,
+    handler_name,
+    command,
+    budget,
+):
+    async_to_sync(new_user_with_account_and_card)(
+        user_tlg_id=987, account_uniq_id=567, card_uniq_id=5678, account_value=0
+    )
+    User.objects.filter(tlg_id=987).update(username="recipient")
+    Account.objects.filter(uniq_id=123).update(value=1000)
+
+    handler = getattr(telegram_payment_handlers, handler_name)
+
+    # Handlers run in this thread (and with its DB connection) under async_to_sync
+    with CaptureQueriesContext(connection) as captured:
+        async_to_sync(handler)(get_update_for_command(command), mocked_context)
+
+    queries = [
+        query["sql"]
+        for query in captured.captured_queries
+        if not query["sql"].startswith(TRANSACTION_CONTROL_STATEMENTS)
+    ]
+    assert len(queries) <= budget, "\n".join(queries)
@@ -0,0 +1,30 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.app.internal.api_v1.payment.cards.db.repositories import CardRepository
+from src.app.internal.api_v1.utils.monitoring.metrics.domain.collectors import RowCountCollector
+from src.app.models import Card
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_row_count_gauges_are_computed_on_scrape_and_cached(sender_with_bank_requisites):
+    collector = RowCountCollector(
+        row_counters={"gauge_for_current_number_of_cards": ("Cards", CardRepository().get_current_number_of_cards)},
+        ttl=60,
+    )
+
+    with CaptureQueriesContext(connection) as captured:
+        described = list(collector.describe())
+    assert [family.samples for family in described] == [[]]
+    assert len(captured) == 0
+
+    with CaptureQueriesContext(connection) as captured:
+        first_scrape = [sample.value for family in collector.collect() for sample in family.samples]
+        Card.objects.all().delete()
+        second_scrape = [sample.value for family in collector.collect() for sample in family.samples]
+
+    assert first_scrape == second_scrape == [1]
+    assert len([query for query in captured.captured_queries if "COUNT" in query["sql"].upper()]) == 1
@@ -0,0 +1,203 @@
+from unittest.mock import DEFAULT
+
+import pytest
+from asgiref.sync import async_to_sync
+from telegram.constants import MessageLimit
+
+from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
+    INCR_TX_VALUE,
+    SEND_BATCH_ARGS,
+    SENDER_RESTRICTION,
+    get_result_lines_for_batch,
+)
+from src.app.internal.api_v1.payment.transactions.db.repositories import (
+    TransactionRepository,
+    processed_transfers_cache,
+)
+from src.app.internal.api_v1.payment.transactions.domain.entities import (
+    ACCOUNT_NOT_FOUND,
+    INSUFFICIENT_BALANCE,
+    NOT_MADE_IN_PROCESSED_BATCH,
+    SELF_TRANSFER,
+    TransferResultSchema,
+    TransferSchema,
+)
+from src.app.models import Account, Transaction
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+async def test_send_batch_with_invalid_args(
+    telegram_payment_handlers, mocked_context, sender_with_bank_requisites, telegram_chat, get_update_for_command
+):
+    commands_with_errors = [
+        ("/send_batch", SEND_BATCH_ARGS),
+        ("/send_batch 567", SEND_BATCH_ARGS),
+        ("/send_batch -567:100", SEND_BATCH_ARGS),
+        ("/send_batch 567:100 text:200", SEND_BATCH_ARGS),
+        ("/send_batch 567:-100", INCR_TX_VALUE),
+        ("/send_batch 567:100 568:text", INCR_TX_VALUE),
+    ]
+
+    for command, expected_error_text in commands_with_errors:
+        await telegram_payment_handlers.send_batch(get_update_for_command(command), mocked_context)
+        mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=expected_error_text)
+
+    assert await Transaction.objects.acount() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+async def test_send_batch_with_no_sender_bank_requisites(
+    telegram_payment_handlers, mocked_context, already_verified_user, telegram_chat, get_update_for_command
+):
+    await telegram_payment_handlers.send_batch(get_update_for_command("/send_batch 567:100"), mocked_context)
+    mocked_context.bot.send_message.assert_called_once_with(chat_id=telegram_chat.id, text=SENDER_RESTRICTION)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_batch_with_partially_valid_transfers(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    sender_account_model = await Account.objects.aget(uniq_id=123)
+    sender_account_model.value += 1000
+    await sender_account_model.asave()
+
+    await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=0)
+    await new_user_with_account(user_tlg_id=988, account_uniq_id=568, account_value=100)
+
+    mocked_update = get_update_for_command("/send_batch 567:300 568:400 999:100 123:50 567:400 568:100")
+    await telegram_payment_handlers.send_batch(mocked_update, mocked_context)
+
+    transactions = [tx async for tx in Transaction.objects.order_by("tx_id")]
+    assert len(transactions) == 3
+
+    expected_results = [
+        TransferResultSchema(sender_id=123, recipient_id=567, value=300, tx_id=transactions[0].tx_id),
+        TransferResultSchema(sender_id=123, recipient_id=568, value=400, tx_id=transactions[1].tx_id),
+        TransferResultSchema(sender_id=123, recipient_id=999, value=100, error=ACCOUNT_NOT_FOUND),
+        TransferResultSchema(sender_id=123, recipient_id=123, value=50, error=SELF_TRANSFER),
+        TransferResultSchema(sender_id=123, recipient_id=567, value=400, error=INSUFFICIENT_BALANCE),
+        TransferResultSchema(sender_id=123, recipient_id=568, value=100, tx_id=transactions[2].tx_id),
+    ]
+
+    mocked_context.bot.send_message.assert_called_once_with(
+        chat_id=telegram_chat.id, text="".join(get_result_lines_for_batch(expected_results))
+    )
+
+    assert (await Account.objects.aget(uniq_id=123)).value == 200
+    assert (await Account.objects.aget(uniq_id=567)).value == 300
+    assert (await Account.objects.aget(uniq_id=568)).value == 600
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_batch_with_max_number_of_transfers(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    await Account.objects.filter(uniq_id=123).aupdate(value=1000)
+    await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=0)
+
+    # Results of missing accounts with long IDs don't fit into one message
+    pairs = [f"{100_000_000_000 + i}:1000000000" for i in range(99)] + ["567:100"]
+    await telegram_payment_handlers.send_batch(get_update_for_command(f"/send_batch {' '.join(pairs)}"), mocked_context)
+
+    texts = [call.kwargs["text"] for call in mocked_context.bot.send_message.call_args_list]
+    assert len(texts) > 1
+    assert all(len(text) <= MessageLimit.MAX_TEXT_LENGTH for text in texts)
+    assert all(call.kwargs["chat_id"] == telegram_chat.id for call in mocked_context.bot.send_message.call_args_list)
+
+    result_lines = "".join(texts).splitlines()[2:]
+    assert len(result_lines) == 100
+    assert result_lines[-1].startswith(" - 100 to 567: OK")
+    assert (await Account.objects.aget(uniq_id=567)).value == 100
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_batch_with_duplicated_update(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    await Account.objects.filter(uniq_id=123).aupdate(value=1000)
+    await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=0)
+
+    await telegram_payment_handlers.send_batch(
+        get_update_for_command("/send_batch 567:300 567:900", 42), mocked_context
+    )
+
+    transaction = await Transaction.objects.aget()
+    assert transaction.idempotency_key == "tlg-update:42:0"
+
+    # Transfer that failed back then isn't made by redelivered update, even when balance is sufficient now
+    await Account.objects.filter(uniq_id=123).aupdate(value=5000)
+    expected_results = [
+        TransferResultSchema(sender_id=123, recipient_id=567, value=300, tx_id=transaction.tx_id),
+        TransferResultSchema(sender_id=123, recipient_id=567, value=900, error=NOT_MADE_IN_PROCESSED_BATCH),
+    ]
+
+    for _ in range(2):
+        await telegram_payment_handlers.send_batch(
+            get_update_for_command("/send_batch 567:300 567:900", 42), mocked_context
+        )
+        mocked_context.bot.send_message.assert_called_with(
+            chat_id=telegram_chat.id, text="".join(get_result_lines_for_batch(expected_results))
+        )
+        processed_transfers_cache.clear()
+
+    assert await Transaction.objects.acount() == 1
+    assert (await Account.objects.aget(uniq_id=567)).value == 300
+
+    await telegram_payment_handlers.send_batch(
+        get_update_for_command("/send_batch 567:300 567:900", 43), mocked_context
+    )
+    assert await Transaction.objects.acount() == 3
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_batch_returns_original_results_after_concurrent_duplicate(
+    mocker, sender_with_bank_requisites, new_user_with_account
+):
+    async_to_sync(new_user_with_account)(user_tlg_id=987, account_uniq_id=567, account_value=0)
+    Account.objects.filter(uniq_id=123).update(value=1000)
+
+    tx_repo = TransactionRepository()
+    transfers = [TransferSchema(sender_id=123, recipient_id=567, value=value) for value in (100, 200)]
+    original_results = tx_repo.try_transfer_many(transfers, idempotency_key="client-key")
+
+    # Duplicate passes the lookup (as if it was made concurrently) and hits unique constraint
+    processed_transfers_cache.clear()
+    mocker.patch.object(
+        tx_repo, "get_processed_batch_results", wraps=tx_repo.get_processed_batch_results, side_effect=[None, DEFAULT]
+    )
+    assert tx_repo.try_transfer_many(transfers, idempotency_key="client-key") == original_results
+
+    assert Transaction.objects.count() == 2
+    assert Account.objects.get(uniq_id=123).value == 700
@@ -1,7 +1,11 @@
+from unittest.mock import MagicMock
+
 import pytest
-from django.db import DatabaseError
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import DatabaseError, OperationalError, transaction
 
 from src.app.internal.api_v1.favourites.presentation.bot.telegram_messages import NOT_VALID_ID_MSG
+from src.app.internal.api_v1.payment.accounts.db.repositories import AccountRepository
 from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
     CARD_NOT_FOUND,
     ERROR_DURING_TRANSFER,
@@ -14,6 +18,10 @@ from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
     get_message_for_send_command,
     get_successful_transfer_message,
 )
+from src.app.internal.api_v1.payment.transactions.db.repositories import (
+    TransactionRepository,
+    processed_transfers_cache,
+)
 from src.app.models import Account, Card, Transaction
 
 
@@ -289,6 +297,49 @@ async def test_send_to_with_error_during_transfer(
     mocked_context.bot.send_message.assert_called_once_with(chat_id=telegram_chat.id, text=ERROR_DURING_TRANSFER)
 
 
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_to_retries_transfer_after_deadlock(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    mocker,
+    get_update_for_command,
+    new_user_with_account_and_card,
+):
+    sender_account_model = await Account.objects.filter(uniq_id=123).afirst()
+    sender_account_model.value += 1000
+    await sender_account_model.asave()
+
+    rcp_user_model, rcp_account_model, _ = await new_user_with_account_and_card(
+        user_tlg_id=987, account_uniq_id=567, card_uniq_id=5678, account_value=1000
+    )
+
+    class DeadlockDetected(Exception):
+        pgcode = "40P01"
+
+    deadlock_error = OperationalError("deadlock detected")
+    deadlock_error.__cause__ = DeadlockDetected()
+
+    mocker.patch("time.sleep")
+    mocker.patch("django.db.transaction.atomic", side_effect=[deadlock_error, transaction.atomic()])
+
+    mocked_update = get_update_for_command(f"/send_to_user {rcp_user_model.tlg_id} 300")
+    await telegram_payment_handlers.send_to(mocked_update, mocked_context)
+
+    rcp_name = " ".join([rcp_user_model.first_name, rcp_user_model.last_name])
+    mocked_context.bot.send_message.assert_called_once_with(
+        chat_id=telegram_chat.id, text=get_successful_transfer_message(rcp_name, 300)
+    )
+
+    assert await Transaction.objects.acount() == 1
+    assert (await Account.objects.aget(uniq_id=123)).value == 700
+    assert (await Account.objects.aget(uniq_id=567)).value == 1300
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.django_db(transaction=True)
@@ -332,3 +383,125 @@ async def test_send_to_with_valid_transfer(
 
     assert (await Account.objects.aget(uniq_id=sender_account_model.uniq_id)).value == 700
     assert (await Account.objects.filter(uniq_id=567).afirst()).value == 1300
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_to_with_duplicated_update(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account_and_card,
+):
+    await Account.objects.filter(uniq_id=sender_with_bank_requisites.id).aupdate(value=1000)
+    rcp_user_model, _, _ = await new_user_with_account_and_card(
+        user_tlg_id=987, account_uniq_id=567, card_uniq_id=5678, account_value=0
+    )
+    rcp_name = " ".join([rcp_user_model.first_name, rcp_user_model.last_name])
+
+    for _ in range(2):
+        await telegram_payment_handlers.send_to(get_update_for_command("/send_to_account 567 100", 42), mocked_context)
+        mocked_context.bot.send_message.assert_called_with(
+            chat_id=telegram_chat.id, text=get_successful_transfer_message(rcp_name, 100)
+        )
+
+    processed_transfers_cache.clear()
+    await telegram_payment_handlers.send_to(get_update_for_command("/send_to_account 567 100", 42), mocked_context)
+
+    assert await Transaction.objects.acount() == 1
+    assert (await Transaction.objects.aget()).idempotency_key == "tlg-update:42"
+    assert (await Account.objects.aget(uniq_id=567)).value == 100
+
+    await telegram_payment_handlers.send_to(get_update_for_command("/send_to_account 567 100", 43), mocked_context)
+    assert await Transaction.objects.acount() == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+async def test_send_to_with_reused_update_id(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account_and_card,
+):
+    await Account.objects.filter(uniq_id=sender_with_bank_requisites.id).aupdate(value=1000)
+    await new_user_with_account_and_card(user_tlg_id=987, account_uniq_id=567, card_uniq_id=5678, account_value=0)
+
+    await telegram_payment_handlers.send_to(get_update_for_command("/send_to_account 567 100", 42), mocked_context)
+
+    # Other transfer with the same update_id (e.g. update_id sequence was restarted) isn't reported as done
+    for _ in range(2):
+        await telegram_payment_handlers.send_to(get_update_for_command("/send_to_account 567 50", 42), mocked_context)
+        mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=ERROR_DURING_TRANSFER)
+        processed_transfers_cache.clear()
+
+    assert await Transaction.objects.acount() == 1
+
+    # Keys are unique only for a sender
+    def transfer_back_with_the_same_key():
+        account_repo = AccountRepository()
+        sender, recipient = account_repo.get_account_by_id(uniq_id=567), account_repo.get_account_by_id(uniq_id=123)
+        TransactionRepository().try_transfer_to(sender, recipient, 10, None, idempotency_key="tlg-update:42")
+
+    await sync_to_async(transfer_back_with_the_same_key)()
+
+    assert await Transaction.objects.acount() == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_send_to_with_duplicated_photo_update_does_not_convert_photo_again(
+    mocker,
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    new_user_with_account_and_card,
+):
+    await Account.objects.filter(uniq_id=sender_with_bank_requisites.id).aupdate(value=1000)
+    await new_user_with_account_and_card(user_tlg_id=987, account_uniq_id=567, card_uniq_id=5678, account_value=0)
+
+    convert_photo = mocker.patch.object(
+        telegram_payment_handlers._s3_service, "aconvert_telegram_photo_to_image", return_value=None
+    )
+    update = MagicMock(update_id=42)
+    update.effective_user.id, update.effective_chat.id = sender_with_bank_requisites.id, telegram_chat.id
+    update.message.caption = "/send_to_account 567 100"
+
+    for _ in range(2):
+        await telegram_payment_handlers.send_to(update, mocked_context)
+
+    convert_photo.assert_called_once()
+    assert await Transaction.objects.acount() == 1
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_transfer_returns_original_tx_after_concurrent_duplicate(
+    mocker, sender_with_bank_requisites, new_user_with_account
+):
+    async_to_sync(new_user_with_account)(user_tlg_id=987, account_uniq_id=567, account_value=0)
+    Account.objects.filter(uniq_id=123).update(value=1000)
+
+    account_repo, tx_repo = AccountRepository(), TransactionRepository()
+    sender, recipient = account_repo.get_account_by_id(uniq_id=123), account_repo.get_account_by_id(uniq_id=567)
+    original_tx_id = tx_repo.try_transfer_to(sender, recipient, 100, None, idempotency_key="client-key")
+
+    # Duplicate passes the lookup (as if it was made concurrently) and hits unique constraint
+    processed_transfers_cache.clear()
+    mocker.patch.object(TransactionRepository, "get_tx_id_by_idempotency_key", side_effect=[None, original_tx_id])
+    assert tx_repo.try_transfer_to(sender, recipient, 100, None, idempotency_key="client-key") == original_tx_id
+
+    assert Transaction.objects.count() == 1
+    assert Account.objects.get(uniq_id=123).value == 900
@@ -0,0 +1,185 @@
+import calendar
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from src.app.internal.api_v1.favourites.presentation.bot.telegram_messages import NOT_VALID_ID_MSG
+from src.app.internal.api_v1.payment.presentation.bot.handlers import STATE_PAGE_SIZE
+from src.app.internal.api_v1.payment.presentation.bot.telegram_messages import (
+    ABSENT_ID_NUMBER,
+    FIRST_HISTORY_PAGE,
+    NO_MORE_TXS_FOR_LAST_MONTH,
+    NO_TXS_FOR_LAST_MONTH,
+    get_history_page_callback_data,
+    get_history_page_keyboard,
+    get_summary_message,
+)
+from src.app.internal.api_v1.payment.transactions.db.repositories import TransactionRepository
+from src.app.internal.api_v1.payment.transactions.domain.entities import MONTH_PERIOD, PeriodSummarySchema
+from src.app.internal.api_v1.utils.s3.db.repositories import S3Repository
+from src.app.models import Account, DailyAccountRollup, RemoteImage, Transaction
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.error_case
+async def test_state_account_with_invalid_args(
+    telegram_payment_handlers, mocked_context, sender_with_bank_requisites, telegram_chat, get_update_for_command
+):
+    commands_with_errors = [
+        ("/state_account", ABSENT_ID_NUMBER),
+        ("/state_account 123 1 2", ABSENT_ID_NUMBER),
+        ("/state_account text", NOT_VALID_ID_MSG),
+        ("/state_account 123 text", NOT_VALID_ID_MSG),
+        ("/state_account 123 0", NOT_VALID_ID_MSG),
+    ]
+
+    for command, expected_error_text in commands_with_errors:
+        await telegram_payment_handlers.state_payable(get_update_for_command(command), mocked_context)
+        mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=expected_error_text)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_state_account_pages_through_last_month(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    get_update_for_callback,
+    new_user_with_account,
+):
+    await telegram_payment_handlers.state_payable(get_update_for_command("/state_account 123"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_TXS_FOR_LAST_MONTH)
+
+    _, another_account_model = await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=0)
+
+    old_tx = await Transaction.objects.acreate(tx_sender_id=123, tx_recip=another_account_model, tx_value=1)
+    await Transaction.objects.filter(tx_id=old_tx.tx_id).aupdate(tx_timestamp=timezone.now() - timedelta(days=40))
+
+    number_of_transactions = STATE_PAGE_SIZE + 5
+    for value in range(1, number_of_transactions + 1):
+        if value % 2:
+            await Transaction.objects.acreate(tx_sender_id=123, tx_recip=another_account_model, tx_value=value)
+        else:
+            await Transaction.objects.acreate(tx_sender=another_account_model, tx_recip_id=123, tx_value=value)
+
+    tx_ids = [tx_id async for tx_id in Transaction.objects.exclude(tx_id=old_tx.tx_id).values_list("tx_id", flat=True)]
+
+    def get_tx_ids_of_page(text):
+        return [
+            int(line.split(",")[0].removeprefix("TX ID: ")) for line in text.splitlines() if line.startswith("TX ID")
+        ]
+
+    mocked_context.bot.send_message.reset_mock()
+    await telegram_payment_handlers.state_payable(get_update_for_command("/state_account 123"), mocked_context)
+
+    first_page = mocked_context.bot.send_message.call_args.kwargs
+    assert mocked_context.bot.send_message.call_count == 1
+    assert first_page["text"].startswith("Summary since")
+    assert get_tx_ids_of_page(first_page["text"]) == tx_ids[:STATE_PAGE_SIZE]
+    assert first_page["reply_markup"] == get_history_page_keyboard(
+        "/state_account", "123", previous_cursor=None, next_cursor=tx_ids[STATE_PAGE_SIZE - 1]
+    )
+
+    next_page_callback = get_history_page_callback_data("/state_account", "123", tx_ids[STATE_PAGE_SIZE - 1])
+    await telegram_payment_handlers.history_page(get_update_for_callback(next_page_callback), mocked_context)
+
+    second_page = mocked_context.bot.edit_message_text.call_args.kwargs
+    assert get_tx_ids_of_page(second_page["text"]) == tx_ids[STATE_PAGE_SIZE:]
+    assert second_page["reply_markup"] == get_history_page_keyboard(
+        "/state_account", "123", previous_cursor=FIRST_HISTORY_PAGE, next_cursor=None
+    )
+
+    # Pages already seen by user are not rendered again
+    await Transaction.objects.all().adelete()
+
+    first_page_callback = get_history_page_callback_data("/state_account", "123", FIRST_HISTORY_PAGE)
+    await telegram_payment_handlers.history_page(get_update_for_callback(first_page_callback), mocked_context)
+    assert mocked_context.bot.edit_message_text.call_args.kwargs["text"] == first_page["text"]
+
+    await telegram_payment_handlers.state_payable(
+        get_update_for_command(f"/state_account 123 {tx_ids[-1]}"), mocked_context
+    )
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_MORE_TXS_FOR_LAST_MONTH)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_state_account_shows_summary_from_rollups(
+    telegram_payment_handlers,
+    mocked_context,
+    sender_with_bank_requisites,
+    telegram_chat,
+    get_update_for_command,
+    new_user_with_account,
+):
+    await Account.objects.filter(uniq_id=123).aupdate(value=1000)
+    await new_user_with_account(user_tlg_id=987, account_uniq_id=567, account_value=0)
+
+    for command in ("/send_batch 567:100", "/send_batch 567:50 567:25"):
+        await telegram_payment_handlers.send_batch(get_update_for_command(command), mocked_context)
+
+    mocked_context.bot.send_message.reset_mock()
+    await telegram_payment_handlers.state_payable(get_update_for_command("/state_account 567"), mocked_context)
+
+    now = timezone.now()
+    date_from = timezone.localdate(now - timedelta(days=calendar.monthrange(now.year, now.month)[1]))
+    expected_summary = PeriodSummarySchema(incoming_value=175, incoming_count=3, net_value=175, count=3)
+
+    first_page = mocked_context.bot.send_message.call_args_list[0].kwargs
+    assert first_page["chat_id"] == telegram_chat.id
+    assert first_page["text"].startswith(get_summary_message(expected_summary, date_from))
+
+    today = timezone.localdate()
+    monthly_summaries = await sync_to_async(TransactionRepository().get_period_summaries)(
+        account_id=123, date_from=today - timedelta(days=31), date_to=today, period=MONTH_PERIOD
+    )
+    assert monthly_summaries == [
+        PeriodSummarySchema(
+            period_start=today.replace(day=1), outgoing_value=175, outgoing_count=3, net_value=-175, count=3
+        )
+    ]
+
+    rollups_before = [rollup async for rollup in DailyAccountRollup.objects.order_by("account_id").values()]
+    await sync_to_async(call_command)("rebuild_daily_rollups", stdout=StringIO())
+    rollups_after = [rollup async for rollup in DailyAccountRollup.objects.order_by("account_id").values()]
+
+    def without_ids(rollups):
+        return [{key: value for key, value in rollup.items() if key != "id"} for rollup in rollups]
+
+    assert without_ids(rollups_after) == without_ids(rollups_before)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_presigned_urls_are_signed_in_batch_and_reused(mocker):
+    images = [RemoteImage.objects.create(content=f"photo_{number}.jpg") for number in range(3)]
+    image_ids = [image.pk for image in images]
+
+    s3_repo = S3Repository()
+    sign = mocker.spy(RemoteImage._meta.get_field("content").storage.bucket.meta.client, "generate_presigned_url")
+
+    with CaptureQueriesContext(connection) as captured:
+        presigned_urls = s3_repo.get_presigned_urls(image_ids + [max(image_ids) + 1])
+    assert len(captured) == 1
+    assert sign.call_count == 3
+    assert all(f"telegram/photo_{number}.jpg" in presigned_urls[image_id] for number, image_id in enumerate(image_ids))
+
+    with CaptureQueriesContext(connection) as captured:
+        assert s3_repo.get_presigned_urls(image_ids) == presigned_urls
+    assert len(captured) == 0
+    assert sign.call_count == 3
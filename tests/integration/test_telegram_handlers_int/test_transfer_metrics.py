@@ -0,0 +1,39 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from prometheus_client import REGISTRY
+
+from src.app.internal.api_v1.payment.accounts.db.repositories import AccountRepository
+from src.app.internal.api_v1.payment.transactions.db.repositories import TransactionRepository
+from src.app.internal.api_v1.payment.transactions.domain.entities import TransferSchema
+from src.app.models import Account
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_transfer_metrics_count_only_committed_transfers(sender_with_bank_requisites, new_user_with_account):
+    async_to_sync(new_user_with_account)(user_tlg_id=987, account_uniq_id=567, account_value=0)
+    Account.objects.filter(uniq_id=123).update(value=1000)
+
+    samples = [
+        ("counter_for_transfers_total", {"currency": "USD"}),
+        ("counter_for_transfers_volume_total", {"currency": "USD"}),
+        ("histogram_for_transfer_amounts_count", {"currency": "USD"}),
+        ("counter_for_failed_transfers_total", {"reason": "insufficient_balance"}),
+    ]
+    values_before = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+
+    account_repo, tx_repo = AccountRepository(), TransactionRepository()
+    sender, recipient = account_repo.get_account_by_id(uniq_id=123), account_repo.get_account_by_id(uniq_id=567)
+
+    tx_repo.try_transfer_to(sender, recipient, 100, None)
+    tx_repo.try_transfer_many([TransferSchema(sender_id=123, recipient_id=567, value=value) for value in (50, 5000)])
+
+    # Transfer rolled back by outer transaction is not counted
+    with pytest.raises(ZeroDivisionError), transaction.atomic():
+        tx_repo.try_transfer_to(sender, recipient, 100, None)
+        1 / 0
+
+    values_after = [REGISTRY.get_sample_value(name, labels) or 0 for name, labels in samples]
+    assert [after - before for before, after in zip(values_before, values_after)] == [2, 150, 2, 1]
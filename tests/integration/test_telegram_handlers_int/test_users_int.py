@@ -1,13 +1,20 @@
+import asyncio
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from src.app.internal.api_v1.users.presentation.bot.telegram_messages import (
     ABSENT_PASSWORD_MSG,
     NO_VERIFIED_PN,
     PASSWORD_UPDATED,
+    USER_NOT_FOUND_MSG,
     get_info_for_me_handler,
     get_success_phone_msg,
     get_unique_start_msg,
 )
+from src.app.internal.api_v1.utils.telegram.domain.services import verified_phone_loader
 from src.app.models import User
 
 
@@ -109,3 +116,43 @@ async def test_set_password_valid(
     assert updated_password != ""
 
     mocked_context.bot.send_message.assert_called_once_with(chat_id=telegram_chat.id, text=PASSWORD_UPDATED)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+async def test_cached_phone_verification_follows_phone_updates_and_deletion(
+    telegram_user_handlers, mocked_context, already_saved_user, telegram_chat, get_update_for_command
+):
+    await telegram_user_handlers.me(get_update_for_command("/me"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=NO_VERIFIED_PN)
+
+    await telegram_user_handlers.set_phone(get_update_for_command("/set_phone +79267378397"), mocked_context)
+    await telegram_user_handlers.me(get_update_for_command("/me"), mocked_context)
+
+    user_model = await User.objects.aget(pk=already_saved_user.id)
+    mocked_context.bot.send_message.assert_called_with(
+        chat_id=telegram_chat.id, text=get_info_for_me_handler(user_model)
+    )
+
+    await User.objects.filter(pk=already_saved_user.id).adelete()
+    await telegram_user_handlers.me(get_update_for_command("/me"), mocked_context)
+    mocked_context.bot.send_message.assert_called_with(chat_id=telegram_chat.id, text=USER_NOT_FOUND_MSG)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.valid_case
+def test_concurrent_phone_verifications_are_loaded_together(user_model_without_verified_pn):
+    user_model_without_verified_pn(987).save()
+    User.objects.create(tlg_id=789, username="verified", first_name="Verified", phone_number="+79267378397")
+
+    async def check_users(*tlg_ids):
+        return await asyncio.gather(*(verified_phone_loader.ais_phone_verified(tlg_id) for tlg_id in tlg_ids))
+
+    with CaptureQueriesContext(connection) as captured:
+        assert async_to_sync(check_users)(987, 789, 789, 555) == [False, True, True, None]
+        assert async_to_sync(check_users)(987, 789) == [False, True]
+
+    assert len(captured) == 1
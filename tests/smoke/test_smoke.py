@@ -2,8 +2,11 @@ import json
 from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+from asgiref.sync import sync_to_async
 from django.test import AsyncClient, Client
 
+# REST API authenticates by caches of modules imported as app.* (not src.app.*)
+from app.internal.api_v1.utils.authentication.db.caches import load_authentication_caches
 from src.app.internal.api_v1.users.domain.entities import UserSchema
 from src.app.internal.api_v1.users.presentation.bot.telegram_messages import get_unique_start_msg
 from src.app.models import User
@@ -73,7 +76,8 @@ async def test_smoke(bot_application, get_update_for_command, telegram_user, tel
 
     access_token = token_response.json()["access"]
 
-    # 5
+    # 5 (authentication caches are loaded on startup of server process)
+    await sync_to_async(load_authentication_caches)()
     me_response = await client.get(path="/api/users/me", **{"Authorization": f"Bearer {access_token}"})
 
     # 6
@@ -0,0 +1,27 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from ninja.renderers import JSONRenderer
+
+from src.app.internal.api_v1.users.domain.entities import UserSchema
+from src.app.internal.api_v1.utils.rendering.presentation.renderers import ORJSONRenderer
+
+
+@pytest.mark.unit
+@pytest.mark.valid_case
+def test_orjson_renderer_renders_the_same_values_as_default_one():
+    user = UserSchema.from_values((123, "username", "First", "", "+79990000000"))
+    data = {
+        "user": user,
+        "favourites": [user.dict()],
+        "value": Decimal("10.50"),
+        "date": datetime(2023, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    }
+
+    rendered = ORJSONRenderer().render(None, data, response_status=200)
+
+    assert isinstance(rendered, bytes)
+    assert json.loads(rendered) == json.loads(JSONRenderer().render(None, data, response_status=200))
+    assert json.loads(rendered)["date"] == "2023-05-01T12:30:15.123Z"
@@ -0,0 +1,83 @@
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.app.internal.api_v1.utils.monitoring.logs.presentation import handlers
+from src.app.internal.api_v1.utils.monitoring.logs.presentation.handlers import (
+    TLG_MESSAGE_MAX_LENGTH,
+    TelegramLogsHandler,
+)
+
+
+def get_response(status_code, payload=None):
+    response = MagicMock(status_code=status_code, ok=status_code < 400)
+    response.json.return_value = payload or {}
+
+    return response
+
+
+@pytest.fixture
+def get_logs_handler(mocker):
+    session = mocker.patch.object(handlers.requests, "Session").return_value
+    session.post.return_value = get_response(200)
+    logs_handlers = []
+
+    def inner(**kwargs):
+        logs_handler = TelegramLogsHandler(logs_bot_token="token", logs_chat_id="chat", flush_interval=60, **kwargs)
+        logs_handlers.append(logs_handler)
+
+        return logs_handler, session
+
+    yield inner
+
+    for logs_handler in logs_handlers:
+        logs_handler.close()
+
+
+def get_record(message):
+    return logging.LogRecord("stdout_with_tlg", logging.INFO, __file__, 1, message, None, None)
+
+
+@pytest.mark.unit
+@pytest.mark.valid_case
+def test_logs_handler_coalesces_records_into_messages(get_logs_handler):
+    logs_handler, session = get_logs_handler()
+
+    for number in range(3):
+        logs_handler.emit(get_record(f"record {number}"))
+    logs_handler.emit(get_record("x" * TLG_MESSAGE_MAX_LENGTH))
+    logs_handler.flush()
+
+    texts = [call.kwargs["data"]["text"] for call in session.post.call_args_list]
+    assert texts == ["record 0\nrecord 1\nrecord 2", "x" * TLG_MESSAGE_MAX_LENGTH]
+
+
+@pytest.mark.unit
+@pytest.mark.valid_case
+def test_logs_handler_drops_records_over_queue_size(get_logs_handler):
+    logs_handler, session = get_logs_handler(queue_size=2)
+
+    for number in range(5):
+        logs_handler.emit(get_record(f"record {number}"))
+    logs_handler.close()
+
+    session.post.assert_called_once()
+    assert session.post.call_args.kwargs["data"]["text"] == (
+        "record 0\nrecord 1\n3 log records were dropped: Telegram logs buffer is full"
+    )
+    session.close.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.error_case
+def test_logs_handler_retries_after_too_many_requests(mocker, get_logs_handler):
+    sleep = mocker.patch.object(handlers.time, "sleep")
+    logs_handler, session = get_logs_handler(max_retry_after=5)
+    session.post.side_effect = [get_response(429, {"parameters": {"retry_after": 30}}), get_response(200)]
+
+    logs_handler.emit(get_record("record"))
+    logs_handler.flush()
+
+    assert session.post.call_count == 2
+    sleep.assert_called_once_with(5)
@@ -0,0 +1,41 @@
+import pytest
+from telegram import InputMediaPhoto
+from telegram.constants import MessageLimit
+
+from src.app.internal.api_v1.utils.telegram.domain.services import pack_lines_into_messages, send_photos_with_captions
+
+
+@pytest.mark.unit
+@pytest.mark.valid_case
+def test_pack_lines_into_messages():
+    lines = [f"TX ID: {tx_id}, Value: 100\n" for tx_id in range(1000)]
+    messages = pack_lines_into_messages(lines)
+
+    assert len(messages) < len(lines)
+    assert all(len(message) <= MessageLimit.MAX_TEXT_LENGTH for message in messages)
+    assert "".join(messages) == "".join(lines)
+
+    long_line = "x" * (MessageLimit.MAX_TEXT_LENGTH + 10)
+    assert pack_lines_into_messages(["short\n", long_line]) == [
+        "short\n",
+        "x" * MessageLimit.MAX_TEXT_LENGTH,
+        "x" * 10,
+    ]
+    assert pack_lines_into_messages([]) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.valid_case
+async def test_send_photos_with_captions_in_media_groups(mocked_context, telegram_chat):
+    photos = [(f"photo {number}".encode(), f"TX ID: {number}") for number in range(21)]
+    await send_photos_with_captions(mocked_context, telegram_chat.id, photos)
+
+    media_groups = [call.kwargs["media"] for call in mocked_context.bot.send_media_group.call_args_list]
+    assert [len(media) for media in media_groups] == [10, 10]
+    assert all(isinstance(photo, InputMediaPhoto) for media in media_groups for photo in media)
+    assert [photo.caption for media in media_groups for photo in media] == [caption for _, caption in photos[:20]]
+
+    mocked_context.bot.send_photo.assert_called_once_with(
+        chat_id=telegram_chat.id, photo=b"photo 20", caption="TX ID: 20"
+    )
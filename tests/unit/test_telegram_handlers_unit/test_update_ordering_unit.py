@@ -0,0 +1,54 @@
+import asyncio
+import datetime
+
+import pytest
+from telegram import Chat, Message, Update, User
+from telegram.ext import ApplicationBuilder, TypeHandler
+
+from src.app.internal.api_v1.utils.telegram.domain.services import OrderedConcurrentApplication
+
+
+def get_update_from_user(update_id, user_id):
+    message = Message(
+        message_id=update_id,
+        date=datetime.datetime.now(),
+        chat=Chat(id=user_id, type="private"),
+        from_user=User(id=user_id, is_bot=False, first_name="foo"),
+        text="/list_latest",
+    )
+    return Update(update_id=update_id, message=message)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.valid_case
+async def test_updates_of_one_user_are_ordered_while_users_run_concurrently(mocked_context):
+    application = (
+        ApplicationBuilder()
+        .bot(mocked_context.bot)
+        .updater(None)
+        .concurrent_updates(True)
+        .application_class(OrderedConcurrentApplication, kwargs={"max_updates_in_progress": 2})
+        .build()
+    )
+
+    events = []
+
+    async def slow_handler(update, context):
+        events.append(("start", update.update_id))
+        await asyncio.sleep(0.05 if update.effective_user.id == 1 else 0.01)
+        events.append(("end", update.update_id))
+
+    application.add_handler(TypeHandler(Update, slow_handler))
+    await application.initialize()
+
+    await asyncio.gather(
+        application.process_update(get_update_from_user(update_id=1, user_id=1)),
+        application.process_update(get_update_from_user(update_id=2, user_id=1)),
+        application.process_update(get_update_from_user(update_id=3, user_id=2)),
+    )
+
+    # Second update of user 1 starts only after the first one, user 2 doesn't wait for user 1
+    assert events.index(("end", 1)) < events.index(("start", 2))
+    assert events.index(("end", 3)) < events.index(("end", 1))
+    assert application._ordering_locks == {}
@@ -0,0 +1,33 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.app.internal.api_v1.utils.telegram.domain.services import VerifiedPhoneLoader
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.valid_case
+async def test_verified_phone_loader_resolves_waiters_when_one_of_them_is_cancelled():
+    loading_allowed = asyncio.Event()
+
+    async def get_phone_verification_statuses(tlg_ids):
+        await loading_allowed.wait()
+        return {tlg_id: True for tlg_id in tlg_ids}
+
+    user_service = AsyncMock()
+    user_service.aget_phone_verification_statuses.side_effect = get_phone_verification_statuses
+    loader = VerifiedPhoneLoader(user_service=user_service)
+
+    cancelled_waiter = asyncio.ensure_future(loader.ais_phone_verified(100_001))
+    waiter = asyncio.ensure_future(loader.ais_phone_verified(100_002))
+
+    # Both requests are waiting for the same load
+    await asyncio.sleep(0)
+    cancelled_waiter.cancel()
+    loading_allowed.set()
+
+    assert await asyncio.wait_for(waiter, timeout=1) is True
+    assert cancelled_waiter.cancelled()
+    user_service.aget_phone_verification_statuses.assert_called_once_with(tlg_ids=[100_001, 100_002])